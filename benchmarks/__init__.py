@@ -0,0 +1 @@
+"""Benchmarks for the Zeversolar local integration."""
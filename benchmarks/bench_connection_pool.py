@@ -0,0 +1,97 @@
+"""Compares polling with a client per request against the shared connection pool.
+
+The polls follow each other without the minimum gap of the request arbiter,
+so the figures are those of the transport. Run from the repository root:
+
+    python -m benchmarks.bench_connection_pool [polls]
+"""
+from __future__ import annotations
+
+import asyncio
+import statistics
+import sys
+import time
+import tracemalloc
+
+from aiohttp import web
+
+from custom_components.zeversolar_local.zever_local import (
+    ZeverSolarApiClient,
+    ZeverSolarConnectionPool,
+)
+
+_PAYLOAD = (
+    b"1\n1\nEAB241277A36\nZYXTBGERTXJLTSVS\nM11\n18625-797R+17829-719R\n"
+    b"16:22 20/02/2022\n1\n1\nZS150045138C0104\n1234\n8.9\nOK\nError"
+)
+
+
+async def _async_handle_home(_: web.Request) -> web.Response:
+    """Answer like the home.cgi page of an inverter."""
+    return web.Response(body=_PAYLOAD)
+
+
+async def _async_measure(client: ZeverSolarApiClient, polls: int) -> dict:
+    """Poll sequentially and return the latency and allocation figures."""
+    await client.async_get_data()  # warm up
+
+    latencies = []
+    for _ in range(polls):
+        start = time.perf_counter()
+        await client.async_get_data()
+        latencies.append(time.perf_counter() - start)
+
+    # Allocations are traced in a separate pass, tracing slows down the polls.
+    peaks = []
+    tracemalloc.start()
+    for _ in range(polls):
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        await client.async_get_data()
+        peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+    tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        "mean_ms": statistics.fmean(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95)] * 1000,
+        "peak_kib": statistics.fmean(peaks) / 1024,
+    }
+
+
+async def async_main(polls: int) -> None:
+    """Run both variants against a local stand-in inverter."""
+    app = web.Application()
+    app.router.add_get("/home.cgi", _async_handle_home)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    host = f"127.0.0.1:{port}"
+
+    pool = ZeverSolarConnectionPool()
+    try:
+        results = {
+            "client per request": await _async_measure(
+                ZeverSolarApiClient(host, min_gap=0), polls
+            ),
+            "shared pool": await _async_measure(
+                ZeverSolarApiClient(host, http_client=pool.http_client, min_gap=0),
+                polls,
+            ),
+        }
+    finally:
+        await pool.async_close()
+        await runner.cleanup()
+
+    print(f"{'variant':<20}{'mean ms':>10}{'p95 ms':>10}{'peak KiB/poll':>16}")
+    for name, result in results.items():
+        print(
+            f"{name:<20}{result['mean_ms']:>10.2f}{result['p95_ms']:>10.2f}"
+            f"{result['peak_kib']:>16.1f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(async_main(int(sys.argv[1]) if len(sys.argv) > 1 else 200))
@@ -0,0 +1,53 @@
+"""Compares the home.cgi parser with the zever_local InverterData path.
+
+Uses the sample payloads of the tests. Run from the repository root:
+
+    python -m benchmarks.bench_parser [repeats]
+"""
+from __future__ import annotations
+
+import sys
+import timeit
+
+from zever_local.inverter import InverterData
+
+from custom_components.zeversolar_local.parser import parse_home_cgi
+from tests.payloads import BYTE_CONTENT, IDLE_BYTE_CONTENT
+
+
+def _parse_zever_local(content: bytes) -> InverterData:
+    """The parsing done by zever_local.inverter.Inverter.async_get_data()."""
+    return InverterData(content.decode(encoding="utf-8").split("\n"))
+
+
+def _parse_and_read(content: bytes) -> None:
+    """Parse and read the values the sensors read on every poll."""
+    data = parse_home_cgi(content)
+    _ = (data.pac_watt, data.energy_today_KWh, data.status, data.communication_status)
+
+
+def main(repeats: int) -> None:
+    """Time both parsers and print the results in microseconds per payload."""
+    payloads = {"producing": BYTE_CONTENT, "idle": IDLE_BYTE_CONTENT}
+    variants = {
+        "zever_local InverterData": _parse_zever_local,
+        "parse_home_cgi": parse_home_cgi,
+        "parse_home_cgi + reads": _parse_and_read,
+    }
+
+    print(f"{'parser':<28}{'payload':<12}{'us/parse':>10}")
+    for payload_name, content in payloads.items():
+        for variant_name, variant in variants.items():
+            number = 20000
+            best = min(
+                timeit.repeat(
+                    lambda: variant(content),  # pylint: disable=cell-var-from-loop
+                    number=number,
+                    repeat=repeats,
+                )
+            )
+            print(f"{variant_name:<28}{payload_name:<12}{best / number * 1e6:>10.2f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
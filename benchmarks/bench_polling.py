@@ -0,0 +1,234 @@
+"""Measures the whole polling cycle from the request to the written sensor states.
+
+Coordinators and their sensor entities run in a Home Assistant test instance
+against fake inverters served by a separate process, so the CPU time and the
+allocations are those of Home Assistant and the integration only. Every
+cycle refreshes all coordinators at once. The cycles follow each other
+without the minimum gap of the request arbiter, a real inverter is polled
+every 'min_gap' seconds at most. Reported per inverter count:
+
+- poll_to_state_ms: from the start of the cycle to the power sensor state
+- cpu_ms_per_cycle: process CPU time of a cycle
+- alloc_peak_kib_per_cycle: peak of the memory allocated during a cycle
+- loop_lag_ms: how late a 5 ms sleep of the event loop wakes up, null if
+  the cycles are too short to take a sample
+
+Run from the repository root, the results are written as JSON:
+
+    python -m benchmarks.bench_polling [--inverters 1,10,100,500] [--cycles 5]
+        [--output results.json]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Callable
+from datetime import datetime, timedelta
+import json
+import logging
+import multiprocessing
+from multiprocessing.connection import Connection
+import statistics
+import sys
+import time
+import tracemalloc
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.entity_component import EntityComponent
+from pytest_homeassistant_custom_component.common import async_test_home_assistant
+from zever_local.inverter import ArrayPosition
+
+from custom_components.zeversolar_local.const import CONNECTION_POOL_MAX_CONNECTIONS
+from custom_components.zeversolar_local.coordinator import ZeversolarApiCoordinator
+from custom_components.zeversolar_local.sensor import Sensor, ZeverSolarSensor
+from custom_components.zeversolar_local.zever_local import (
+    ZeverSolarApiClient,
+    ZeverSolarConnectionPool,
+)
+from tests.fake_inverter import FakeInverterFleet
+
+_SENSOR_IDS = (
+    ArrayPosition.pac_watt.name,
+    ArrayPosition.energy_today_KWh.name,
+    ArrayPosition.communication_status.name,
+    ArrayPosition.status.name,
+)
+_LAG_PROBE_INTERVAL = 0.005
+
+
+def _advancing_clock() -> Callable[[], datetime]:
+    """Return a clock a minute later on every call, so every power value changes."""
+    now = datetime(2022, 6, 21, 8, 0)
+
+    def _clock() -> datetime:
+        nonlocal now
+        now += timedelta(minutes=1)
+        return now
+
+    return _clock
+
+
+def _serve_fake_inverters(count: int, connection: Connection) -> None:
+    """Serve the fake inverters until told to stop. Runs in a child process."""
+
+    async def _async_serve() -> None:
+        fleet = FakeInverterFleet(count=count)
+        for inverter in fleet.inverters:
+            inverter.clock = _advancing_clock()
+        connection.send(await fleet.async_start())
+        await asyncio.get_running_loop().run_in_executor(None, connection.recv)
+        await fleet.async_stop()
+
+    asyncio.run(_async_serve())
+
+
+def _percentiles(values: list[float]) -> dict[str, float]:
+    """Return the p50, p95 and max of the values, rounded."""
+    ordered = sorted(values)
+    last = len(ordered) - 1
+    return {
+        "p50": round(ordered[round(last * 0.5)], 3),
+        "p95": round(ordered[round(last * 0.95)], 3),
+        "max": round(ordered[-1], 3),
+    }
+
+
+async def _async_probe_loop_lag(lags: list[float]) -> None:
+    """Record how late the event loop wakes up a sleeping task."""
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(_LAG_PROBE_INTERVAL)
+        lags.append((loop.time() - start - _LAG_PROBE_INTERVAL) * 1000)
+
+
+async def _async_cycle(
+    hass: HomeAssistant, coordinators: list[ZeversolarApiCoordinator]
+) -> float:
+    """Refresh all coordinators and wait for the states, return the start time."""
+    start = time.perf_counter()
+    await asyncio.gather(
+        *[coordinator.async_refresh() for coordinator in coordinators]
+    )
+    await hass.async_block_till_done()
+    return start
+
+
+async def _async_measure(hosts: list[str], cycles: int) -> dict:
+    """Run the polling cycles against the given inverters."""
+    hass = await async_test_home_assistant(asyncio.get_running_loop())
+    pool = ZeverSolarConnectionPool(max_connections=CONNECTION_POOL_MAX_CONNECTIONS)
+    coordinators = [
+        ZeversolarApiCoordinator(
+            hass, ZeverSolarApiClient(host, http_client=pool.http_client, min_gap=0)
+        )
+        for host in hosts
+    ]
+    # like the entry setup: the first data before the entities, warms up the pool
+    await _async_cycle(hass, coordinators)
+
+    entities = [
+        ZeverSolarSensor(coordinator, DeviceInfo(), f"bench_{index}", Sensor(sensor_id))
+        for index, coordinator in enumerate(coordinators)
+        for sensor_id in _SENSOR_IDS
+    ]
+    component = EntityComponent(logging.getLogger(__name__), "sensor", hass)
+    await component.async_add_entities(entities)
+    power_entity_ids = {
+        entity.entity_id
+        for entity in entities
+        if entity.unique_id.endswith(ArrayPosition.pac_watt.name)
+    }
+
+    state_times: list[float] = []
+
+    @callback
+    def _async_state_changed(event: Event) -> None:
+        if event.data["entity_id"] in power_entity_ids:
+            state_times.append(time.perf_counter())
+
+    hass.bus.async_listen(EVENT_STATE_CHANGED, _async_state_changed)
+
+    latencies: list[float] = []
+    cpu_times: list[float] = []
+    lags: list[float] = []
+    probe = asyncio.create_task(_async_probe_loop_lag(lags))
+    for _ in range(cycles):
+        state_times.clear()
+        cpu_start = time.process_time()
+        start = await _async_cycle(hass, coordinators)
+        cpu_times.append((time.process_time() - cpu_start) * 1000)
+        latencies.extend((state_time - start) * 1000 for state_time in state_times)
+    probe.cancel()
+
+    # tracemalloc slows everything down, so the allocations get cycles of their own
+    peaks: list[float] = []
+    tracemalloc.start()
+    for _ in range(cycles):
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        await _async_cycle(hass, coordinators)
+        peaks.append((tracemalloc.get_traced_memory()[1] - baseline) / 1024)
+    tracemalloc.stop()
+
+    failed = sum(not coordinator.last_update_success for coordinator in coordinators)
+
+    for coordinator in coordinators:
+        await coordinator.async_shutdown()
+    await pool.async_close()
+    await hass.async_stop(force=True)
+
+    return {
+        "inverters": len(hosts),
+        "cycles": cycles,
+        "failed_polls": failed,
+        "state_writes": len(latencies),
+        "poll_to_state_ms": _percentiles(latencies) if latencies else None,
+        "cpu_ms_per_cycle": round(statistics.fmean(cpu_times), 3),
+        "alloc_peak_kib_per_cycle": round(statistics.fmean(peaks), 1),
+        "loop_lag_ms": _percentiles(lags) if lags else None,
+    }
+
+
+def _run(count: int, cycles: int) -> dict:
+    """Start the fake inverters in a child process and measure."""
+    connection, child_connection = multiprocessing.Pipe()
+    server = multiprocessing.Process(
+        target=_serve_fake_inverters, args=(count, child_connection), daemon=True
+    )
+    server.start()
+    try:
+        hosts = connection.recv()
+        return asyncio.run(_async_measure(hosts, cycles))
+    finally:
+        connection.send(None)
+        server.join(timeout=10)
+
+
+def main(argv: list[str]) -> None:
+    """Measure every inverter count and write the results as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--inverters", default="1,10,100,500")
+    parser.add_argument("--cycles", type=int, default=5)
+    parser.add_argument("--output")
+    args = parser.parse_args(argv)
+
+    results = {
+        "benchmark": "polling",
+        "python": sys.version.split()[0],
+        "results": [
+            _run(int(count), args.cycles) for count in args.inverters.split(",")
+        ],
+    }
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(text + "\n")
+    print(text)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -1,31 +1,94 @@
 """integrates a Zeversolar inverter to Home Assistant using its local API."""
 from __future__ import annotations
 
-import asyncio
 from datetime import timedelta
 import logging
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_HOST
-from homeassistant.core import HomeAssistant
-from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.const import (
+    CONF_HOST,
+    EVENT_HOMEASSISTANT_CLOSE,
+    EVENT_HOMEASSISTANT_STOP,
+)
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.typing import ConfigType
+from homeassistant.util.ssl import client_context
+import voluptuous as vol
 
 from .const import (
+    CONF_FLEET,
+    CONF_MAX_CONCURRENCY,
     CONF_SERIAL_NO,
+    CONNECTION_POOL_KEEPALIVE_EXPIRY,
+    CONNECTION_POOL_MAX_CONNECTIONS,
+    DATA_CONNECTION_POOL,
+    DATA_FLEET,
     DOMAIN,
     ENTRY_COORDINATOR,
+    ENTRY_DAILY_SUMMARIES,
     ENTRY_DEVICE_INFO,
+    FLEET_MAX_CONCURRENCY_VALUE,
     OPT_DATA_INTERVAL,
     OPT_DATA_INTERVAL_VALUE,
+    OPT_ENERGY_STATISTICS,
+    OPT_ENERGY_STATISTICS_VALUE,
+    OPT_HOURLY_ENERGY_STATE,
+    OPT_HOURLY_ENERGY_STATE_VALUE,
+    OPT_MAX_DATA_INTERVAL,
+    OPT_MAX_DATA_INTERVAL_VALUE,
+    OPT_PEAK_POWER,
+    OPT_PEAK_POWER_VALUE,
     PLATFORMS,
     STARTUP_MESSAGE,
 )
 from .coordinator import ZeversolarApiCoordinator
-from .zever_local import ZeverSolarApiClient
+from .device_cache import ZeverSolarDeviceCache, device_data
+from .energy_statistics import ZeverSolarEnergyStatistics
+from .fleet import ZeversolarFleetScheduler
+from .services import async_setup_services
+from .summary import ZeverSolarDailySummaries
+from .zever_local import ZeverSolarApiClient, ZeverSolarConnectionPool
 
 _LOGGER = logging.getLogger(__name__)
 
+CONFIG_SCHEMA = vol.Schema(
+    {
+        DOMAIN: vol.Schema(
+            {
+                vol.Optional(CONF_FLEET): vol.Schema(
+                    {
+                        vol.Optional(
+                            CONF_MAX_CONCURRENCY, default=FLEET_MAX_CONCURRENCY_VALUE
+                        ): vol.All(cv.positive_int, vol.Range(min=1)),
+                    }
+                ),
+            }
+        )
+    },
+    extra=vol.ALLOW_EXTRA,
+)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up this integration and the fleet scheduler if configured in YAML."""
+    if hass.data.get(DOMAIN) is None:
+        hass.data.setdefault(DOMAIN, {})
+        _LOGGER.info(STARTUP_MESSAGE)
+
+    async_setup_services(hass)
+
+    fleet_config = config.get(DOMAIN, {}).get(CONF_FLEET)
+    if fleet_config is None:
+        return True
+
+    fleet = ZeversolarFleetScheduler(hass, fleet_config[CONF_MAX_CONCURRENCY])
+    hass.data[DOMAIN][DATA_FLEET] = fleet
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, fleet.async_shutdown)
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up this integration using UI."""
@@ -38,56 +101,109 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # zever_id = entry.data.get(CONF_SERIAL_NO)
 
     data_interval = entry.options.get(OPT_DATA_INTERVAL, OPT_DATA_INTERVAL_VALUE)
+    max_data_interval = entry.options.get(
+        OPT_MAX_DATA_INTERVAL, OPT_MAX_DATA_INTERVAL_VALUE
+    )
 
-    client = ZeverSolarApiClient(host)
+    pool = _async_get_connection_pool(hass)
+    client = ZeverSolarApiClient(host, http_client=pool.http_client)
+    coordinator = ZeversolarApiCoordinator(
+        hass,
+        client=client,
+        update_interval=timedelta(seconds=data_interval),
+        max_update_interval=timedelta(seconds=max_data_interval),
+        fleet=hass.data[DOMAIN].get(DATA_FLEET),
+    )
+    device_cache = ZeverSolarDeviceCache(hass, entry.entry_id)
 
+    pool.attach(entry.entry_id)
     try:
-        await client.inverter.async_connect()
-        coordinator = ZeversolarApiCoordinator(hass, client=client)
-        coordinator.update_interval = timedelta(seconds=data_interval)
-        await coordinator.async_refresh()
-
-        if not coordinator.last_update_success:
-            raise ConfigEntryNotReady
-
-    except Exception as err:
-        raise ConfigEntryNotReady from err
-
-    serial_number = entry.data[CONF_SERIAL_NO]
-
-    inverter_data = await coordinator.client.async_get_data()
-    hardware_version = inverter_data.hardware_version
-    software_version = inverter_data.software_version
-
-    device_info = DeviceInfo(
-        configuration_url=f"http://{host}",
-        # default_manufacturer: str
-        # default_model: str
-        # default_name: str
-        # entry_type: DeviceEntryType | None
-        identifiers={(DOMAIN, serial_number)},
-        manufacturer="Zeversolar",
-        # model: str | None
-        name=f"Zeversolar inverter '{serial_number}'",
-        # suggested_area: str | None
-        sw_version=software_version,
-        hw_version=hardware_version,
-        # via_device: tuple[str, str]
-    )
+        device = await device_cache.async_load()
+        if device is None:
+            # A single fetch feeds the device info, the inverter identity and the
+            # first data of all platforms. Raises ConfigEntryNotReady if the
+            # inverter is down.
+            await coordinator.async_config_entry_first_refresh()
+
+            device = device_data(coordinator.data)
+            await device_cache.async_save(device)
+        else:
+            # Known inverter: set up the entities at once, they show the values
+            # restored from the last run until the inverter answers. It may be
+            # switched off for the night. The first poll is scheduled like all
+            # others, so a restart does not poll all inverters at the same time.
+            client.restore_identity(device["serial_number"], device["mac_address"])
+            coordinator.last_update_success = False
+
+        daily_summaries = ZeverSolarDailySummaries(hass, entry.entry_id)
+        daily_summaries.peak_power_kwp = entry.options.get(
+            OPT_PEAK_POWER, OPT_PEAK_POWER_VALUE
+        )
+        await daily_summaries.async_load()
+
+        await _async_set_energy_statistics(hass, entry, coordinator)
 
-    # Store the deviceinfo and coordinator object for the platforms to access
-    hass.data[DOMAIN][entry.entry_id] = {
-        ENTRY_COORDINATOR: coordinator,
-        ENTRY_DEVICE_INFO: device_info,
-    }
+        serial_number = entry.data[CONF_SERIAL_NO]
 
-    for platform in PLATFORMS:
-        coordinator.platforms.append(platform)
-        hass.async_add_job(
-            hass.config_entries.async_forward_entry_setup(entry, platform)
+        device_info = DeviceInfo(
+            configuration_url=f"http://{host}",
+            # default_manufacturer: str
+            # default_model: str
+            # default_name: str
+            # entry_type: DeviceEntryType | None
+            identifiers={(DOMAIN, serial_number)},
+            manufacturer="Zeversolar",
+            # model: str | None
+            name=f"Zeversolar inverter '{serial_number}'",
+            # suggested_area: str | None
+            sw_version=device["software_version"],
+            hw_version=device["hardware_version"],
+            # via_device: tuple[str, str]
         )
 
-    # Wait to install the reload listener until everything was successfully initialized
+        # Store the deviceinfo and coordinator object for the platforms to access
+        hass.data[DOMAIN][entry.entry_id] = {
+            ENTRY_COORDINATOR: coordinator,
+            ENTRY_DEVICE_INFO: device_info,
+            ENTRY_DAILY_SUMMARIES: daily_summaries,
+        }
+
+        # The entry is loaded once the entities of all platforms exist.
+        coordinator.platforms.extend(PLATFORMS)
+        await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    except Exception:
+        # A failed setup leaves no scheduled poll and no user of the pool behind.
+        hass.data[DOMAIN].pop(entry.entry_id, None)
+        await coordinator.async_shutdown()
+        await _async_release_connection_pool(hass, entry)
+        raise
+
+    entry.async_on_unload(coordinator.async_track_sun())
+
+    @callback
+    def _async_update_device_cache() -> None:
+        """Store new versions, e.g. after a firmware update of the inverter."""
+        if coordinator.data is None or not coordinator.last_update_success:
+            return
+
+        device = device_data(coordinator.data)
+        if not device_cache.async_update(device):
+            return
+
+        device_registry = dr.async_get(hass)
+        device_entry = device_registry.async_get_device({(DOMAIN, serial_number)})
+        if device_entry is not None:
+            device_registry.async_update_device(
+                device_entry.id,
+                sw_version=device["software_version"],
+                hw_version=device["hardware_version"],
+            )
+
+    entry.async_on_unload(coordinator.async_add_listener(_async_update_device_cache))
+
+    daily_summaries.async_track_midnight(coordinator)
+
+    # Wait to install the options listener until everything was successfully initialized
     entry.async_on_unload(entry.add_update_listener(async_options_update_listener))
     return True
 
@@ -95,21 +211,87 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Handle removal of an entry."""
     coordinator = hass.data[DOMAIN][entry.entry_id][ENTRY_COORDINATOR]
-    unloaded = all(
-        await asyncio.gather(
-            *[
-                hass.config_entries.async_forward_entry_unload(entry, platform)
-                for platform in PLATFORMS
-                if platform in coordinator.platforms
-            ]
-        )
+    unloaded = await hass.config_entries.async_unload_platforms(
+        entry, coordinator.platforms
     )
     if unloaded:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        entry_data = hass.data[DOMAIN].pop(entry.entry_id)
+        # async_reload_entry unloads without the unload callbacks of the entry
+        await coordinator.async_shutdown()
+        entry_data[ENTRY_DAILY_SUMMARIES].async_shutdown()
+        await _async_release_connection_pool(hass, entry)
 
     return unloaded
 
 
+async def _async_set_energy_statistics(
+    hass: HomeAssistant, entry: ConfigEntry, coordinator: ZeversolarApiCoordinator
+) -> None:
+    """Add the energy to the long-term statistics if enabled in the options."""
+    coordinator.hourly_energy_state = entry.options.get(
+        OPT_HOURLY_ENERGY_STATE, OPT_HOURLY_ENERGY_STATE_VALUE
+    )
+    if not entry.options.get(OPT_ENERGY_STATISTICS, OPT_ENERGY_STATISTICS_VALUE):
+        coordinator.energy_statistics = None
+        return
+
+    if coordinator.energy_statistics is not None:
+        return
+
+    if "recorder" not in hass.config.components:
+        _LOGGER.warning("The energy statistics of Zeversolar need the recorder")
+        return
+
+    energy_statistics = ZeverSolarEnergyStatistics(hass, entry.data[CONF_SERIAL_NO])
+    await energy_statistics.async_load()
+    coordinator.energy_statistics = energy_statistics
+
+
+def _async_get_connection_pool(hass: HomeAssistant) -> ZeverSolarConnectionPool:
+    """Return the connection pool shared by all entries, create it if needed."""
+    pool: ZeverSolarConnectionPool = hass.data[DOMAIN].get(DATA_CONNECTION_POOL)
+    if pool is not None:
+        return pool
+
+    pool = ZeverSolarConnectionPool(
+        verify=client_context(),
+        max_connections=CONNECTION_POOL_MAX_CONNECTIONS,
+        keepalive_expiry=CONNECTION_POOL_KEEPALIVE_EXPIRY,
+    )
+    hass.data[DOMAIN][DATA_CONNECTION_POOL] = pool
+
+    async def _async_close_pool(_: Event) -> None:
+        """Close the pool when Home Assistant stops without unloading entries."""
+        pool.unsub_close = None
+        await pool.async_close()
+
+    pool.unsub_close = hass.bus.async_listen_once(
+        EVENT_HOMEASSISTANT_CLOSE, _async_close_pool
+    )
+    return pool
+
+
+async def _async_release_connection_pool(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> None:
+    """Release the connection pool of the entry, close it after the last one."""
+    pool: ZeverSolarConnectionPool = hass.data[DOMAIN].get(DATA_CONNECTION_POOL)
+    if pool is None:
+        return
+
+    if await pool.async_release(entry.entry_id):
+        hass.data[DOMAIN].pop(DATA_CONNECTION_POOL)
+        if pool.unsub_close is not None:
+            pool.unsub_close()
+            pool.unsub_close = None
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the stored data of a deleted entry."""
+    await ZeverSolarDeviceCache(hass, entry.entry_id).async_remove()
+    await ZeverSolarDailySummaries(hass, entry.entry_id).async_remove()
+
+
 async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Reload config entry."""
     await async_unload_entry(hass, entry)
@@ -119,5 +301,23 @@ async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
 async def async_options_update_listener(
     hass: HomeAssistant, config_entry: ConfigEntry
 ) -> None:
-    """Handle options update."""
-    await hass.config_entries.async_reload(config_entry.entry_id)
+    """Apply the changed options to the running coordinator."""
+    entry_data = hass.data[DOMAIN].get(config_entry.entry_id)
+    if entry_data is None:
+        return
+
+    coordinator: ZeversolarApiCoordinator = entry_data[ENTRY_COORDINATOR]
+    entry_data[ENTRY_DAILY_SUMMARIES].peak_power_kwp = config_entry.options.get(
+        OPT_PEAK_POWER, OPT_PEAK_POWER_VALUE
+    )
+    await _async_set_energy_statistics(hass, config_entry, coordinator)
+    coordinator.async_set_update_intervals(
+        timedelta(
+            seconds=config_entry.options.get(OPT_DATA_INTERVAL, OPT_DATA_INTERVAL_VALUE)
+        ),
+        timedelta(
+            seconds=config_entry.options.get(
+                OPT_MAX_DATA_INTERVAL, OPT_MAX_DATA_INTERVAL_VALUE
+            )
+        ),
+    )
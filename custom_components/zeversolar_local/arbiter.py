@@ -0,0 +1,74 @@
+"""Serializes the requests to a Zeversolar inverter."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+import heapq
+import itertools
+
+PRIORITY_COMMAND = 0
+PRIORITY_POLL = 1
+
+
+class ZeverSolarRequestArbiter:
+    """Lets one request at a time talk to the inverter.
+
+    The web server of the inverter copes badly with overlapping requests.
+    Waiting requests are served by priority, a power command before a poll,
+    and in order of arrival within a priority. The next request starts
+    'min_gap' seconds after the previous one ended at the earliest.
+    """
+
+    def __init__(self, min_gap: float) -> None:
+        self.min_gap = min_gap
+        self._busy = False
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._order = itertools.count()
+        self._last_end: float | None = None
+
+    @property
+    def queue_depth(self) -> int:
+        """The number of requests waiting for their turn."""
+        return sum(not waiter.done() for _, _, waiter in self._waiters)
+
+    @asynccontextmanager
+    async def async_slot(self, priority: int) -> AsyncIterator[float]:
+        """Wait for the turn of a request, yields the waited seconds."""
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await self._async_acquire(priority)
+        try:
+            if self._last_end is not None:
+                delay = self._last_end + self.min_gap - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            yield loop.time() - start
+        finally:
+            self._last_end = loop.time()
+            self._release()
+
+    async def _async_acquire(self, priority: int) -> None:
+        """Wait until no other request talks to the inverter."""
+        if not self._busy and not self._waiters:
+            self._busy = True
+            return
+
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._order), waiter))
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # got the turn and was cancelled at the same time
+                self._release()
+            raise
+
+    def _release(self) -> None:
+        """Hand the turn to the next waiting request."""
+        while self._waiters:
+            _, _, waiter = heapq.heappop(self._waiters)
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self._busy = False
@@ -7,10 +7,11 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from zever_local.inverter import Inverter
 
-from .const import DOMAIN, ENTRY_COORDINATOR, ENTRY_DEVICE_INFO
+from .const import DOMAIN, ENTRY_COORDINATOR, ENTRY_DEVICE_INFO, INVERTER_STATUS_OK
 from .coordinator import ZeversolarApiCoordinator
+from .parser import ZeverSolarData
+from .zever_local import ZeverSolarApiClient
 
 # not needed
 # SCAN_INTERVAL = timedelta(seconds=30)
@@ -22,7 +23,8 @@ PARALLEL_UPDATES = 1
 class ZeversolarButtonEntityDescriptionMixin:
     """Mixin to describe a Zeversolar button entity."""
 
-    press_action: Awaitable[Callable[[Inverter], None]]
+    press_action: Callable[[ZeverSolarApiClient], Awaitable[bool]]
+    confirm_fn: Callable[[ZeverSolarData], bool]
 
 
 @dataclass
@@ -35,7 +37,8 @@ class ZeversolarButtonEntityDescription(
 BUTTON_POWER_ON_ENTITY_DESCRIPTION = ZeversolarButtonEntityDescription(
     key="power_on",
     name="Power on",
-    press_action=lambda device: device.power_on(),
+    press_action=lambda client: client.async_power_on(),
+    confirm_fn=lambda data: data.status == INVERTER_STATUS_OK,
     icon="mdi:power-cycle",
     has_entity_name=True,
     # device_class=ButtonDeviceClass.RESTART
@@ -44,7 +47,8 @@ BUTTON_POWER_ON_ENTITY_DESCRIPTION = ZeversolarButtonEntityDescription(
 BUTTON_POWER_OFF_ENTITY_DESCRIPTION = ZeversolarButtonEntityDescription(
     key="power_off",
     name="Power off",
-    press_action=lambda device: device.power_off(),
+    press_action=lambda client: client.async_power_off(),
+    confirm_fn=lambda data: data.pac_watt == 0,
     icon="mdi:power-off",
     has_entity_name=True,
 )
@@ -57,15 +61,13 @@ async def async_setup_entry(
     zever_coordinator: ZeversolarApiCoordinator = hass.data[DOMAIN][entry.entry_id][
         ENTRY_COORDINATOR
     ]
-    inverter = zever_coordinator.client.inverter
-
     device_info: DeviceInfo = hass.data[DOMAIN][entry.entry_id][ENTRY_DEVICE_INFO]
 
     power_on_button = ZeverSolarButton(
-        inverter, device_info, BUTTON_POWER_ON_ENTITY_DESCRIPTION
+        zever_coordinator, device_info, BUTTON_POWER_ON_ENTITY_DESCRIPTION
     )
     power_off_button = ZeverSolarButton(
-        inverter, device_info, BUTTON_POWER_OFF_ENTITY_DESCRIPTION
+        zever_coordinator, device_info, BUTTON_POWER_OFF_ENTITY_DESCRIPTION
     )
 
     entities = [power_on_button, power_off_button]
@@ -79,19 +81,19 @@ class ZeverSolarButton(ButtonEntity):
 
     def __init__(
         self,
-        inverter: Inverter,
+        coordinator: ZeversolarApiCoordinator,
         device_info: DeviceInfo,
         entity_description: ZeversolarButtonEntityDescription,
     ) -> None:
         """Initialize an inverter button."""
 
         self._attr_unique_id = (
-            f"{DOMAIN}_{inverter.serial_number}_{entity_description.key}"
+            f"{DOMAIN}_{coordinator.client.serial_number}_{entity_description.key}"
         )
 
         self._attr_device_info = device_info
         self.entity_description = entity_description
-        self._inverter = inverter
+        self._coordinator = coordinator
 
     @property
     def entity_registry_enabled_default(self) -> bool:
@@ -99,5 +101,9 @@ class ZeverSolarButton(ButtonEntity):
         return False
 
     async def async_press(self) -> None:
-        """Perform the button action."""
-        await self.entity_description.press_action(self._inverter)
+        """Send the command, the states follow once the inverter confirms it."""
+        await self._coordinator.async_run_command(
+            self.entity_description.key,
+            self.entity_description.press_action,
+            self.entity_description.confirm_fn,
+        )
@@ -0,0 +1,70 @@
+"""Circuit breaker for an unreachable Zeversolar inverter."""
+from __future__ import annotations
+
+from collections.abc import Callable
+import random
+import time
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class ZeverSolarCircuitBreaker:
+    """Stops sending requests to an inverter that does not answer.
+
+    Opens after 'failure_threshold' failed requests in a row. While open no
+    request is sent until the retry delay passed, then a single request is let
+    through (half open). Its success closes the breaker, its failure opens it
+    again with the doubled delay, capped at 'max_delay'. The delays are
+    jittered to 50-100 % so many inverters lost together do not retry in sync.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        base_delay: float,
+        max_delay: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.failures = 0
+        self._clock = clock
+        self._retry_at: float | None = None
+
+    @property
+    def state(self) -> str:
+        """The state of the breaker: closed, open or half_open."""
+        if self._retry_at is None:
+            return STATE_CLOSED
+        if self._clock() < self._retry_at:
+            return STATE_OPEN
+        return STATE_HALF_OPEN
+
+    @property
+    def retry_in(self) -> float | None:
+        """The seconds until the next request is let through while open."""
+        if self._retry_at is None:
+            return None
+        return max(self._retry_at - self._clock(), 0)
+
+    def allow_request(self) -> bool:
+        """Return True if a request may be sent."""
+        return self.state != STATE_OPEN
+
+    def record_success(self) -> None:
+        """Close the breaker, the inverter answered."""
+        self.failures = 0
+        self._retry_at = None
+
+    def record_failure(self) -> None:
+        """Count a failed request, open the breaker at the threshold."""
+        self.failures += 1
+        if self.failures < self.failure_threshold:
+            return
+
+        exponent = self.failures - self.failure_threshold
+        delay = min(self.base_delay * 2 ** min(exponent, 32), self.max_delay)
+        self._retry_at = self._clock() + delay * random.uniform(0.5, 1)
@@ -7,7 +7,20 @@ from homeassistant.core import callback
 import voluptuous as vol
 from zever_local.inverter import ZeversolarError, ZeversolarTimeout
 
-from .const import CONF_SERIAL_NO, DOMAIN, OPT_DATA_INTERVAL, OPT_DATA_INTERVAL_VALUE
+from .const import (
+    CONF_SERIAL_NO,
+    DOMAIN,
+    OPT_DATA_INTERVAL,
+    OPT_DATA_INTERVAL_VALUE,
+    OPT_ENERGY_STATISTICS,
+    OPT_ENERGY_STATISTICS_VALUE,
+    OPT_HOURLY_ENERGY_STATE,
+    OPT_HOURLY_ENERGY_STATE_VALUE,
+    OPT_MAX_DATA_INTERVAL,
+    OPT_MAX_DATA_INTERVAL_VALUE,
+    OPT_PEAK_POWER,
+    OPT_PEAK_POWER_VALUE,
+)
 from .zever_local import ZeverSolarApiClient
 
 _LOGGER = logging.getLogger(__name__)
@@ -105,6 +118,10 @@ class ZeverSolarOptionsFlowHandler(config_entries.OptionsFlow):
 
         if user_input is not None:
             new_data_interval = user_input[OPT_DATA_INTERVAL]
+            new_max_data_interval = user_input.get(
+                OPT_MAX_DATA_INTERVAL, OPT_MAX_DATA_INTERVAL_VALUE
+            )
+            new_peak_power = user_input.get(OPT_PEAK_POWER, OPT_PEAK_POWER_VALUE)
             _LOGGER.debug("New data interval was set to %s", new_data_interval)
 
             if new_data_interval is None:
@@ -115,6 +132,14 @@ class ZeverSolarOptionsFlowHandler(config_entries.OptionsFlow):
                 _LOGGER.debug("New data interval is wrong (out of limits)")
                 _errors["base"] = "data_interval_wrong"
 
+            elif not new_data_interval <= new_max_data_interval <= 86400:
+                _LOGGER.debug("New maximum data interval is wrong (out of limits)")
+                _errors["base"] = "max_data_interval_wrong"
+
+            elif not 0 <= new_peak_power <= 1000:
+                _LOGGER.debug("New peak power is wrong (out of limits)")
+                _errors["base"] = "peak_power_wrong"
+
             else:
                 return self.async_create_entry(title="", data=user_input)
 
@@ -128,6 +153,30 @@ class ZeverSolarOptionsFlowHandler(config_entries.OptionsFlow):
                             OPT_DATA_INTERVAL, OPT_DATA_INTERVAL_VALUE
                         ),
                     ): int,
+                    vol.Optional(
+                        OPT_MAX_DATA_INTERVAL,
+                        default=self.config_entry.options.get(
+                            OPT_MAX_DATA_INTERVAL, OPT_MAX_DATA_INTERVAL_VALUE
+                        ),
+                    ): int,
+                    vol.Optional(
+                        OPT_PEAK_POWER,
+                        default=self.config_entry.options.get(
+                            OPT_PEAK_POWER, OPT_PEAK_POWER_VALUE
+                        ),
+                    ): vol.Coerce(float),
+                    vol.Optional(
+                        OPT_ENERGY_STATISTICS,
+                        default=self.config_entry.options.get(
+                            OPT_ENERGY_STATISTICS, OPT_ENERGY_STATISTICS_VALUE
+                        ),
+                    ): bool,
+                    vol.Optional(
+                        OPT_HOURLY_ENERGY_STATE,
+                        default=self.config_entry.options.get(
+                            OPT_HOURLY_ENERGY_STATE, OPT_HOURLY_ENERGY_STATE_VALUE
+                        ),
+                    ): bool,
                 }
             ),
             errors=_errors,
@@ -17,10 +17,98 @@ CONF_SERIAL_NO = "zever_serial_number"
 
 ENTRY_COORDINATOR = "zever_coordinator"
 ENTRY_DEVICE_INFO = "zever_device_info"
+ENTRY_DAILY_SUMMARIES = "zever_daily_summaries"
+
+"""The optional fleet scheduler polling the inverters of all entries."""
+DATA_FLEET = "zever_fleet"
+CONF_FLEET = "fleet"
+CONF_MAX_CONCURRENCY = "max_concurrency"
+FLEET_MAX_CONCURRENCY_VALUE: int = 4
+
+"""The number of requests kept for the poll statistics."""
+METRICS_WINDOW: int = 100
+
+"""The readings kept in memory, a day at the shortest update interval of 10 s."""
+HISTORY_CAPACITY: int = 24 * 3600 // 10
+
+"""The rolling windows of the AC power statistics in seconds, by key."""
+STATISTICS_WINDOWS: dict[str, int] = {"5min": 300, "1h": 3600, "24h": 24 * 3600}
+
+"""The production of every day is summarized after midnight and kept for a
+year. The hours of a day above this AC power in W are counted."""
+DAILY_SUMMARY_DAYS: int = 365
+DAILY_SUMMARY_POWER_THRESHOLD: float = 100
+DAILY_SUMMARY_STORAGE_VERSION: int = 1
+
+"""The number of raw payloads kept for the diagnostics."""
+PAYLOAD_HISTORY: int = 10
+
+"""One request at a time is sent to an inverter, with this gap in seconds."""
+REQUEST_MIN_GAP: float = 0.3
+
+"""After a power command the inverter is polled every few seconds until it
+confirms the new state or the deadline passed."""
+COMMAND_CONFIRM_INTERVAL: float = 2
+COMMAND_CONFIRM_DEADLINE: float = 30
+
+"""The burst_poll service polls at a high rate within these bounds in seconds."""
+SERVICE_BURST_POLL = "burst_poll"
+ATTR_INTERVAL = "interval"
+ATTR_DURATION = "duration"
+BURST_INTERVAL_VALUE: float = 2
+BURST_INTERVAL_MIN: float = 1
+BURST_INTERVAL_MAX: float = 10
+BURST_DURATION_VALUE: float = 60
+BURST_DURATION_MIN: float = 10
+BURST_DURATION_MAX: float = 900
+
+"""The device data is stored to set up the entities while the inverter is off."""
+DEVICE_CACHE_STORAGE_VERSION: int = 1
+
+"""The request timeout is learned from the round trip times within these bounds."""
+REQUEST_TIMEOUT_INITIAL: int = 5
+REQUEST_TIMEOUT_FLOOR: int = 1
+REQUEST_TIMEOUT_CEILING: int = 10
+
+"""No request is sent to an inverter after this many failures in a row until
+the retry delay passed. The delay doubles with every further failure."""
+CIRCUIT_BREAKER_FAILURE_THRESHOLD: int = 3
+CIRCUIT_BREAKER_BASE_DELAY: int = 30
+CIRCUIT_BREAKER_MAX_DELAY: int = 900
+
+"""The keep-alive connection pool shared by all config entries."""
+DATA_CONNECTION_POOL = "zever_connection_pool"
+CONNECTION_POOL_MAX_CONNECTIONS: int = 100
+CONNECTION_POOL_KEEPALIVE_EXPIRY: int = 60
 
 OPT_DATA_INTERVAL = "zever_data_interval"
 OPT_DATA_INTERVAL_VALUE: int = 30
 
+"""The update interval is stretched up to this limit while nothing is produced."""
+OPT_MAX_DATA_INTERVAL = "zever_max_data_interval"
+OPT_MAX_DATA_INTERVAL_VALUE: int = 600
+MAX_IDLE_BACKOFF_EXPONENT: int = 10
+
+"""The energy of the day is added to the long-term statistics every hour, its
+sensor may then write its state once an hour only."""
+OPT_ENERGY_STATISTICS = "zever_energy_statistics"
+OPT_ENERGY_STATISTICS_VALUE: bool = False
+OPT_HOURLY_ENERGY_STATE = "zever_hourly_energy_state"
+OPT_HOURLY_ENERGY_STATE_VALUE: bool = False
+
+"""The peak power of the panels in kWp for the specific yield, 0 if unknown."""
+OPT_PEAK_POWER = "zever_peak_power"
+OPT_PEAK_POWER_VALUE: float = 0
+
+"""The attributes of a sensor that may show a value restored after a restart."""
+ATTR_READING_TIME = "reading_time"
+ATTR_STALE = "stale"
+
+INVERTER_STATUS_OK = "OK"
+
+SUN_ENTITY_ID = "sun.sun"
+SUN_STATE_ABOVE_HORIZON = "above_horizon"
+
 
 """The actual version of the integration."""
 VERSION = "1.2.1"
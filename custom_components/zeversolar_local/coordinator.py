@@ -1,41 +1,335 @@
 """The Zeversolar Inverter local coordinator."""
 from __future__ import annotations
 
+import asyncio
+from collections import deque
+from collections.abc import Awaitable, Callable
 from datetime import timedelta
 import logging
+import time
+from typing import TYPE_CHECKING
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_state_change_event
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
+from zever_local.inverter import ArrayPosition, ZeversolarError, ZeversolarTimeout
 
-from .const import DOMAIN, OPT_DATA_INTERVAL_VALUE
+from .const import (
+    COMMAND_CONFIRM_DEADLINE,
+    COMMAND_CONFIRM_INTERVAL,
+    DOMAIN,
+    HISTORY_CAPACITY,
+    INVERTER_STATUS_OK,
+    MAX_IDLE_BACKOFF_EXPONENT,
+    OPT_DATA_INTERVAL_VALUE,
+    OPT_MAX_DATA_INTERVAL_VALUE,
+    STATISTICS_WINDOWS,
+    SUN_ENTITY_ID,
+    SUN_STATE_ABOVE_HORIZON,
+)
+from .history import ZeverSolarHistory
+from .parser import ZeverSolarData
+from .windows import ZeverSolarRollingWindow
 from .zever_local import ZeverSolarApiClient
 
+if TYPE_CHECKING:
+    from .energy_statistics import ZeverSolarEnergyStatistics
+    from .fleet import ZeversolarFleetScheduler
+
 _LOGGER = logging.getLogger(__name__)
 
+# The fields shown by the sensors, compared on every update.
+_TRACKED_FIELDS = (
+    ArrayPosition.pac_watt.name,
+    ArrayPosition.energy_today_KWh.name,
+    ArrayPosition.communication_status.name,
+    ArrayPosition.status.name,
+)
+
 
 class ZeversolarApiCoordinator(DataUpdateCoordinator):
     """Class to manage fetching data from the API."""
 
-    def __init__(self, hass: HomeAssistant, client: ZeverSolarApiClient) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        client: ZeverSolarApiClient,
+        update_interval: timedelta = timedelta(seconds=OPT_DATA_INTERVAL_VALUE),
+        max_update_interval: timedelta = timedelta(
+            seconds=OPT_MAX_DATA_INTERVAL_VALUE
+        ),
+        fleet: ZeversolarFleetScheduler | None = None,
+    ) -> None:
         """Initialize."""
         self.client = client
         self.platforms = []
+        self.fleet = fleet
+        self.base_update_interval = update_interval
+        self.max_update_interval = max(update_interval, max_update_interval)
+        self.idle_polls = 0
+        self.changed_fields: frozenset[str] = frozenset()
+        self._command: asyncio.Task[None] | None = None
+        self._command_key: str | None = None
+        self.history = ZeverSolarHistory(HISTORY_CAPACITY)
+        self.pac_windows = {
+            key: ZeverSolarRollingWindow(span)
+            for key, span in STATISTICS_WINDOWS.items()
+        }
+        self.energy_statistics: ZeverSolarEnergyStatistics | None = None
+        self.hourly_energy_state = False
+        self.burst_readings: deque[tuple[float, float]] = deque()
+        self.burst_interval: timedelta | None = None
+        self._burst_until: float | None = None
 
         super().__init__(
-            # update_inverval is set in async_setup_entry()
             hass,
             _LOGGER,
             name=DOMAIN,
-            update_interval=timedelta(seconds=OPT_DATA_INTERVAL_VALUE),
+            update_interval=update_interval,
         )
 
+        if fleet is not None:
+            fleet.async_register(self)
+
+    @callback
+    def _schedule_refresh(self) -> None:
+        """Schedule a refresh, the fleet owns the timer if there is one."""
+        if self.fleet is None:
+            super()._schedule_refresh()
+            return
+
+        if self.update_interval is None:
+            return
+
+        if self.config_entry and self.config_entry.pref_disable_polling:
+            return
+
+        self.fleet.async_schedule(self)
+
+    def _async_unsub_refresh(self) -> None:
+        """Cancel any scheduled refresh."""
+        super()._async_unsub_refresh()
+        if self.fleet is not None:
+            self.fleet.async_unschedule(self)
+
+    async def async_fleet_refresh(self) -> None:
+        """Refresh data on behalf of the fleet scheduler."""
+        await self._async_refresh(log_failures=True, scheduled=True)
+
+    async def async_shutdown(self) -> None:
+        """Cancel any scheduled call and leave the fleet."""
+        await super().async_shutdown()
+        if self.fleet is not None:
+            self.fleet.async_unregister(self)
+
+    async def _async_get_data(self) -> ZeverSolarData:
+        """Fetch the data, limited by the concurrency of the fleet."""
+        if self.fleet is None:
+            return await self.client.async_get_data()
+
+        async with self.fleet.semaphore:
+            return await self.client.async_get_data()
+
     async def _async_update_data(self):
         """Update data via API."""
+        self.changed_fields = frozenset()
         try:
             self.last_update_success = True
-            return await self.client.async_get_data()
+            data = await self._async_get_data()
+        except ZeversolarTimeout as err:
+            self.logger.debug("Zeversolar get_data() timeout. %s", err)
+            self.last_update_success = False
+            self._adapt_update_interval(None)
+
+            raise UpdateFailed(f"Timeout communicating with API: {err}") from err
+        except ZeversolarError as err:
+            self.logger.debug("Zeversolar get_data() error. %s", err)
+            self.last_update_success = False
+            self._adapt_update_interval(None)
+
+            raise UpdateFailed(f"Error communicating with API: {err}") from err
         except Exception as exception:
             self.logger.debug("Zeversolar get_data() error. %s", exception)
             self.last_update_success = False
+            self._adapt_update_interval(None)
 
             raise UpdateFailed() from exception
+
+        now = time.time()
+        self.history.append(now, data.pac_watt, data.energy_today_KWh)
+        for window in self.pac_windows.values():
+            window.add(now, data.pac_watt)
+        if self.energy_statistics is not None:
+            self.energy_statistics.async_add_reading(
+                dt_util.utc_from_timestamp(now), data.energy_today_KWh
+            )
+        if self.burst_interval is not None:
+            self.burst_readings.append((now, data.pac_watt))
+        self._adapt_update_interval(data)
+        if data is not self.data:
+            # The very same payload changes no field. The listeners are told
+            # anyway, the poll statistics change with every poll.
+            self._detect_changed_fields(data)
+        return data
+
+    async def async_run_command(
+        self,
+        key: str,
+        send: Callable[[ZeverSolarApiClient], Awaitable[bool]],
+        confirmed: Callable[[ZeverSolarData], bool],
+    ) -> bool:
+        """Send a command and poll in the background until the inverter confirms it.
+
+        A repeated command is not sent again while the previous one is sent or
+        confirmed. Returns False if the inverter rejected the command.
+        """
+        if self._command_key == key:
+            return True
+
+        self._command_key = key
+        try:
+            accepted = await send(self.client)
+        except Exception:
+            self._command_key = None
+            raise
+
+        if not accepted:
+            self._command_key = None
+            self.logger.warning("Zeversolar inverter rejected the command '%s'", key)
+            return False
+
+        name = f"{DOMAIN} confirm {key}"
+        target = self._async_confirm_command(key, confirmed)
+        if self.config_entry is not None:
+            self._command = self.config_entry.async_create_background_task(
+                self.hass, target, name
+            )
+        else:
+            self._command = self.hass.async_create_background_task(target, name)
+        return True
+
+    async def _async_confirm_command(
+        self, key: str, confirmed: Callable[[ZeverSolarData], bool]
+    ) -> None:
+        """Poll every few seconds until the command is confirmed or the deadline.
+
+        Afterwards the regular update interval applies again. A different
+        command ends the confirmation of this one.
+        """
+        deadline = self.hass.loop.time() + COMMAND_CONFIRM_DEADLINE
+        try:
+            while self._command_key == key and self.hass.loop.time() < deadline:
+                await asyncio.sleep(COMMAND_CONFIRM_INTERVAL)
+                await self.async_refresh()
+                if self.last_update_success and confirmed(self.data):
+                    return
+
+            if self._command_key == key:
+                self.logger.warning(
+                    "Zeversolar inverter did not confirm the command '%s' within %s s",
+                    key,
+                    COMMAND_CONFIRM_DEADLINE,
+                )
+        finally:
+            if self._command_key == key:
+                self._command_key = None
+
+    def _detect_changed_fields(self, data: ZeverSolarData) -> None:
+        """Collect the fields whose value differs from the previous data."""
+        previous = self.data
+        if previous is None:
+            self.changed_fields = frozenset(_TRACKED_FIELDS)
+            return
+
+        self.changed_fields = frozenset(
+            name
+            for name in _TRACKED_FIELDS
+            if getattr(data, name) != getattr(previous, name)
+        )
+
+    def _adapt_update_interval(self, data: ZeverSolarData | None) -> None:
+        """Stretch the update interval while the inverter produces nothing.
+
+        Every poll that fails, or that reports no production while the sun is
+        down, doubles the interval up to max_update_interval. A producing
+        inverter is polled at the configured interval.
+        """
+        if data is None:
+            self.idle_polls += 1
+        elif data.status == INVERTER_STATUS_OK and data.pac_watt > 0:
+            self.idle_polls = 0
+        elif self._is_sun_up():
+            self.idle_polls = 0
+        else:
+            self.idle_polls += 1
+
+        self._apply_idle_backoff()
+
+    def _apply_idle_backoff(self) -> None:
+        """Set the update interval for the number of idle polls."""
+        if self.burst_interval is not None:
+            if self.hass.loop.time() < self._burst_until:
+                self.update_interval = self.burst_interval
+                return
+
+            self.logger.debug("Zeversolar burst poll ended")
+            self.burst_interval = None
+            self._burst_until = None
+
+        exponent = min(self.idle_polls, MAX_IDLE_BACKOFF_EXPONENT)
+        self.update_interval = min(
+            self.base_update_interval * 2**exponent, self.max_update_interval
+        )
+
+    @callback
+    def async_set_update_intervals(
+        self, update_interval: timedelta, max_update_interval: timedelta
+    ) -> None:
+        """Apply changed options without a reload, reschedule the next refresh."""
+        self.base_update_interval = update_interval
+        self.max_update_interval = max(update_interval, max_update_interval)
+        self._apply_idle_backoff()
+
+        if self._listeners:
+            self._schedule_refresh()
+
+    @callback
+    def async_start_burst(self, interval: timedelta, duration: timedelta) -> None:
+        """Poll at a high rate for a while and keep the AC power of every poll.
+
+        The readings of a previous burst are dropped. The first poll after the
+        duration returns to the configured update interval.
+        """
+        self.burst_interval = interval
+        self._burst_until = self.hass.loop.time() + duration.total_seconds()
+        self.burst_readings = deque(maxlen=int(duration / interval) + 1)
+        self._apply_idle_backoff()
+
+        if self._listeners:
+            self._schedule_refresh()
+
+    def _is_sun_up(self) -> bool:
+        """Return True if the sun is above the horizon, False if unknown."""
+        sun_state = self.hass.states.get(SUN_ENTITY_ID)
+        return sun_state is not None and sun_state.state == SUN_STATE_ABOVE_HORIZON
+
+    @callback
+    def async_track_sun(self) -> CALLBACK_TYPE:
+        """Return to the fast update interval at sunrise."""
+
+        async def _async_sun_changed(event: Event) -> None:
+            new_state = event.data.get("new_state")
+            old_state = event.data.get("old_state")
+            if new_state is None or new_state.state != SUN_STATE_ABOVE_HORIZON:
+                return
+            if old_state is not None and old_state.state == SUN_STATE_ABOVE_HORIZON:
+                return
+
+            self.idle_polls = 0
+            self.update_interval = self.base_update_interval
+            await self.async_request_refresh()
+
+        return async_track_state_change_event(
+            self.hass, [SUN_ENTITY_ID], _async_sun_changed
+        )
@@ -0,0 +1,69 @@
+"""Persists the identity and versions of a Zeversolar inverter."""
+from __future__ import annotations
+
+from typing import TypedDict
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DEVICE_CACHE_STORAGE_VERSION, DOMAIN
+from .parser import ZeverSolarData
+
+
+class ZeverSolarDeviceData(TypedDict):
+    """The cached device data of an inverter."""
+
+    serial_number: str
+    mac_address: str
+    hardware_version: str
+    software_version: str
+
+
+def device_data(inverter_data: ZeverSolarData) -> ZeverSolarDeviceData:
+    """Return the device data of the inverter data."""
+    return ZeverSolarDeviceData(
+        serial_number=inverter_data.serial_number,
+        mac_address=inverter_data.mac_address,
+        hardware_version=inverter_data.hardware_version,
+        software_version=inverter_data.software_version,
+    )
+
+
+class ZeverSolarDeviceCache:
+    """The device data of an inverter stored across restarts.
+
+    Lets a config entry set up its entities without asking an inverter that
+    is switched off for the night.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        self._hass = hass
+        self._store: Store[ZeverSolarDeviceData] = Store(
+            hass, DEVICE_CACHE_STORAGE_VERSION, f"{DOMAIN}.{entry_id}"
+        )
+        self.data: ZeverSolarDeviceData | None = None
+
+    async def async_load(self) -> ZeverSolarDeviceData | None:
+        """Load the device data, None if it was never stored."""
+        self.data = await self._store.async_load()
+        return self.data
+
+    async def async_save(self, data: ZeverSolarDeviceData) -> None:
+        """Store the device data now."""
+        self.data = data
+        await self._store.async_save(data)
+
+    @callback
+    def async_update(self, data: ZeverSolarDeviceData) -> bool:
+        """Store the device data in the background, return True if it changed."""
+        if data == self.data:
+            return False
+
+        self.data = data
+        # rare, only after a firmware update of the inverter
+        self._hass.async_create_task(self._store.async_save(data))
+        return True
+
+    async def async_remove(self) -> None:
+        """Remove the stored device data."""
+        await self._store.async_remove()
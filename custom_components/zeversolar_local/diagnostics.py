@@ -0,0 +1,125 @@
+"""Diagnostics support for the Zeversolar inverter local integration."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from homeassistant.components.diagnostics import REDACTED, async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant
+from zever_local.inverter import ArrayPosition
+
+from .const import CONF_SERIAL_NO, DATA_CONNECTION_POOL, DOMAIN, ENTRY_COORDINATOR
+from .coordinator import ZeversolarApiCoordinator
+from .zever_local import ZeverSolarConnectionPool
+
+TO_REDACT = {CONF_HOST, CONF_SERIAL_NO}
+
+# The registry id and key identify the inverter at the ZeverCloud.
+_REDACTED_FIELDS = (
+    int(ArrayPosition.registry_id),
+    int(ArrayPosition.registry_key),
+    int(ArrayPosition.serial_number),
+)
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: ZeversolarApiCoordinator = hass.data[DOMAIN][entry.entry_id][
+        ENTRY_COORDINATOR
+    ]
+    client = coordinator.client
+    metrics = client.metrics
+    pool: ZeverSolarConnectionPool | None = hass.data[DOMAIN].get(
+        DATA_CONNECTION_POOL
+    )
+
+    return {
+        "entry": {
+            "data": async_redact_data(entry.data, TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "coordinator": {
+            "update_interval": _total_seconds(coordinator.update_interval),
+            "base_update_interval": _total_seconds(coordinator.base_update_interval),
+            "max_update_interval": _total_seconds(coordinator.max_update_interval),
+            "idle_polls": coordinator.idle_polls,
+            "last_update_success": coordinator.last_update_success,
+            "last_exception": repr(coordinator.last_exception)
+            if coordinator.last_exception
+            else None,
+        },
+        "history": {
+            "readings": len(coordinator.history),
+            "capacity": coordinator.history.capacity,
+            "bytes": coordinator.history.nbytes,
+        },
+        "burst": {
+            "interval": _total_seconds(coordinator.burst_interval),
+            "readings": [
+                {
+                    "timestamp": datetime.fromtimestamp(
+                        timestamp, timezone.utc
+                    ).isoformat(),
+                    "pac_watt": pac_watt,
+                }
+                for timestamp, pac_watt in coordinator.burst_readings
+            ],
+        },
+        "polls": {
+            "requests": metrics.requests,
+            "timeouts": metrics.timeouts,
+            "errors": metrics.errors,
+            "failure_streak": metrics.failure_streak,
+            "failure_rate": metrics.failure_rate,
+            "latency_ms": metrics.latency_percentiles_ms(),
+            "wait_ms": metrics.wait_ms,
+            "queue_depth": client.arbiter.queue_depth,
+            "parse_time_us": metrics.parse_time_us,
+            "unchanged_polls": client.unchanged_polls,
+        },
+        "timeout": {
+            "timeout": client.rtt_estimator.timeout,
+            "srtt": client.rtt_estimator.srtt,
+            "rttvar": client.rtt_estimator.rttvar,
+        },
+        "circuit_breaker": {
+            "state": client.circuit_breaker.state,
+            "failures": client.circuit_breaker.failures,
+            "retry_in": client.circuit_breaker.retry_in,
+        },
+        "payloads": [
+            {
+                "timestamp": datetime.fromtimestamp(
+                    timestamp, timezone.utc
+                ).isoformat(),
+                "content": _redact_payload(content),
+            }
+            for timestamp, content in client.payloads
+        ],
+        "connection_pool": None
+        if pool is None
+        else {
+            "users": pool.users,
+            "max_connections": pool.limits.max_connections,
+            "keepalive_expiry": pool.limits.keepalive_expiry,
+            "closed": pool.http_client.is_closed,
+        },
+    }
+
+
+def _total_seconds(interval: timedelta | None) -> float | None:
+    """Return the interval in seconds."""
+    return None if interval is None else interval.total_seconds()
+
+
+def _redact_payload(content: bytes) -> str:
+    """Return the raw home.cgi payload without the identity of the inverter."""
+    fields = content.decode("utf-8", "replace").split("\n")
+    for position in _REDACTED_FIELDS:
+        if position < len(fields):
+            fields[position] = REDACTED
+    return "\n".join(fields)
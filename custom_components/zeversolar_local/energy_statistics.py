@@ -0,0 +1,84 @@
+"""Hourly energy statistics of a Zeversolar inverter."""
+from __future__ import annotations
+
+from datetime import datetime
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    get_last_statistics,
+)
+from homeassistant.const import UnitOfEnergy
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+
+
+class ZeverSolarEnergyStatistics:
+    """Aggregates the energy of the day into hourly long-term statistics.
+
+    The energy the inverter counted since the previous reading is added to
+    the hour of the reading. The first reading of a new hour adds the
+    completed hour to the recorder, a single row instead of a state for
+    every poll. The sum is the energy since the first statistic, it
+    continues across days and restarts.
+    """
+
+    def __init__(self, hass: HomeAssistant, serial_number: str) -> None:
+        self._hass = hass
+        self.statistic_id = f"{DOMAIN}:energy_{serial_number.lower()}"
+        self.metadata = StatisticMetaData(
+            has_mean=False,
+            has_sum=True,
+            name=f"Zeversolar inverter '{serial_number}' energy",
+            source=DOMAIN,
+            statistic_id=self.statistic_id,
+            unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        )
+        self.sum = 0.0
+        self._energy: float | None = None
+        self._hour: datetime | None = None
+
+    async def async_load(self) -> None:
+        """Continue the sum of the last run."""
+        last_statistics = await get_instance(self._hass).async_add_executor_job(
+            get_last_statistics,
+            self._hass,
+            1,
+            self.statistic_id,
+            False,
+            {"state", "sum"},
+        )
+        if not last_statistics:
+            return
+
+        last = last_statistics[self.statistic_id][0]
+        self.sum = last["sum"] or 0.0
+        last_hour = dt_util.utc_from_timestamp(last["start"])
+        if dt_util.as_local(last_hour).date() == dt_util.now().date():
+            # the inverter still counts the energy of the same day
+            self._energy = last["state"]
+
+    @callback
+    def async_add_reading(self, timestamp: datetime, energy_today: float) -> None:
+        """Add a reading of the energy of the day."""
+        hour = timestamp.replace(minute=0, second=0, microsecond=0)
+        if self._hour is not None and hour > self._hour:
+            # the previous hour is complete
+            async_add_external_statistics(
+                self._hass,
+                self.metadata,
+                [StatisticData(start=self._hour, state=self._energy, sum=self.sum)],
+            )
+
+        if self._energy is not None:
+            if energy_today >= self._energy:
+                self.sum += energy_today - self._energy
+            else:
+                # the inverter starts counting at zero every day
+                self.sum += energy_today
+        self._energy = energy_today
+        self._hour = hour
+
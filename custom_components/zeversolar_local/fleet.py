@@ -0,0 +1,105 @@
+"""The fleet scheduler polling the inverters of all config entries."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING
+
+from homeassistant.core import HomeAssistant, callback
+
+if TYPE_CHECKING:
+    from .coordinator import ZeversolarApiCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# Fractional part of the golden ratio, spreads the phase offsets evenly
+# however many inverters join the fleet.
+_PHASE_STEP = 0.6180339887498949
+
+
+class ZeversolarFleetScheduler:
+    """Owns the poll timers of all coordinators of the fleet.
+
+    Coordinators hand their scheduling to the fleet. Each one gets a phase
+    offset within its update interval so the inverters are not polled at the
+    same moment, and at most max_concurrency requests are on the wire.
+    """
+
+    def __init__(self, hass: HomeAssistant, max_concurrency: int) -> None:
+        """Initialize."""
+        self.hass = hass
+        self.max_concurrency = max_concurrency
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self._phases: dict[ZeversolarApiCoordinator, float] = {}
+        self._due: dict[ZeversolarApiCoordinator, float] = {}
+        self._joined = 0
+        self._wakeup: asyncio.TimerHandle | None = None
+
+    @property
+    def members(self) -> int:
+        """The number of coordinators polled by the fleet."""
+        return len(self._phases)
+
+    @callback
+    def async_register(self, coordinator: ZeversolarApiCoordinator) -> None:
+        """Add a coordinator to the fleet."""
+        self._phases[coordinator] = (self._joined * _PHASE_STEP) % 1
+        self._joined += 1
+
+    @callback
+    def async_unregister(self, coordinator: ZeversolarApiCoordinator) -> None:
+        """Remove a coordinator from the fleet."""
+        self._phases.pop(coordinator, None)
+        self.async_unschedule(coordinator)
+
+    @callback
+    def async_schedule(self, coordinator: ZeversolarApiCoordinator) -> None:
+        """Schedule the next refresh of a coordinator."""
+        if (phase := self._phases.get(coordinator)) is None:
+            return
+
+        interval = coordinator.update_interval.total_seconds()
+        if phase:
+            # The phase offset only delays the first refresh, afterwards the
+            # refreshes keep their distance.
+            self._phases[coordinator] = 0
+            interval *= 1 + phase
+
+        self._due[coordinator] = self.hass.loop.time() + interval
+        self._async_arm()
+
+    @callback
+    def async_unschedule(self, coordinator: ZeversolarApiCoordinator) -> None:
+        """Cancel the next refresh of a coordinator."""
+        if self._due.pop(coordinator, None) is not None:
+            self._async_arm()
+
+    @callback
+    def async_shutdown(self, *_) -> None:
+        """Cancel all scheduled refreshes."""
+        self._due.clear()
+        self._async_arm()
+
+    @callback
+    def _async_arm(self) -> None:
+        """Wake up when the next coordinator is due."""
+        if self._wakeup is not None:
+            self._wakeup.cancel()
+            self._wakeup = None
+
+        if self._due:
+            self._wakeup = self.hass.loop.call_at(
+                min(self._due.values()), self._async_wake_up
+            )
+
+    @callback
+    def _async_wake_up(self) -> None:
+        """Refresh all coordinators that are due."""
+        self._wakeup = None
+        now = self.hass.loop.time()
+        for coordinator, due in list(self._due.items()):
+            if due <= now:
+                del self._due[coordinator]
+                self.hass.async_create_task(coordinator.async_fleet_refresh())
+
+        self._async_arm()
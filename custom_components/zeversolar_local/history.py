@@ -0,0 +1,92 @@
+"""Recent readings of a Zeversolar inverter kept in memory."""
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterator
+
+
+class ZeverSolarHistory:
+    """A ring buffer of the readings of the last polls.
+
+    Keeps the time in whole seconds, the AC power and the energy of the day
+    in typed arrays, 12 bytes per reading. The arrays grow up to 'capacity'
+    readings, then the oldest reading is overwritten. The readings are
+    appended in chronological order, so windows are found by bisection.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        if capacity < 1:
+            raise ValueError("The capacity must be at least 1")
+
+        self.capacity = capacity
+        self._timestamps = array("I")
+        self._pac_watt = array("f")
+        self._energy_today = array("f")
+        # the index of the oldest reading once the buffer is full
+        self._start = 0
+
+    def __len__(self) -> int:
+        """The number of readings kept."""
+        return len(self._timestamps)
+
+    def __iter__(self) -> Iterator[tuple[int, float, float]]:
+        """Iterate over the readings, the oldest first."""
+        timestamps, pac_watt, energy_today = self.arrays()
+        return zip(timestamps, pac_watt, energy_today)
+
+    @property
+    def nbytes(self) -> int:
+        """The bytes used by the readings."""
+        return sum(
+            len(values) * values.itemsize
+            for values in (self._timestamps, self._pac_watt, self._energy_today)
+        )
+
+    def append(self, timestamp: float, pac_watt: float, energy_today: float) -> None:
+        """Add a reading, the time in seconds since the epoch."""
+        if len(self._timestamps) < self.capacity:
+            self._timestamps.append(int(timestamp))
+            self._pac_watt.append(pac_watt)
+            self._energy_today.append(energy_today)
+            return
+
+        index = self._start
+        self._timestamps[index] = int(timestamp)
+        self._pac_watt[index] = pac_watt
+        self._energy_today[index] = energy_today
+        self._start = (index + 1) % self.capacity
+
+    def clear(self) -> None:
+        """Drop all readings."""
+        del self._timestamps[:]
+        del self._pac_watt[:]
+        del self._energy_today[:]
+        self._start = 0
+
+    def arrays(self, since: float | None = None) -> tuple[array, array, array]:
+        """Return copies of the times, AC powers and energies, the oldest first.
+
+        Only the readings at or after 'since' are returned if given.
+        """
+        start = self._start
+        if since is None:
+            return tuple(
+                values[start:] + values[:start]
+                for values in (self._timestamps, self._pac_watt, self._energy_today)
+            )
+
+        # the older part of the ring lies behind the start index
+        since = int(since)
+        older = bisect_left(self._timestamps, since, start)
+        if older < len(self._timestamps):
+            return tuple(
+                values[older:] + values[:start]
+                for values in (self._timestamps, self._pac_watt, self._energy_today)
+            )
+
+        newer = bisect_left(self._timestamps, since, 0, start)
+        return tuple(
+            values[newer:start]
+            for values in (self._timestamps, self._pac_watt, self._energy_today)
+        )
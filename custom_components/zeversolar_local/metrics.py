@@ -0,0 +1,139 @@
+"""Poll statistics of a Zeversolar inverter."""
+from __future__ import annotations
+
+from collections import deque
+from statistics import fmean
+
+
+class ZeverSolarRttEstimator:
+    """Derives the request timeout from the round trip times, like TCP does.
+
+    Keeps the smoothed round trip time and its variation (RFC 6298). The
+    timeout is the smoothed time plus four times the variation, bound to
+    'floor' and 'ceiling'. A timeout doubles the timeout until the next
+    answer, so a slow inverter is not timed out again and again.
+    """
+
+    _ALPHA = 1 / 8
+    _BETA = 1 / 4
+    _K = 4
+
+    def __init__(self, initial: float, floor: float, ceiling: float) -> None:
+        self.floor = floor
+        self.ceiling = ceiling
+        self.srtt: float | None = None
+        self.rttvar: float | None = None
+        self.timeout = initial
+
+    def record_rtt(self, rtt: float) -> None:
+        """Records the round trip time of an answered request in seconds."""
+        if self.srtt is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+        else:
+            self.rttvar += self._BETA * (abs(self.srtt - rtt) - self.rttvar)
+            self.srtt += self._ALPHA * (rtt - self.srtt)
+
+        timeout = self.srtt + self._K * self.rttvar
+        self.timeout = min(max(timeout, self.floor), self.ceiling)
+
+    def record_timeout(self) -> None:
+        """Doubles the timeout after a request timed out."""
+        self.timeout = min(max(self.timeout * 2, self.floor), self.ceiling)
+
+
+class ZeverSolarMetrics:
+    """Records the requests to an inverter.
+
+    Latency, wait time, parse time, payload size and the outcome are kept for the last
+    'window' requests only, so the memory stays bounded. The timeout and error
+    counts are totals, the failure streak counts the failures since the last
+    successful request.
+    """
+
+    def __init__(self, window: int) -> None:
+        self.latencies: deque[float] = deque(maxlen=window)
+        self.parse_times: deque[float] = deque(maxlen=window)
+        self.payload_sizes: deque[int] = deque(maxlen=window)
+        self.outcomes: deque[bool] = deque(maxlen=window)
+        self.waits: deque[float] = deque(maxlen=window)
+        self.requests = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.failure_streak = 0
+
+    def record_success(self, latency: float, payload_size: int) -> None:
+        """Records a successful request, latency in seconds."""
+        self.requests += 1
+        self.failure_streak = 0
+        self.latencies.append(latency)
+        self.payload_sizes.append(payload_size)
+        self.outcomes.append(True)
+
+    def record_wait(self, wait: float) -> None:
+        """Records the seconds a request waited for its turn."""
+        self.waits.append(wait)
+
+    def record_parse(self, parse_time: float) -> None:
+        """Records the time in seconds to parse a payload."""
+        self.parse_times.append(parse_time)
+
+    def record_timeout(self) -> None:
+        """Records a request that timed out."""
+        self.requests += 1
+        self.timeouts += 1
+        self.failure_streak += 1
+        self.outcomes.append(False)
+
+    def record_error(self) -> None:
+        """Records a failed request or an invalid payload."""
+        self.requests += 1
+        self.errors += 1
+        self.failure_streak += 1
+        self.outcomes.append(False)
+
+    @property
+    def latency_ms(self) -> float | None:
+        """The mean latency of the successful requests in milliseconds."""
+        if not self.latencies:
+            return None
+        return round(fmean(self.latencies) * 1000, 1)
+
+    def latency_percentiles_ms(self) -> dict[str, float] | None:
+        """The p50, p95 and p99 latency of the successful requests in milliseconds."""
+        if not self.latencies:
+            return None
+        latencies = sorted(self.latencies)
+        last = len(latencies) - 1
+        return {
+            f"p{percent}": round(latencies[round(last * percent / 100)] * 1000, 1)
+            for percent in (50, 95, 99)
+        }
+
+    @property
+    def wait_ms(self) -> float | None:
+        """The mean time the requests waited for their turn in milliseconds."""
+        if not self.waits:
+            return None
+        return round(fmean(self.waits) * 1000, 1)
+
+    @property
+    def parse_time_us(self) -> float | None:
+        """The mean time to parse a payload in microseconds."""
+        if not self.parse_times:
+            return None
+        return round(fmean(self.parse_times) * 1000000, 1)
+
+    @property
+    def payload_size(self) -> int | None:
+        """The size of the last payload in bytes."""
+        if not self.payload_sizes:
+            return None
+        return self.payload_sizes[-1]
+
+    @property
+    def failure_rate(self) -> float | None:
+        """The share of failed requests in percent."""
+        if not self.outcomes:
+            return None
+        return round(self.outcomes.count(False) * 100 / len(self.outcomes), 1)
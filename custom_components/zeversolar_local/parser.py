@@ -0,0 +1,119 @@
+"""Parses the home.cgi payload of a Zeversolar inverter."""
+from __future__ import annotations
+
+from datetime import datetime
+
+from zever_local.inverter import ArrayPosition, ZeversolarError
+
+_FIELD_COUNT = len(ArrayPosition)
+
+# Plain ints index faster than the IntEnum members.
+_REGISTRY_ID = int(ArrayPosition.registry_id)
+_REGISTRY_KEY = int(ArrayPosition.registry_key)
+_HARDWARE_VERSION = int(ArrayPosition.hardware_version)
+_SOFTWARE_VERSION = int(ArrayPosition.software_version)
+_DATE_AND_TIME = int(ArrayPosition.date_and_time)
+_COMMUNICATION_STATUS = int(ArrayPosition.communication_status)
+_SERIAL_NUMBER = int(ArrayPosition.serial_number)
+_PAC_WATT = int(ArrayPosition.pac_watt)
+_ENERGY_TODAY_KWH = int(ArrayPosition.energy_today_KWh)
+_STATUS = int(ArrayPosition.status)
+
+
+class ZeverSolarData:
+    """The data of a Zeversolar inverter.
+
+    Offers the attributes of zever_local.inverter.InverterData. The numbers are
+    validated while parsing, the text fields are decoded when accessed.
+    """
+
+    __slots__ = ("_fields", "pac_watt", "energy_today_KWh")
+
+    def __init__(
+        self, fields: list[bytes], pac_watt: int, energy_today_KWh: float
+    ) -> None:
+        self._fields = fields
+        self.pac_watt = pac_watt
+        self.energy_today_KWh = energy_today_KWh
+
+    def _text(self, position: int) -> str:
+        """Decodes a text field."""
+        return self._fields[position].decode("utf-8", "replace")
+
+    @property
+    def registry_id(self) -> str:
+        """The registry id, also the MAC address."""
+        return self._text(_REGISTRY_ID)
+
+    @property
+    def registry_key(self) -> str:
+        """The registry key of the ZeverCloud."""
+        return self._text(_REGISTRY_KEY)
+
+    @property
+    def hardware_version(self) -> str:
+        """The hardware version."""
+        return self._text(_HARDWARE_VERSION)
+
+    @property
+    def software_version(self) -> str:
+        """The software version."""
+        return self._text(_SOFTWARE_VERSION)
+
+    @property
+    def communication_status(self) -> str:
+        """The communication status with the ZeverCloud."""
+        return self._text(_COMMUNICATION_STATUS)
+
+    @property
+    def serial_number(self) -> str:
+        """The serial number."""
+        return self._text(_SERIAL_NUMBER)
+
+    @property
+    def status(self) -> str:
+        """The inverter status."""
+        return self._text(_STATUS)
+
+    @property
+    def mac_address(self) -> str:
+        """The MAC address, formatted like 'EA-B2-41-27-7A-36'."""
+        registry_id = self.registry_id
+        return "-".join(registry_id[index : index + 2] for index in range(0, 12, 2))
+
+    @property
+    def datetime(self) -> datetime:
+        """The time and date of the inverter."""
+        value = self._text(_DATE_AND_TIME)
+        if len(value) == 16 and value[2] == ":" and value[8] == "/":
+            # 'HH:MM dd/mm/YYYY' - slicing is much faster than strptime
+            return datetime(
+                int(value[12:16]),
+                int(value[9:11]),
+                int(value[6:8]),
+                int(value[0:2]),
+                int(value[3:5]),
+            )
+        return datetime.strptime(value, "%H:%M %d/%m/%Y")
+
+
+def parse_home_cgi(content: bytes) -> ZeverSolarData:
+    """Parses and validates the newline separated home.cgi payload."""
+    fields = content.split(b"\n")
+    field_count = len(fields)
+    if field_count != _FIELD_COUNT and (
+        field_count != _FIELD_COUNT + 1 or fields[_FIELD_COUNT]
+    ):
+        raise ZeversolarError(
+            f"Expected {_FIELD_COUNT} fields in the inverter data, got {field_count}."
+        )
+
+    energy = fields[_ENERGY_TODAY_KWH]
+    if energy[-2:-1] == b".":
+        # The inverter drops the leading zero of the decimals: '8.9' is 8.09 kWh.
+        energy = energy[:-1] + b"0" + energy[-1:]
+
+    try:
+        return ZeverSolarData(fields, int(fields[_PAC_WATT]), float(energy))
+    except ValueError as ex:
+        raise ZeversolarError(f"Invalid number in the inverter data: {ex}") from ex
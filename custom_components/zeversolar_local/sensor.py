@@ -1,24 +1,50 @@
 """Sensor platform for Zeversolar inverter."""
-import async_timeout
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
 from homeassistant.components.sensor import (  # STATE_CLASS_TOTAL_INCREASING,
     STATE_CLASS_MEASUREMENT,
+    RestoreSensor,
     SensorDeviceClass,
     SensorEntity,
     SensorEntityDescription,
     SensorStateClass,
 )
-from homeassistant.const import ENERGY_KILO_WATT_HOUR, POWER_WATT
-from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.const import (
+    ENERGY_KILO_WATT_HOUR,
+    PERCENTAGE,
+    POWER_WATT,
+    UnitOfInformation,
+    UnitOfTime,
+)
+from homeassistant.core import callback
 from homeassistant.helpers.entity import DeviceInfo, EntityCategory
+from homeassistant.helpers.event import async_track_time_change
+from homeassistant.helpers.typing import StateType
 from homeassistant.helpers.update_coordinator import (
     CoordinatorEntity,
     DataUpdateCoordinator,
-    UpdateFailed,
 )
-from zever_local.inverter import ArrayPosition, ZeversolarError, ZeversolarTimeout
-
-from .const import CONF_SERIAL_NO, DOMAIN, ENTRY_COORDINATOR, ENTRY_DEVICE_INFO
+from homeassistant.util import dt as dt_util
+from zever_local.inverter import ArrayPosition
+
+from .circuit_breaker import STATE_CLOSED, STATE_HALF_OPEN, STATE_OPEN
+from .const import (
+    ATTR_READING_TIME,
+    ATTR_STALE,
+    CONF_SERIAL_NO,
+    DOMAIN,
+    ENTRY_COORDINATOR,
+    ENTRY_DAILY_SUMMARIES,
+    ENTRY_DEVICE_INFO,
+    STATISTICS_WINDOWS,
+)
 from .coordinator import ZeversolarApiCoordinator
+from .summary import ZeverSolarDailySummaries, ZeverSolarDaySummary
+from .windows import ZeverSolarRollingWindow
+from .zever_local import ZeverSolarApiClient
 
 # not needed
 # SCAN_INTERVAL = timedelta(seconds=30)
@@ -69,6 +95,228 @@ _DEFAULT_SENSOR = SensorEntityDescription(
 )
 
 
+@dataclass
+class ZeversolarMetricSensorEntityDescriptionMixin:
+    """Mixin to describe a Zeversolar poll statistics sensor entity."""
+
+    value_fn: Callable[[ZeverSolarApiClient], StateType]
+
+
+@dataclass
+class ZeversolarMetricSensorEntityDescription(
+    SensorEntityDescription, ZeversolarMetricSensorEntityDescriptionMixin
+):
+    """Class to describe a Zeversolar poll statistics sensor entity."""
+
+
+_METRIC_SENSOR_DESCRIPTIONS = (
+    ZeversolarMetricSensorEntityDescription(
+        key="poll_latency",
+        name="Poll latency",
+        icon="mdi:timer-outline",
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        has_entity_name=True,
+        value_fn=lambda client: client.metrics.latency_ms,
+    ),
+    ZeversolarMetricSensorEntityDescription(
+        key="request_wait_time",
+        name="Request wait time",
+        icon="mdi:timer-sand",
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        has_entity_name=True,
+        value_fn=lambda client: client.metrics.wait_ms,
+    ),
+    ZeversolarMetricSensorEntityDescription(
+        key="request_queue_depth",
+        name="Request queue depth",
+        icon="mdi:tray-full",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        has_entity_name=True,
+        value_fn=lambda client: client.arbiter.queue_depth,
+    ),
+    ZeversolarMetricSensorEntityDescription(
+        key="parse_time",
+        name="Parse time",
+        icon="mdi:timer-outline",
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MICROSECONDS,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        has_entity_name=True,
+        value_fn=lambda client: client.metrics.parse_time_us,
+    ),
+    ZeversolarMetricSensorEntityDescription(
+        key="poll_failure_rate",
+        name="Poll failure rate",
+        icon="mdi:lan-disconnect",
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=PERCENTAGE,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        has_entity_name=True,
+        value_fn=lambda client: client.metrics.failure_rate,
+    ),
+    ZeversolarMetricSensorEntityDescription(
+        key="poll_timeouts",
+        name="Poll timeouts",
+        icon="mdi:timer-alert-outline",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        has_entity_name=True,
+        value_fn=lambda client: client.metrics.timeouts,
+    ),
+    ZeversolarMetricSensorEntityDescription(
+        key="poll_errors",
+        name="Poll errors",
+        icon="mdi:alert-circle-outline",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        has_entity_name=True,
+        value_fn=lambda client: client.metrics.errors,
+    ),
+    ZeversolarMetricSensorEntityDescription(
+        key="payload_size",
+        name="Payload size",
+        icon="mdi:file-outline",
+        device_class=SensorDeviceClass.DATA_SIZE,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        has_entity_name=True,
+        value_fn=lambda client: client.metrics.payload_size,
+    ),
+    ZeversolarMetricSensorEntityDescription(
+        key="circuit_breaker",
+        name="Circuit breaker",
+        icon="mdi:electric-switch",
+        device_class=SensorDeviceClass.ENUM,
+        options=[STATE_CLOSED, STATE_HALF_OPEN, STATE_OPEN],
+        entity_category=EntityCategory.DIAGNOSTIC,
+        has_entity_name=True,
+        value_fn=lambda client: client.circuit_breaker.state,
+    ),
+    ZeversolarMetricSensorEntityDescription(
+        key="unchanged_polls",
+        name="Unchanged polls",
+        icon="mdi:content-duplicate",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        has_entity_name=True,
+        value_fn=lambda client: client.unchanged_polls,
+    ),
+)
+
+
+@dataclass
+class ZeversolarStatisticsSensorEntityDescriptionMixin:
+    """Mixin to describe a Zeversolar rolling AC power statistics sensor entity."""
+
+    window: str
+    value_fn: Callable[[ZeverSolarRollingWindow], StateType]
+
+
+@dataclass
+class ZeversolarStatisticsSensorEntityDescription(
+    SensorEntityDescription, ZeversolarStatisticsSensorEntityDescriptionMixin
+):
+    """Class to describe a Zeversolar rolling AC power statistics sensor entity."""
+
+
+_STATISTICS = (
+    ("mean", "Mean power", lambda window: window.mean),
+    ("min", "Minimum power", lambda window: window.minimum),
+    ("max", "Maximum power", lambda window: window.maximum),
+    ("stdev", "Power standard deviation", lambda window: window.stdev),
+)
+
+_STATISTICS_SENSOR_DESCRIPTIONS = tuple(
+    ZeversolarStatisticsSensorEntityDescription(
+        key=f"pac_{statistic}_{window}",
+        name=f"{name} {window}",
+        icon="mdi:chart-bell-curve",
+        device_class=None if statistic == "stdev" else SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=POWER_WATT,
+        suggested_display_precision=0,
+        has_entity_name=True,
+        window=window,
+        value_fn=value_fn,
+    )
+    for window in STATISTICS_WINDOWS
+    for statistic, name, value_fn in _STATISTICS
+)
+
+
+@dataclass
+class ZeversolarSummarySensorEntityDescriptionMixin:
+    """Mixin to describe a Zeversolar daily summary sensor entity."""
+
+    value_fn: Callable[[ZeverSolarDaySummary], StateType | datetime]
+
+
+@dataclass
+class ZeversolarSummarySensorEntityDescription(
+    SensorEntityDescription, ZeversolarSummarySensorEntityDescriptionMixin
+):
+    """Class to describe a Zeversolar daily summary sensor entity."""
+
+
+_SUMMARY_SENSOR_DESCRIPTIONS = (
+    ZeversolarSummarySensorEntityDescription(
+        key="daily_peak_power",
+        name="Daily peak power",
+        icon="mdi:solar-power",
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=POWER_WATT,
+        has_entity_name=True,
+        value_fn=lambda summary: summary["peak_power"],
+    ),
+    ZeversolarSummarySensorEntityDescription(
+        key="daily_peak_time",
+        name="Daily peak time",
+        icon="mdi:clock-outline",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        has_entity_name=True,
+        value_fn=lambda summary: dt_util.utc_from_timestamp(summary["peak_time"]),
+    ),
+    ZeversolarSummarySensorEntityDescription(
+        key="daily_production_hours",
+        name="Daily production hours",
+        icon="mdi:timer-sun",
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.HOURS,
+        has_entity_name=True,
+        value_fn=lambda summary: summary["hours_above_threshold"],
+    ),
+    ZeversolarSummarySensorEntityDescription(
+        key="daily_energy_yield",
+        name="Daily energy yield",
+        icon="mdi:solar-power",
+        device_class=SensorDeviceClass.ENERGY,
+        native_unit_of_measurement=ENERGY_KILO_WATT_HOUR,
+        has_entity_name=True,
+        value_fn=lambda summary: summary["energy"],
+    ),
+    ZeversolarSummarySensorEntityDescription(
+        key="daily_specific_yield",
+        name="Daily specific yield",
+        icon="mdi:solar-panel",
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement="kWh/kWp",
+        has_entity_name=True,
+        value_fn=lambda summary: summary["specific_yield"],
+    ),
+)
+
+
 # see: https://developers.home-assistant.io/docs/integration_fetching_data/
 async def async_setup_entry(hass, entry, async_add_entities):
     """Setup sensor platform."""
@@ -76,26 +324,6 @@ async def async_setup_entry(hass, entry, async_add_entities):
         ENTRY_COORDINATOR
     ]
 
-    async def async_update_data():
-        """Fetch data from API endpoint.
-
-        This is the place to pre-process the data to lookup tables
-        so entities can quickly look up their data.
-        """
-        try:
-            # Note: asyncio.TimeoutError and aiohttp.ClientError are already
-            # handled by the data update coordinator.
-            async with async_timeout.timeout(10):
-                return await zever_coordinator.client.async_get_data()
-        except ZeversolarTimeout as err:
-            raise UpdateFailed(f"Timeout communicating with API: {err}") from err
-        except ZeversolarError as err:
-            raise UpdateFailed(f"Error communicating with API: {err}") from err
-
-    zever_coordinator.update_method = async_update_data
-
-    await zever_coordinator.async_config_entry_first_refresh()
-
     serial_number = entry.data[CONF_SERIAL_NO]
 
     daily_energy_sensor = Sensor(ArrayPosition.energy_today_KWh.name)
@@ -120,6 +348,33 @@ async def async_setup_entry(hass, entry, async_add_entities):
         for sensor in all_sensors
     )
 
+    # Poll statistics of the inverter
+    entities.extend(
+        ZeverSolarMetricSensor(
+            zever_coordinator, device_info, serial_number, description
+        )
+        for description in _METRIC_SENSOR_DESCRIPTIONS
+    )
+
+    # Rolling statistics of the AC power
+    entities.extend(
+        ZeverSolarStatisticsSensor(
+            zever_coordinator, device_info, serial_number, description
+        )
+        for description in _STATISTICS_SENSOR_DESCRIPTIONS
+    )
+
+    # Production of the last day
+    daily_summaries: ZeverSolarDailySummaries = hass.data[DOMAIN][entry.entry_id][
+        ENTRY_DAILY_SUMMARIES
+    ]
+    entities.extend(
+        ZeverSolarSummarySensor(
+            zever_coordinator, daily_summaries, device_info, serial_number, description
+        )
+        for description in _SUMMARY_SENSOR_DESCRIPTIONS
+    )
+
     async_add_entities(entities)
 
 
@@ -171,8 +426,13 @@ class Inverter:
         return self._software_version
 
 
-class ZeverSolarSensor(CoordinatorEntity, SensorEntity):
-    """Entity representing individual inverter sensor."""
+class ZeverSolarSensor(CoordinatorEntity, RestoreSensor):
+    """Entity representing individual inverter sensor.
+
+    Until the inverter answers after a restart, the value of the last run is
+    shown and marked as stale. A restored energy of an earlier day is dropped,
+    the inverter starts counting at zero every day.
+    """
 
     def __init__(
         self,
@@ -190,20 +450,236 @@ class ZeverSolarSensor(CoordinatorEntity, SensorEntity):
             sensor.sensor_id, _DEFAULT_SENSOR
         )
         self._sensor = sensor
-        self._previous_value = None
+        self._written_available: bool | None = None
+        self._written_hour: datetime | None = None
+        self._energy_pending = False
+        self._restored_value: StateType = None
+        self._reading_time: datetime | None = None
+
+    async def async_added_to_hass(self) -> None:
+        """Restore the value of the last run if the inverter did not answer yet."""
+        await super().async_added_to_hass()
+
+        if self._is_daily_energy:
+            self.async_on_remove(
+                async_track_time_change(
+                    self.hass, self._async_midnight, hour=0, minute=0, second=0
+                )
+            )
+            self.async_on_remove(
+                async_track_time_change(
+                    self.hass, self._async_hour_started, minute=0, second=0
+                )
+            )
+
+        if self.coordinator.data is not None:
+            return
+
+        last_state = await self.async_get_last_state()
+        last_sensor_data = await self.async_get_last_sensor_data()
+        if last_state is None or last_sensor_data is None:
+            return
+
+        reading_time = last_state.last_updated
+        if (restored_time := last_state.attributes.get(ATTR_READING_TIME)) is not None:
+            reading_time = dt_util.parse_datetime(restored_time) or reading_time
+
+        reading_date = dt_util.as_local(reading_time).date()
+        if self._is_daily_energy and reading_date != dt_util.now().date():
+            return
+
+        self._restored_value = last_sensor_data.native_value
+        self._reading_time = reading_time
+
+    @property
+    def _is_daily_energy(self) -> bool:
+        """Return True for the energy of the day."""
+        return self._sensor.sensor_id == ArrayPosition.energy_today_KWh.name
+
+    @callback
+    def _async_midnight(self, _: datetime) -> None:
+        """Drop a restored energy of the day before."""
+        if self._restored_value is None or self.coordinator.data is not None:
+            return
+
+        self._restored_value = None
+        self.async_write_ha_state()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only if the value or the availability changed.
+
+        The energy of the day is written once an hour only if configured.
+        """
+        available = self.available
+        if (
+            available == self._written_available
+            and self._sensor.sensor_id not in self.coordinator.changed_fields
+        ):
+            return
+
+        now = dt_util.utcnow()
+        if self.coordinator.data is not None and self.coordinator.last_update_success:
+            self._reading_time = now
+
+        hour = now.replace(minute=0, second=0, microsecond=0)
+        if (
+            self._is_daily_energy
+            and self.coordinator.hourly_energy_state
+            and available == self._written_available
+            and hour == self._written_hour
+        ):
+            # the energy is in the long-term statistics, its state once an hour
+            self._energy_pending = True
+            return
+
+        self._async_write_state(hour)
+
+    @callback
+    def _async_hour_started(self, now: datetime) -> None:
+        """Write the energy held back in the hour that ended."""
+        if not self._energy_pending:
+            return
+
+        self._async_write_state(
+            dt_util.as_utc(now).replace(minute=0, second=0, microsecond=0)
+        )
+
+    @callback
+    def _async_write_state(self, hour: datetime) -> None:
+        """Write the state, remember the hour of the write."""
+        self._written_hour = hour
+        self._written_available = self.available
+        self._energy_pending = False
+        self.async_write_ha_state()
+
+    @property
+    def available(self) -> bool:
+        """Return True also while a restored value is shown."""
+        if self.coordinator.data is None:
+            return self._restored_value is not None or super().available
+        return super().available
 
     @property
     def native_value(self):
         """Return the value reported by the sensor."""
         my_data = self.coordinator.data
         if my_data is None:
-            raise ConfigEntryNotReady
+            # the value of the last run, the inverter did not answer yet
+            return self._restored_value
 
-        value = getattr(my_data, self._sensor.sensor_id)
-        self._previous_value = value
-        return value
+        return getattr(my_data, self._sensor.sensor_id)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the time of the reading and if it is from the last run."""
+        return {
+            ATTR_READING_TIME: self._reading_time.isoformat()
+            if self._reading_time
+            else None,
+            ATTR_STALE: self.coordinator.data is None,
+        }
 
     @property
     def entity_registry_enabled_default(self) -> bool:
         """Return if the entity should be enabled when first added to the entity registry."""
         return self.entity_description.entity_category != EntityCategory.DIAGNOSTIC
+
+
+class ZeverSolarMetricSensor(CoordinatorEntity, SensorEntity):
+    """Entity representing a poll statistic of the inverter."""
+
+    entity_description: ZeversolarMetricSensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: ZeversolarApiCoordinator,
+        device_info: DeviceInfo,
+        serial_number: str,
+        entity_description: ZeversolarMetricSensorEntityDescription,
+    ) -> None:
+        """Initialize a poll statistics sensor."""
+        super().__init__(coordinator)
+
+        self._attr_unique_id = f"{DOMAIN}_{serial_number}_{entity_description.key}"
+        self._attr_device_info = device_info
+        self._attr_entity_registry_enabled_default = False
+        self.entity_description = entity_description
+
+    @property
+    def available(self) -> bool:
+        """The statistics are available while the inverter is not."""
+        return True
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the poll statistic."""
+        return self.entity_description.value_fn(self.coordinator.client)
+
+
+class ZeverSolarStatisticsSensor(CoordinatorEntity, SensorEntity):
+    """Entity representing a rolling statistic of the AC power."""
+
+    entity_description: ZeversolarStatisticsSensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: ZeversolarApiCoordinator,
+        device_info: DeviceInfo,
+        serial_number: str,
+        entity_description: ZeversolarStatisticsSensorEntityDescription,
+    ) -> None:
+        """Initialize a rolling statistics sensor."""
+        super().__init__(coordinator)
+
+        self._attr_unique_id = f"{DOMAIN}_{serial_number}_{entity_description.key}"
+        self._attr_device_info = device_info
+        self._attr_entity_registry_enabled_default = False
+        self.entity_description = entity_description
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the statistic of the readings within the window."""
+        window = self.coordinator.pac_windows[self.entity_description.window]
+        return self.entity_description.value_fn(window)
+
+
+class ZeverSolarSummarySensor(CoordinatorEntity, SensorEntity):
+    """Entity representing the production of the last summarized day."""
+
+    entity_description: ZeversolarSummarySensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: ZeversolarApiCoordinator,
+        daily_summaries: ZeverSolarDailySummaries,
+        device_info: DeviceInfo,
+        serial_number: str,
+        entity_description: ZeversolarSummarySensorEntityDescription,
+    ) -> None:
+        """Initialize a daily summary sensor."""
+        super().__init__(coordinator)
+
+        self._daily_summaries = daily_summaries
+        self._attr_unique_id = f"{DOMAIN}_{serial_number}_{entity_description.key}"
+        self._attr_device_info = device_info
+        self.entity_description = entity_description
+
+    @property
+    def available(self) -> bool:
+        """The summary is available while the inverter is not."""
+        return True
+
+    @property
+    def native_value(self) -> StateType | datetime:
+        """Return the value of the last summarized day."""
+        summary = self._daily_summaries.latest
+        if summary is None:
+            return None
+        return self.entity_description.value_fn(summary)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the summarized day."""
+        summary = self._daily_summaries.latest
+        return {"day": None if summary is None else summary["day"]}
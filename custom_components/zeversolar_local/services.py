@@ -0,0 +1,84 @@
+"""Services of the Zeversolar inverter local integration."""
+from __future__ import annotations
+
+from datetime import timedelta
+
+from homeassistant.const import ATTR_DEVICE_ID
+from homeassistant.core import HomeAssistant, ServiceCall, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import device_registry as dr
+import homeassistant.helpers.config_validation as cv
+import voluptuous as vol
+
+from .const import (
+    ATTR_DURATION,
+    ATTR_INTERVAL,
+    BURST_DURATION_MAX,
+    BURST_DURATION_MIN,
+    BURST_DURATION_VALUE,
+    BURST_INTERVAL_MAX,
+    BURST_INTERVAL_MIN,
+    BURST_INTERVAL_VALUE,
+    DOMAIN,
+    ENTRY_COORDINATOR,
+    SERVICE_BURST_POLL,
+)
+from .coordinator import ZeversolarApiCoordinator
+
+BURST_POLL_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_INTERVAL, default=BURST_INTERVAL_VALUE): vol.All(
+            vol.Coerce(float),
+            vol.Range(min=BURST_INTERVAL_MIN, max=BURST_INTERVAL_MAX),
+        ),
+        vol.Optional(ATTR_DURATION, default=BURST_DURATION_VALUE): vol.All(
+            vol.Coerce(float),
+            vol.Range(min=BURST_DURATION_MIN, max=BURST_DURATION_MAX),
+        ),
+    }
+)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services of the integration."""
+
+    async def _async_burst_poll(call: ServiceCall) -> None:
+        """Poll the inverters at a high rate for a limited time."""
+        interval = timedelta(seconds=call.data[ATTR_INTERVAL])
+        duration = timedelta(seconds=call.data[ATTR_DURATION])
+        device_ids = call.data.get(ATTR_DEVICE_ID)
+        for coordinator in _async_get_coordinators(hass, device_ids):
+            coordinator.async_start_burst(interval, duration)
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_BURST_POLL, _async_burst_poll, schema=BURST_POLL_SCHEMA
+    )
+
+
+@callback
+def _async_get_coordinators(
+    hass: HomeAssistant, device_ids: list[str] | None
+) -> list[ZeversolarApiCoordinator]:
+    """Return the coordinators of the devices, all loaded ones if None."""
+    coordinators = {
+        entry_id: entry_data[ENTRY_COORDINATOR]
+        for entry_id, entry_data in hass.data.get(DOMAIN, {}).items()
+        if isinstance(entry_data, dict) and ENTRY_COORDINATOR in entry_data
+    }
+    if device_ids is None:
+        return list(coordinators.values())
+
+    device_registry = dr.async_get(hass)
+    result = []
+    for device_id in device_ids:
+        device = device_registry.async_get(device_id)
+        entry_ids = set() if device is None else device.config_entries
+        entry_ids = entry_ids & coordinators.keys()
+        if not entry_ids:
+            raise HomeAssistantError(
+                f"Device '{device_id}' is no loaded Zeversolar inverter"
+            )
+        result.extend(coordinators[entry_id] for entry_id in entry_ids)
+    return result
@@ -0,0 +1,161 @@
+"""Daily production summaries of a Zeversolar inverter."""
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+from collections import deque
+from datetime import date, datetime, timedelta
+from functools import partial
+from itertools import compress, repeat
+from operator import le, sub
+from typing import TypedDict
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_change
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DAILY_SUMMARY_DAYS,
+    DAILY_SUMMARY_POWER_THRESHOLD,
+    DAILY_SUMMARY_STORAGE_VERSION,
+    DOMAIN,
+)
+from .coordinator import ZeversolarApiCoordinator
+from .history import ZeverSolarHistory
+
+
+class ZeverSolarDaySummary(TypedDict):
+    """The production of an inverter on one day."""
+
+    day: str
+    peak_power: float
+    peak_time: int
+    hours_above_threshold: float
+    energy: float
+    specific_yield: float | None
+
+
+def summarize_day(
+    day: date,
+    timestamps: array,
+    pac_watt: array,
+    energy_today: array,
+    peak_power_kwp: float | None,
+    max_interval: float,
+) -> ZeverSolarDaySummary | None:
+    """Summarize the readings of a day, None without readings.
+
+    Each step is a single pass of a builtin over the arrays, so a day of
+    readings is summarized without a loop in Python. A reading lasts at most
+    'max_interval' seconds, the longest interval between two polls.
+    """
+    if not timestamps:
+        return None
+
+    peak_power = max(pac_watt)
+    peak_time = timestamps[pac_watt.index(peak_power)]
+    # every reading above the threshold lasts until the next reading, a gap
+    # without readings is no production time
+    seconds_above_threshold = sum(
+        compress(
+            map(min, map(sub, timestamps[1:], timestamps), repeat(max_interval)),
+            map(partial(le, DAILY_SUMMARY_POWER_THRESHOLD), pac_watt),
+        )
+    )
+    # the energy counter of the inverter for the day
+    energy = max(energy_today)
+
+    return ZeverSolarDaySummary(
+        day=day.isoformat(),
+        peak_power=peak_power,
+        peak_time=peak_time,
+        hours_above_threshold=round(seconds_above_threshold / 3600, 2),
+        energy=round(energy, 2),
+        specific_yield=round(energy / peak_power_kwp, 2) if peak_power_kwp else None,
+    )
+
+
+class ZeverSolarDailySummaries:
+    """The daily summaries of an inverter of the last year.
+
+    A day is summarized after midnight from the readings kept in the history
+    of the coordinator. The summaries are stored across restarts.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        self._hass = hass
+        self.peak_power_kwp: float | None = None
+        self._unsub_midnight: CALLBACK_TYPE | None = None
+        self.days: deque[ZeverSolarDaySummary] = deque(maxlen=DAILY_SUMMARY_DAYS)
+        self._store: Store[list[ZeverSolarDaySummary]] = Store(
+            hass,
+            DAILY_SUMMARY_STORAGE_VERSION,
+            f"{DOMAIN}.{entry_id}.daily_summary",
+        )
+
+    @property
+    def latest(self) -> ZeverSolarDaySummary | None:
+        """The summary of the last day with readings."""
+        return self.days[-1] if self.days else None
+
+    async def async_load(self) -> None:
+        """Load the stored summaries."""
+        self.days.extend(await self._store.async_load() or ())
+
+    async def async_summarize(
+        self, day: date, history: ZeverSolarHistory, max_interval: timedelta
+    ) -> ZeverSolarDaySummary | None:
+        """Summarize and store the day, None if there are no readings of it.
+
+        'max_interval' is the longest interval between two polls.
+        """
+        if self.days and self.days[-1]["day"] >= day.isoformat():
+            return None
+
+        start = dt_util.start_of_local_day(day)
+        end = dt_util.start_of_local_day(day + timedelta(days=1))
+        timestamps, pac_watt, energy_today = history.arrays(start.timestamp())
+        stop = bisect_left(timestamps, int(end.timestamp()))
+
+        summary = summarize_day(
+            day,
+            timestamps[:stop],
+            pac_watt[:stop],
+            energy_today[:stop],
+            self.peak_power_kwp,
+            max_interval.total_seconds(),
+        )
+        if summary is None:
+            return None
+
+        self.days.append(summary)
+        await self._store.async_save(list(self.days))
+        return summary
+
+    @callback
+    def async_track_midnight(self, coordinator: ZeversolarApiCoordinator) -> None:
+        """Summarize the day that ended after every midnight."""
+
+        async def _async_midnight(now: datetime) -> None:
+            day = dt_util.as_local(now).date() - timedelta(days=1)
+            summary = await self.async_summarize(
+                day, coordinator.history, coordinator.max_update_interval
+            )
+            if summary is not None:
+                coordinator.async_update_listeners()
+
+        self._unsub_midnight = async_track_time_change(
+            self._hass, _async_midnight, hour=0, minute=0, second=30
+        )
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Stop summarizing after midnight."""
+        if self._unsub_midnight is not None:
+            self._unsub_midnight()
+            self._unsub_midnight = None
+
+    async def async_remove(self) -> None:
+        """Remove the stored summaries."""
+        await self._store.async_remove()
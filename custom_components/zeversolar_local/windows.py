@@ -0,0 +1,88 @@
+"""Rolling statistics of the readings of a Zeversolar inverter."""
+from __future__ import annotations
+
+from collections import deque
+import math
+
+
+class ZeverSolarRollingWindow:
+    """Mean, minimum, maximum and standard deviation of the last 'span' seconds.
+
+    Updated in constant amortized time per reading: the sum and the sum of
+    squares are kept while readings enter and leave the window. The minimum
+    and the maximum are the heads of two monotonic queues, which only keep
+    the readings that can still become the extreme of the window.
+    """
+
+    def __init__(self, span: float) -> None:
+        self.span = span
+        self._readings: deque[tuple[float, float]] = deque()
+        self._minima: deque[tuple[float, float]] = deque()
+        self._maxima: deque[tuple[float, float]] = deque()
+        self._sum = 0.0
+        self._sum_of_squares = 0.0
+
+    def __len__(self) -> int:
+        """The number of readings in the window."""
+        return len(self._readings)
+
+    def add(self, timestamp: float, value: float) -> None:
+        """Add a reading and drop the readings older than the span."""
+        self._readings.append((timestamp, value))
+        self._sum += value
+        self._sum_of_squares += value * value
+
+        while self._minima and self._minima[-1][1] >= value:
+            self._minima.pop()
+        self._minima.append((timestamp, value))
+
+        while self._maxima and self._maxima[-1][1] <= value:
+            self._maxima.pop()
+        self._maxima.append((timestamp, value))
+
+        self.expire(timestamp)
+
+    def expire(self, now: float) -> None:
+        """Drop the readings older than the span."""
+        oldest = now - self.span
+        readings = self._readings
+        while readings and readings[0][0] < oldest:
+            _, value = readings.popleft()
+            self._sum -= value
+            self._sum_of_squares -= value * value
+
+        if not readings:
+            # no rounding errors are carried to the next readings
+            self._sum = 0.0
+            self._sum_of_squares = 0.0
+
+        while self._minima and self._minima[0][0] < oldest:
+            self._minima.popleft()
+        while self._maxima and self._maxima[0][0] < oldest:
+            self._maxima.popleft()
+
+    @property
+    def mean(self) -> float | None:
+        """The mean of the readings, None without readings."""
+        if not self._readings:
+            return None
+        return self._sum / len(self._readings)
+
+    @property
+    def minimum(self) -> float | None:
+        """The smallest reading, None without readings."""
+        return self._minima[0][1] if self._minima else None
+
+    @property
+    def maximum(self) -> float | None:
+        """The largest reading, None without readings."""
+        return self._maxima[0][1] if self._maxima else None
+
+    @property
+    def stdev(self) -> float | None:
+        """The population standard deviation, None without readings."""
+        if not self._readings:
+            return None
+        count = len(self._readings)
+        mean = self._sum / count
+        return math.sqrt(max(self._sum_of_squares / count - mean * mean, 0))
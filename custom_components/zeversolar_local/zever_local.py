@@ -1,32 +1,275 @@
 """Wraps the API to connect to a Zeversolar inverter locally."""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Awaitable, Callable
 import logging
+import ssl
+import time
+
+import httpx
+from zever_local.inverter import ZeversolarError, ZeversolarTimeout
 
-from zever_local.inverter import Inverter, InverterData
+from .arbiter import PRIORITY_COMMAND, PRIORITY_POLL, ZeverSolarRequestArbiter
+from .circuit_breaker import ZeverSolarCircuitBreaker
+from .const import (
+    CIRCUIT_BREAKER_BASE_DELAY,
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+    CIRCUIT_BREAKER_MAX_DELAY,
+    METRICS_WINDOW,
+    PAYLOAD_HISTORY,
+    REQUEST_MIN_GAP,
+    REQUEST_TIMEOUT_CEILING,
+    REQUEST_TIMEOUT_FLOOR,
+    REQUEST_TIMEOUT_INITIAL,
+)
+from .metrics import ZeverSolarMetrics, ZeverSolarRttEstimator
+from .parser import ZeverSolarData, parse_home_cgi
 
 _LOGGER: logging.Logger = logging.getLogger(__package__)
 
 
+class ZeversolarCircuitOpen(ZeversolarError):
+    """No request was sent, the inverter did not answer the last requests."""
+
+
+class ZeverSolarConnectionPool:
+    """Keep-alive HTTP connections shared by all inverter clients."""
+
+    def __init__(
+        self,
+        verify: ssl.SSLContext | bool = True,
+        max_connections: int = 100,
+        keepalive_expiry: float = 60,
+    ) -> None:
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._http_client = httpx.AsyncClient(verify=verify, limits=self._limits)
+        self._users: set[str] = set()
+        # removes the listener closing the pool when Home Assistant stops
+        self.unsub_close: Callable[[], None] | None = None
+
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        """The shared httpx client."""
+        return self._http_client
+
+    @property
+    def limits(self) -> httpx.Limits:
+        """The connection limits of the pool."""
+        return self._limits
+
+    @property
+    def users(self) -> int:
+        """The number of users attached to the pool."""
+        return len(self._users)
+
+    def attach(self, user_id: str) -> None:
+        """Registers a user of the pool."""
+        self._users.add(user_id)
+
+    async def async_release(self, user_id: str) -> bool:
+        """Unregisters a user and closes the pool after the last one left."""
+        self._users.discard(user_id)
+        if self._users:
+            return False
+
+        await self.async_close()
+        return True
+
+    async def async_close(self) -> None:
+        """Closes all connections of the pool."""
+        if not self._http_client.is_closed:
+            await self._http_client.aclose()
+
+
 # Zeversolar local API Client."""
 class ZeverSolarApiClient:
     """Wraps the Zeversolar local API"""
 
-    _inverter: Inverter = None
-
     # Initialize the class
-    def __init__(self, host: str, timeout: int = 5) -> None:
-        self._inverter = Inverter(host, timeout=timeout)
+    def __init__(
+        self,
+        host: str,
+        timeout: float = REQUEST_TIMEOUT_INITIAL,
+        http_client: httpx.AsyncClient | None = None,
+        min_gap: float = REQUEST_MIN_GAP,
+    ) -> None:
+        self._host = host
+        self._http_client = http_client
+        self._serial_number: str = None
+        self._mac_address: str = None
+        self._pending_data: asyncio.Task[ZeverSolarData] | None = None
+        self._last_content: bytes | None = None
+        self._last_data: ZeverSolarData | None = None
+        self.unchanged_polls = 0
+        self.metrics = ZeverSolarMetrics(METRICS_WINDOW)
+        # 'timeout' is used until the first answer, then the learned timeout
+        self.rtt_estimator = ZeverSolarRttEstimator(
+            timeout, REQUEST_TIMEOUT_FLOOR, REQUEST_TIMEOUT_CEILING
+        )
+        self.arbiter = ZeverSolarRequestArbiter(min_gap)
+        self.circuit_breaker = ZeverSolarCircuitBreaker(
+            CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+            CIRCUIT_BREAKER_BASE_DELAY,
+            CIRCUIT_BREAKER_MAX_DELAY,
+        )
+        # (unix timestamp, payload) of the last responses, for the diagnostics
+        self.payloads: deque[tuple[float, bytes]] = deque(maxlen=PAYLOAD_HISTORY)
+
+        self._data_url = f"http://{host}/home.cgi"
+        self._power_url = f"http://{host}/inv_ctrl.cgi"
+
+    @property
+    def host(self) -> str:
+        """The address of the inverter."""
+        return self._host
+
+    @property
+    def serial_number(self) -> str:
+        """The serial number of the inverter, known after the first data fetch."""
+        return self._serial_number
+
+    @property
+    def mac_address(self) -> str:
+        """The MAC address of the inverter, known after the first data fetch."""
+        return self._mac_address
+
+    def restore_identity(self, serial_number: str, mac_address: str) -> None:
+        """Sets the identity known from an earlier run, until the data is fetched."""
+        self._serial_number = serial_number
+        self._mac_address = mac_address
 
     async def async_get_id(self):
         """Gets the inverter id"""
-        await self._inverter.async_connect()
-        return self._inverter.mac_address
+        await self.async_get_data()
+        return self._mac_address
+
+    async def async_get_data(self) -> ZeverSolarData:
+        """Gets the data.
+
+        Concurrent callers share the request in flight and its result.
+        """
+        if self._pending_data is None:
+            self._pending_data = asyncio.ensure_future(self._async_fetch_data())
+            self._pending_data.add_done_callback(self._clear_pending_data)
+
+        # A cancelled caller must not cancel the request of the other callers.
+        return await asyncio.shield(self._pending_data)
+
+    def _clear_pending_data(self, task: asyncio.Task[ZeverSolarData]) -> None:
+        """Lets the next caller send a new request."""
+        self._pending_data = None
+        if not task.cancelled():
+            # Mark the error as retrieved in case all callers were cancelled.
+            task.exception()
+
+    async def _async_fetch_data(self) -> ZeverSolarData:
+        """Fetches and parses the data."""
+        if not self.circuit_breaker.allow_request():
+            raise ZeversolarCircuitOpen(
+                f"Zeversolar inverter '{self._host}' does not answer, next attempt "
+                f"in {self.circuit_breaker.retry_in:.0f} s."
+            )
+
+        try:
+            response, latency = await self._async_request(
+                lambda http_client: http_client.get(
+                    self._data_url, timeout=self.rtt_estimator.timeout
+                ),
+                PRIORITY_POLL,
+            )
+        except ZeversolarTimeout:
+            self.metrics.record_timeout()
+            self.rtt_estimator.record_timeout()
+            self.circuit_breaker.record_failure()
+            raise
+        except ZeversolarError:
+            self.metrics.record_error()
+            self.circuit_breaker.record_failure()
+            raise
 
-    async def async_get_data(self) -> InverterData:
-        """Gets the data"""
-        inverter_data = await self._inverter.async_get_data()
+        # The inverter answered, even an invalid payload proves it is reachable.
+        self.circuit_breaker.record_success()
+        self.rtt_estimator.record_rtt(latency)
+        content = response.content
+        self.payloads.append((time.time(), content))
+        if content == self._last_content:
+            # The inverter refreshes its values every few tens of seconds only.
+            # A byte for byte equal payload needs neither parsing nor a new object.
+            self.unchanged_polls += 1
+            self.metrics.record_success(latency, len(content))
+            return self._last_data
+
+        start = time.perf_counter()
+        try:
+            inverter_data = parse_home_cgi(content)
+        except ZeversolarError:
+            self.metrics.record_error()
+            raise
+
+        self.metrics.record_parse(time.perf_counter() - start)
+        self.metrics.record_success(latency, len(content))
+        self._last_content = content
+        self._last_data = inverter_data
+
+        # The data carries the identity needed for the power commands, so no
+        # separate connect round-trip is required.
+        self._serial_number = inverter_data.serial_number
+        self._mac_address = inverter_data.mac_address
         return inverter_data
 
-    @property
-    def inverter(self) -> Inverter:
-        """The Zeversolar inverter."""
-        return self._inverter
+    async def async_power_on(self) -> bool:
+        """Powers the inverter on."""
+        return await self._async_change_power_state(0)
+
+    async def async_power_off(self) -> bool:
+        """Powers the inverter off."""
+        return await self._async_change_power_state(1)
+
+    async def _async_change_power_state(self, mode: int) -> bool:
+        """Powers the inverter on or off."""
+        response, _ = await self._async_request(
+            lambda http_client: http_client.post(
+                self._power_url,
+                data={"sn": self._serial_number, "mode": mode},
+                timeout=self.rtt_estimator.timeout,
+            ),
+            PRIORITY_COMMAND,
+        )
+        return response.status_code == 200
+
+    async def _async_request(
+        self,
+        send: Callable[[httpx.AsyncClient], Awaitable[httpx.Response]],
+        priority: int,
+    ) -> tuple[httpx.Response, float]:
+        """Sends a request in its turn, returns the response and its latency.
+
+        Uses the shared connection pool if one is given.
+        """
+        async with self.arbiter.async_slot(priority) as wait:
+            self.metrics.record_wait(wait)
+            start = time.perf_counter()
+            try:
+                if self._http_client is not None:
+                    response = await send(self._http_client)
+                else:
+                    async with httpx.AsyncClient() as http_client:
+                        response = await send(http_client)
+
+            except httpx.TimeoutException as ex:
+                raise ZeversolarTimeout(
+                    f"Connection to Zeversolar inverter '{self._host}' timed out."
+                ) from ex
+            except Exception as ex:
+                raise ZeversolarError(
+                    "Generic error while connecting to Zeversolar inverter "
+                    f"'{self._host}'."
+                ) from ex
+
+            return response, time.perf_counter() - start
@@ -0,0 +1,195 @@
+"""A fake Zeversolar inverter serving home.cgi and inv_ctrl.cgi over HTTP.
+
+Simulates the power of a sunny day, the energy counter of the day, slow or
+lost responses and the nights the inverter is switched off. A
+FakeInverterFleet runs many inverters on consecutive ports of 127.0.0.1, so
+the client and the coordinator can be load tested without real hardware:
+
+    fleet = FakeInverterFleet(count=100, latency=0.05, jitter=0.02)
+    await fleet.async_start()
+    ...
+    await fleet.async_stop()
+"""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from datetime import datetime, time
+import math
+import random
+
+from aiohttp import web
+
+FAKE_HOST = "127.0.0.1"
+
+
+class FakeInverter:
+    """The simulated state and HTTP endpoints of one inverter."""
+
+    def __init__(
+        self,
+        index: int = 0,
+        peak_watt: int = 5000,
+        sunrise: time = time(6),
+        sunset: time = time(20),
+        offline_from: time | None = None,
+        offline_until: time | None = None,
+        latency: float = 0,
+        jitter: float = 0,
+        drop_rate: float = 0,
+        clock: Callable[[], datetime] = datetime.now,
+        seed: int | None = None,
+    ) -> None:
+        self.registry_id = f"EAB24127{index:04X}"
+        self.registry_key = f"ZYXTBGERTX{index:06d}"
+        self.serial_number = f"ZS15004513{index:06d}"
+        self.peak_watt = peak_watt
+        self.sunrise = sunrise
+        self.sunset = sunset
+        self.offline_from = offline_from
+        self.offline_until = offline_until
+        self.latency = latency
+        self.jitter = jitter
+        self.drop_rate = drop_rate
+        self.clock = clock
+        self.powered_on = True
+        self.requests = 0
+        self._random = random.Random(seed)
+
+    @staticmethod
+    def _hours(value: time) -> float:
+        """Return the time of day in hours."""
+        return value.hour + value.minute / 60 + value.second / 3600
+
+    def is_offline(self, now: datetime) -> bool:
+        """Return True while the inverter is switched off for the night."""
+        if self.offline_from is None or self.offline_until is None:
+            return False
+        current = now.time()
+        if self.offline_from <= self.offline_until:
+            return self.offline_from <= current < self.offline_until
+        return current >= self.offline_from or current < self.offline_until
+
+    def pac_watt(self, now: datetime) -> int:
+        """Return the power, a half sine wave between sunrise and sunset."""
+        if not self.powered_on:
+            return 0
+        daylight = self._hours(self.sunset) - self._hours(self.sunrise)
+        elapsed = self._hours(now.time()) - self._hours(self.sunrise)
+        if not 0 < elapsed < daylight:
+            return 0
+        return round(self.peak_watt * math.sin(math.pi * elapsed / daylight))
+
+    def energy_today_kwh(self, now: datetime) -> float:
+        """Return the energy since midnight, the integral of the power curve."""
+        daylight = self._hours(self.sunset) - self._hours(self.sunrise)
+        elapsed = self._hours(now.time()) - self._hours(self.sunrise)
+        elapsed = min(max(elapsed, 0), daylight)
+        watt_hours = (
+            self.peak_watt
+            * daylight
+            / math.pi
+            * (1 - math.cos(math.pi * elapsed / daylight))
+        )
+        return round(watt_hours / 1000, 2)
+
+    def home_cgi(self, now: datetime) -> bytes:
+        """Return the home.cgi payload at the given time."""
+        energy = self.energy_today_kwh(now)
+        kwh = int(energy)
+        # The real inverter drops the leading zero of the decimals: 8.09 is '8.9'.
+        energy_text = f"{kwh}.{round((energy - kwh) * 100)}"
+        fields = [
+            "1",
+            "1",
+            self.registry_id,
+            self.registry_key,
+            "M11",
+            "18625-797R+17829-719R",
+            now.strftime("%H:%M %d/%m/%Y"),
+            "1",
+            "1",
+            self.serial_number,
+            str(self.pac_watt(now)),
+            energy_text,
+            "OK",
+            "Error",
+        ]
+        return "\n".join(fields).encode()
+
+    async def _async_delay(self) -> bool:
+        """Wait for the simulated latency, return False if the request is lost."""
+        delay = self.latency + self._random.uniform(-self.jitter, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return self._random.random() >= self.drop_rate
+
+    @staticmethod
+    def _drop(request: web.Request) -> web.Response:
+        """Close the connection without an answer."""
+        if request.transport is not None:
+            request.transport.close()
+        return web.Response(status=503)
+
+    async def async_handle_home(self, request: web.Request) -> web.Response:
+        """Answer the data request."""
+        self.requests += 1
+        now = self.clock()
+        if self.is_offline(now) or not await self._async_delay():
+            return self._drop(request)
+        return web.Response(body=self.home_cgi(now))
+
+    async def async_handle_power(self, request: web.Request) -> web.Response:
+        """Power the inverter on (mode 0) or off (mode 1)."""
+        self.requests += 1
+        if self.is_offline(self.clock()) or not await self._async_delay():
+            return self._drop(request)
+
+        form = await request.post()
+        if form.get("sn") != self.serial_number or form.get("mode") not in ("0", "1"):
+            return web.Response(status=400)
+        self.powered_on = form["mode"] == "0"
+        return web.Response(text="OK")
+
+    def create_app(self) -> web.Application:
+        """Return the web application of the inverter."""
+        app = web.Application()
+        app.router.add_get("/home.cgi", self.async_handle_home)
+        app.router.add_post("/inv_ctrl.cgi", self.async_handle_power)
+        return app
+
+
+class FakeInverterFleet:
+    """Runs fake inverters, one port each.
+
+    With first_port=0 every inverter gets a free port chosen by the system,
+    otherwise the ports first_port, first_port + 1, ... are used. The keyword
+    arguments are passed to every FakeInverter.
+    """
+
+    def __init__(self, count: int = 1, first_port: int = 0, **kwargs) -> None:
+        self.inverters = [
+            FakeInverter(index, **{"seed": index, **kwargs}) for index in range(count)
+        ]
+        self.first_port = first_port
+        self.hosts: list[str] = []
+        self._runners: list[web.AppRunner] = []
+
+    async def async_start(self) -> list[str]:
+        """Start serving, return the host of every inverter."""
+        for index, inverter in enumerate(self.inverters):
+            runner = web.AppRunner(inverter.create_app(), handle_signals=False)
+            await runner.setup()
+            port = self.first_port + index if self.first_port else 0
+            site = web.TCPSite(runner, FAKE_HOST, port)
+            await site.start()
+            self._runners.append(runner)
+            port = runner.addresses[0][1]
+            self.hosts.append(f"{FAKE_HOST}:{port}")
+        return self.hosts
+
+    async def async_stop(self) -> None:
+        """Stop serving."""
+        await asyncio.gather(*[runner.cleanup() for runner in self._runners])
+        self._runners.clear()
+        self.hosts.clear()
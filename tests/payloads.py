@@ -0,0 +1,20 @@
+"""Sample home.cgi payloads of a Zeversolar inverter.
+
+Shared by the tests and the benchmarks.
+"""
+
+REGISTRY_ID = "EAB241277A36"
+REGISTRY_KEY = "ZYXTBGERTXJLTSVS"
+HARDWARE_VERSION = "M11"
+SOFTWARE_VERSION = "18625-797R+17829-719R"
+SERIAL_NUMBER = "ZS150045138C0104"
+
+CONTENT = (
+    f"1\n1\n{REGISTRY_ID}\n{REGISTRY_KEY}\n{HARDWARE_VERSION}\n{SOFTWARE_VERSION}\n"
+    f"16:22 20/02/2022\n1\n1\n{SERIAL_NUMBER}\n1234\n8.9\nOK\nError"
+)
+
+# an inverter producing 1234 W
+BYTE_CONTENT = CONTENT.encode()
+# the same inverter producing nothing
+IDLE_BYTE_CONTENT = CONTENT.replace("\n1234\n", "\n0\n").encode()
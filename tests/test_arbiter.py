@@ -0,0 +1,83 @@
+"""Tests the request arbiter."""
+import asyncio
+
+import pytest
+
+from custom_components.zeversolar_local.arbiter import (
+    PRIORITY_COMMAND,
+    PRIORITY_POLL,
+    ZeverSolarRequestArbiter,
+)
+
+
+async def test_ZeverSolarRequestArbiter_priority_and_gap():
+    """Tests one request at a time, commands first and the gap between them."""
+    arbiter = ZeverSolarRequestArbiter(0.05)
+    loop = asyncio.get_running_loop()
+    events = []
+    first_started = asyncio.Event()
+
+    async def _request(name, priority, release=None):
+        async with arbiter.async_slot(priority) as wait:
+            events.append((name, "start", loop.time(), wait))
+            first_started.set()
+            if release is not None:
+                await release.wait()
+            else:
+                await asyncio.sleep(0)
+            events.append((name, "end", loop.time(), wait))
+
+    release = asyncio.Event()
+    first = asyncio.create_task(_request("poll 1", PRIORITY_POLL, release))
+    await first_started.wait()
+    others = [
+        asyncio.create_task(_request("poll 2", PRIORITY_POLL)),
+        asyncio.create_task(_request("command", PRIORITY_COMMAND)),
+    ]
+    await asyncio.sleep(0)
+    assert arbiter.queue_depth == 2
+
+    release.set()
+    await asyncio.gather(first, *others)
+
+    assert [(name, what) for name, what, _, _ in events] == [
+        ("poll 1", "start"),
+        ("poll 1", "end"),
+        ("command", "start"),
+        ("command", "end"),
+        ("poll 2", "start"),
+        ("poll 2", "end"),
+    ]
+    assert events[2][2] - events[1][2] >= 0.05
+    assert events[4][2] - events[3][2] >= 0.05
+    assert events[4][3] >= 0.1
+    assert arbiter.queue_depth == 0
+    assert not arbiter._busy
+
+
+async def test_ZeverSolarRequestArbiter_cancelled_waiter():
+    """Tests a cancelled waiting request does not block the others."""
+    arbiter = ZeverSolarRequestArbiter(0)
+    release = asyncio.Event()
+
+    async def _blocking_request():
+        async with arbiter.async_slot(PRIORITY_POLL):
+            await release.wait()
+
+    async def _request():
+        async with arbiter.async_slot(PRIORITY_POLL):
+            return True
+
+    blocking = asyncio.create_task(_blocking_request())
+    await asyncio.sleep(0)
+    cancelled = asyncio.create_task(_request())
+    waiting = asyncio.create_task(_request())
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    release.set()
+
+    assert await waiting
+    await blocking
+    with pytest.raises(asyncio.CancelledError):
+        await cancelled
+    assert not arbiter._busy
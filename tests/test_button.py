@@ -4,11 +4,10 @@ from unittest.mock import patch
 from homeassistant.const import CONF_HOST
 from homeassistant.helpers.entity import DeviceInfo
 import httpx
-import pytest
 from pytest_homeassistant_custom_component.common import MockConfigEntry
-from zever_local.inverter import Inverter
 
 from custom_components.zeversolar_local.button import (
+    BUTTON_POWER_OFF_ENTITY_DESCRIPTION,
     ZeverSolarButton,
     ZeversolarButtonEntityDescription,
     async_setup_entry,
@@ -24,6 +23,9 @@ from custom_components.zeversolar_local.coordinator import (
     ZeversolarApiCoordinator,
 )
 
+_content = "1\n1\nEAB241277A36\nZYXTBGERTXJLTSVS\nM11\n18625-797R+17829-719R\n16:22 20/02/2022\n1\n1\nZS150045138C0104\n1234\n8.9\nOK\nError"
+_byte_content = _content.encode()
+
 
 def async_add_entities(entities):
     """Add entities to a sensor as simuation for unit test. Helper method."""
@@ -58,14 +60,15 @@ async def test_async_setup_entry(hass):
     await async_setup_entry(hass, config_entry, async_add_entities)
 
 
-async def test_ZeverSolarButton_class():
+async def test_ZeverSolarButton_class(hass):
     """Simple test for construction and initialization."""
     address = "10.10.10.1"
-    inverter = Inverter(address)
+    client = ZeverSolarApiClient(address)
+    coordinator = ZeversolarApiCoordinator(hass, client=client)
 
     device_info = DeviceInfo(
-        identifiers={(DOMAIN, inverter.serial_number)},
-        name=f"ZeverSolar inverter '{inverter.serial_number}'",
+        identifiers={(DOMAIN, client.serial_number)},
+        name=f"ZeverSolar inverter '{client.serial_number}'",
         manufacturer="ZeverSolar",
         hw_version="M10",
         sw_version="17717-709R+17511-707R",
@@ -74,39 +77,102 @@ async def test_ZeverSolarButton_class():
     entity_description = ZeversolarButtonEntityDescription(
         key="power_on",
         name="Power On",
-        press_action=lambda device: device.power_on(),
+        press_action=lambda client: client.async_power_on(),
+        confirm_fn=lambda data: True,
         icon="mdi:power-cycle",
     )
 
-    result_button = ZeverSolarButton(inverter, device_info, entity_description)
+    result_button = ZeverSolarButton(coordinator, device_info, entity_description)
     assert isinstance(result_button, ZeverSolarButton)
 
 
-async def test_ZeverSolarButton_press_button():
-    """Simple test for construction and initialization."""
+async def test_ZeverSolarButton_press_button(hass):
+    """Test a press sends the command once and polls until it is confirmed."""
     address = "10.10.10.1"
-    inverter = Inverter(address)
+    client = ZeverSolarApiClient(address, min_gap=0)
+    coordinator = ZeversolarApiCoordinator(hass, client=client)
 
     device_info = DeviceInfo(
-        identifiers={(DOMAIN, inverter.serial_number)},
-        name=f"ZeverSolar inverter '{inverter.serial_number}'",
+        identifiers={(DOMAIN, client.serial_number)},
+        name=f"ZeverSolar inverter '{client.serial_number}'",
         manufacturer="ZeverSolar",
         hw_version="M10",
         sw_version="17717-709R+17511-707R",
     )
 
-    entity_description = ZeversolarButtonEntityDescription(
-        key="power_on",
-        name="Power On",
-        press_action=lambda device: device.power_on(),
-        icon="mdi:power-cycle",
+    result_button = ZeverSolarButton(
+        coordinator, device_info, BUTTON_POWER_OFF_ENTITY_DESCRIPTION
+    )
+    producing = httpx.Response(
+        200, request=httpx.Request("Get", "https://test.t"), content=_byte_content
+    )
+    switched_off = httpx.Response(
+        200,
+        request=httpx.Request("Get", "https://test.t"),
+        content=_byte_content.replace(b"\n1234\n", b"\n0\n"),
     )
 
-    result_button = ZeverSolarButton(inverter, device_info, entity_description)
-    with patch("zever_local.inverter.httpx.AsyncClient.post") as api_mock:
-        mock_response = httpx.Response(
+    with patch(
+        "custom_components.zeversolar_local.coordinator.COMMAND_CONFIRM_INTERVAL",
+        0.01,
+    ), patch("zever_local.inverter.httpx.AsyncClient.post") as api_mock, patch(
+        "zever_local.inverter.httpx.AsyncClient.get",
+        side_effect=[producing, producing, switched_off],
+    ) as get_mock:
+        api_mock.return_value = httpx.Response(
+            200, request=httpx.Request("Get", "https://test.t")
+        )
+
+        await result_button.async_press()
+        # a repeated press while the command is confirmed is not sent again
+        await result_button.async_press()
+        await coordinator._command
+
+        api_mock.assert_called_once()
+        assert get_mock.call_count == 3
+
+    assert coordinator.data.pac_watt == 0
+    assert coordinator._command_key is None
+    await coordinator.async_shutdown()
+
+
+async def test_ZeverSolarButton_press_button_not_confirmed(hass, caplog):
+    """Test the confirmation polls end at the deadline."""
+    client = ZeverSolarApiClient("10.10.10.1", min_gap=0)
+    coordinator = ZeversolarApiCoordinator(hass, client=client)
+    result_button = ZeverSolarButton(
+        coordinator, DeviceInfo(), BUTTON_POWER_OFF_ENTITY_DESCRIPTION
+    )
+
+    with patch(
+        "custom_components.zeversolar_local.coordinator.COMMAND_CONFIRM_INTERVAL",
+        0.01,
+    ), patch(
+        "custom_components.zeversolar_local.coordinator.COMMAND_CONFIRM_DEADLINE",
+        0.05,
+    ), patch("zever_local.inverter.httpx.AsyncClient.post") as api_mock, patch(
+        "zever_local.inverter.httpx.AsyncClient.get"
+    ) as get_mock:
+        api_mock.return_value = httpx.Response(
             200, request=httpx.Request("Get", "https://test.t")
         )
-        api_mock.return_value = mock_response
+        get_mock.return_value = httpx.Response(
+            200, request=httpx.Request("Get", "https://test.t"), content=_byte_content
+        )
 
         await result_button.async_press()
+        await coordinator._command
+
+    assert "did not confirm the command 'power_off'" in caplog.text
+    assert coordinator._command_key is None
+
+    # a rejected command is not confirmed
+    with patch("zever_local.inverter.httpx.AsyncClient.post") as api_mock:
+        api_mock.return_value = httpx.Response(
+            500, request=httpx.Request("Get", "https://test.t")
+        )
+        await result_button.async_press()
+
+    assert "rejected the command 'power_off'" in caplog.text
+    assert coordinator._command_key is None
+    await coordinator.async_shutdown()
@@ -0,0 +1,55 @@
+"""Tests the circuit breaker."""
+from unittest.mock import patch
+
+from custom_components.zeversolar_local.circuit_breaker import (
+    STATE_CLOSED,
+    STATE_HALF_OPEN,
+    STATE_OPEN,
+    ZeverSolarCircuitBreaker,
+)
+
+
+class _Clock:
+    """A clock moved by the test."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_ZeverSolarCircuitBreaker_opens_at_threshold():
+    """Tests the breaker opens after the failures in a row and closes on success."""
+    clock = _Clock()
+    breaker = ZeverSolarCircuitBreaker(3, 30, 900, clock)
+
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == STATE_CLOSED
+    assert breaker.allow_request()
+    assert breaker.retry_in is None
+
+    with patch("random.uniform", return_value=1):
+        breaker.record_failure()
+    assert breaker.state == STATE_OPEN
+    assert not breaker.allow_request()
+    assert breaker.retry_in == 30
+
+    clock.now += 30
+    assert breaker.state == STATE_HALF_OPEN
+    assert breaker.allow_request()
+
+    breaker.record_success()
+    assert breaker.state == STATE_CLOSED
+    assert breaker.failures == 0
+
+
+def test_ZeverSolarCircuitBreaker_capped_backoff_with_jitter():
+    """Tests the delay doubles up to the cap and is jittered."""
+    clock = _Clock()
+    breaker = ZeverSolarCircuitBreaker(1, 30, 900, clock)
+
+    for expected in (30, 60, 120, 240, 480, 900, 900):
+        breaker.record_failure()
+        assert expected / 2 <= breaker.retry_in <= expected
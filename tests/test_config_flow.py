@@ -14,6 +14,8 @@ from custom_components.zeversolar_local.const import (
     CONF_SERIAL_NO,
     DOMAIN,
     OPT_DATA_INTERVAL,
+    OPT_MAX_DATA_INTERVAL,
+    OPT_PEAK_POWER,
 )
 
 _registry_id = "EAB241277A36"
@@ -241,3 +243,31 @@ async def test_ZeverSolarOptionsFlowHandler_async_step_init_interval_wrong():
     assert my_flow_result["type"] == "form"
     assert my_flow_result["step_id"] == "init"
     assert my_flow_result["errors"] == {"base": "data_interval_wrong"}
+
+
+async def test_ZeverSolarOptionsFlowHandler_async_step_init_max_interval_wrong():
+    """Tests the init step with a maximum interval below the interval."""
+    data = {OPT_DATA_INTERVAL: 60, OPT_MAX_DATA_INTERVAL: 30}
+    config_entry = MockConfigEntry(domain=DOMAIN, data=data)
+
+    options_flow_handler = ZeverSolarOptionsFlowHandler(config_entry)
+
+    my_flow_result = await options_flow_handler.async_step_init(user_input=data)
+
+    assert my_flow_result["type"] == "form"
+    assert my_flow_result["step_id"] == "init"
+    assert my_flow_result["errors"] == {"base": "max_data_interval_wrong"}
+
+
+async def test_ZeverSolarOptionsFlowHandler_async_step_init_peak_power_wrong():
+    """Tests the init step with a negative peak power."""
+    data = {OPT_DATA_INTERVAL: 60, OPT_PEAK_POWER: -1}
+    config_entry = MockConfigEntry(domain=DOMAIN, data=data)
+
+    options_flow_handler = ZeverSolarOptionsFlowHandler(config_entry)
+
+    my_flow_result = await options_flow_handler.async_step_init(user_input=data)
+
+    assert my_flow_result["type"] == "form"
+    assert my_flow_result["step_id"] == "init"
+    assert my_flow_result["errors"] == {"base": "peak_power_wrong"}
@@ -1,23 +1,24 @@
 """Test the coordinator classes."""
-from unittest.mock import patch
+import asyncio
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
 
 from homeassistant.helpers.update_coordinator import UpdateFailed
 import httpx
 import pytest
+from zever_local.inverter import ZeversolarError, ZeversolarTimeout
 
 from custom_components.zeversolar_local.coordinator import ZeversolarApiCoordinator
 from custom_components.zeversolar_local.zever_local import ZeverSolarApiClient
 
-_registry_id = "EAB241277A36"
-_registry_key = "ZYXTBGERTXJLTSVS"
-_hardware_version = "M11"
-_software_version = "18625-797R+17829-719R"
-_time = "16:22"
-_date = "20/02/2022"
-_serial_number = "ZS150045138C0104"
-_content = f"1\n1\n{_registry_id}\n{_registry_key}\n{_hardware_version}\n{_software_version}\n{_time} {_date}\n1\n1\n{_serial_number}\n1234\n8.9\nOK\nError"
+from .payloads import BYTE_CONTENT, IDLE_BYTE_CONTENT
 
-_byte_content = _content.encode()
+
+def _mock_response(content: bytes) -> httpx.Response:
+    """Return a response of the inverter. Helper method."""
+    return httpx.Response(
+        200, request=httpx.Request("Get", "https://test.t"), content=content
+    )
 
 
 async def test_zeversolarApiCoordinator_constructor(hass):
@@ -35,7 +36,7 @@ async def test_zeversolarApiCoordinator_async_get_data_ok(hass):
 
     with patch("zever_local.inverter.httpx.AsyncClient.get") as api_mock:
         mock_response = httpx.Response(
-            200, request=httpx.Request("Get", "https://test.t"), content=_byte_content,
+            200, request=httpx.Request("Get", "https://test.t"), content=BYTE_CONTENT,
         )
         api_mock.return_value = mock_response
 
@@ -43,6 +44,10 @@ async def test_zeversolarApiCoordinator_async_get_data_ok(hass):
 
     assert result_data is not None
     assert result_coordinator.last_update_success
+    assert [
+        (pac_watt, energy_today)
+        for _, pac_watt, energy_today in result_coordinator.history
+    ] == [(1234, pytest.approx(8.09))]
 
 
 async def test_zeversolarApiCoordinator_async_get_data_exception(hass):
@@ -54,3 +59,206 @@ async def test_zeversolarApiCoordinator_async_get_data_exception(hass):
         with patch("zever_local.inverter.httpx.AsyncClient.get") as api_mock:
             api_mock.side_effect = Exception("failure")
             await result_coordinator._async_update_data()
+
+
+async def test_zeversolarApiCoordinator_async_get_data_timeout(hass):
+    """Tests a timeout of the inverter is reported as failed update."""
+    api_client = ZeverSolarApiClient("TEST_HOST")
+    result_coordinator = ZeversolarApiCoordinator(hass, api_client)
+
+    with patch.object(
+        api_client, "async_get_data", side_effect=ZeversolarTimeout("timeout")
+    ), pytest.raises(UpdateFailed, match="Timeout communicating with API"):
+        await result_coordinator._async_update_data()
+
+    assert not result_coordinator.last_update_success
+
+
+async def test_zeversolarApiCoordinator_async_get_data_error(hass):
+    """Tests an inverter error is reported as failed update."""
+    api_client = ZeverSolarApiClient("TEST_HOST")
+    result_coordinator = ZeversolarApiCoordinator(hass, api_client)
+
+    with patch.object(
+        api_client, "async_get_data", side_effect=ZeversolarError("error")
+    ), pytest.raises(UpdateFailed, match="Error communicating with API"):
+        await result_coordinator._async_update_data()
+
+    assert not result_coordinator.last_update_success
+
+
+async def test_zeversolarApiCoordinator_backs_off_while_idle(hass):
+    """Tests the interval is stretched at night and reset while producing."""
+    api_client = ZeverSolarApiClient("TEST_HOST")
+    result_coordinator = ZeversolarApiCoordinator(
+        hass,
+        api_client,
+        update_interval=timedelta(seconds=30),
+        max_update_interval=timedelta(seconds=100),
+    )
+    hass.states.async_set("sun.sun", "below_horizon")
+
+    with patch("zever_local.inverter.httpx.AsyncClient.get") as api_mock:
+        api_mock.return_value = _mock_response(IDLE_BYTE_CONTENT)
+
+        await result_coordinator._async_update_data()
+        assert result_coordinator.update_interval == timedelta(seconds=60)
+
+        await result_coordinator._async_update_data()
+        assert result_coordinator.update_interval == timedelta(seconds=100)
+
+        api_mock.side_effect = httpx.ConnectTimeout("timeout")
+        with pytest.raises(UpdateFailed):
+            await result_coordinator._async_update_data()
+        assert result_coordinator.update_interval == timedelta(seconds=100)
+
+        api_mock.side_effect = None
+        api_mock.return_value = _mock_response(BYTE_CONTENT)
+        await result_coordinator._async_update_data()
+        assert result_coordinator.update_interval == timedelta(seconds=30)
+
+
+async def test_zeversolarApiCoordinator_no_back_off_at_daylight(hass):
+    """Tests the interval is kept while the sun is up and the inverter answers."""
+    api_client = ZeverSolarApiClient("TEST_HOST")
+    result_coordinator = ZeversolarApiCoordinator(hass, api_client)
+    hass.states.async_set("sun.sun", "above_horizon")
+
+    with patch("zever_local.inverter.httpx.AsyncClient.get") as api_mock:
+        api_mock.return_value = _mock_response(IDLE_BYTE_CONTENT)
+        await result_coordinator._async_update_data()
+
+    assert result_coordinator.update_interval == timedelta(seconds=30)
+
+
+async def test_zeversolarApiCoordinator_sunrise_resets_interval(hass):
+    """Tests the fast interval is restored at sunrise."""
+    api_client = ZeverSolarApiClient("TEST_HOST")
+    result_coordinator = ZeversolarApiCoordinator(hass, api_client)
+    hass.states.async_set("sun.sun", "below_horizon")
+    unsub = result_coordinator.async_track_sun()
+
+    with patch("zever_local.inverter.httpx.AsyncClient.get") as api_mock:
+        api_mock.side_effect = httpx.ConnectTimeout("timeout")
+        with pytest.raises(UpdateFailed):
+            await result_coordinator._async_update_data()
+        assert result_coordinator.update_interval == timedelta(seconds=60)
+
+        api_mock.side_effect = None
+        api_mock.return_value = _mock_response(BYTE_CONTENT)
+        hass.states.async_set("sun.sun", "above_horizon")
+        await hass.async_block_till_done()
+
+        api_mock.assert_called()
+
+    assert result_coordinator.idle_polls == 0
+    assert result_coordinator.update_interval == timedelta(seconds=30)
+    unsub()
+    await result_coordinator.async_shutdown()
+
+
+async def test_zeversolarApiCoordinator_changed_fields(hass):
+    """Tests only the fields that differ from the previous data are reported."""
+    api_client = ZeverSolarApiClient("TEST_HOST")
+    result_coordinator = ZeversolarApiCoordinator(hass, api_client)
+
+    with patch("zever_local.inverter.httpx.AsyncClient.get") as api_mock:
+        api_mock.return_value = _mock_response(BYTE_CONTENT)
+        await result_coordinator.async_refresh()
+        assert result_coordinator.changed_fields == {
+            "pac_watt",
+            "energy_today_KWh",
+            "communication_status",
+            "status",
+        }
+
+        await result_coordinator.async_refresh()
+        assert result_coordinator.changed_fields == set()
+
+        api_mock.return_value = _mock_response(IDLE_BYTE_CONTENT)
+        await result_coordinator.async_refresh()
+        assert result_coordinator.changed_fields == {"pac_watt"}
+
+        api_mock.side_effect = httpx.ConnectTimeout("timeout")
+        await result_coordinator.async_refresh()
+        assert result_coordinator.changed_fields == set()
+
+
+async def test_zeversolarApiCoordinator_unchanged_payload_changes_no_field(hass):
+    """Tests a byte for byte equal payload reaches the listeners without changes."""
+    api_client = ZeverSolarApiClient("TEST_HOST")
+    result_coordinator = ZeversolarApiCoordinator(hass, api_client)
+    calls = []
+    result_coordinator.async_add_listener(
+        lambda: calls.append(result_coordinator.changed_fields)
+    )
+
+    with patch("zever_local.inverter.httpx.AsyncClient.get") as api_mock:
+        api_mock.return_value = _mock_response(BYTE_CONTENT)
+        await result_coordinator.async_refresh()
+        assert len(calls) == 1
+
+        await result_coordinator.async_refresh()
+        assert calls[1] == set()
+        assert api_client.unchanged_polls == 1
+
+        # the listeners learn about the failure and the recovery
+        api_mock.side_effect = httpx.ConnectTimeout("timeout")
+        await result_coordinator.async_refresh()
+        assert len(calls) == 3
+
+        api_mock.side_effect = None
+        await result_coordinator.async_refresh()
+        assert len(calls) == 4
+        assert api_client.unchanged_polls == 2
+
+    await result_coordinator.async_shutdown()
+
+
+async def test_zeversolarApiCoordinator_burst(hass):
+    """Tests a burst polls at its interval and keeps the AC power of every poll."""
+    api_client = ZeverSolarApiClient("TEST_HOST", min_gap=0)
+    result_coordinator = ZeversolarApiCoordinator(hass, api_client)
+
+    result_coordinator.async_start_burst(timedelta(seconds=1), timedelta(seconds=60))
+    assert result_coordinator.update_interval == timedelta(seconds=1)
+    assert result_coordinator.burst_readings.maxlen == 61
+
+    with patch("zever_local.inverter.httpx.AsyncClient.get") as api_mock:
+        api_mock.return_value = _mock_response(BYTE_CONTENT)
+        await result_coordinator._async_update_data()
+        api_mock.return_value = _mock_response(IDLE_BYTE_CONTENT)
+        await result_coordinator._async_update_data()
+
+        # the idle inverter is not backed off during a burst
+        assert result_coordinator.update_interval == timedelta(seconds=1)
+        assert [pac for _, pac in result_coordinator.burst_readings] == [1234, 0]
+
+        result_coordinator.async_start_burst(
+            timedelta(seconds=0.01), timedelta(seconds=0.02)
+        )
+        assert not result_coordinator.burst_readings
+        await asyncio.sleep(0.03)
+        api_mock.return_value = _mock_response(BYTE_CONTENT)
+        await result_coordinator._async_update_data()
+
+    assert result_coordinator.burst_interval is None
+    assert result_coordinator.update_interval == timedelta(seconds=30)
+    assert len(result_coordinator.burst_readings) == 1
+
+
+async def test_zeversolarApiCoordinator_energy_statistics(hass):
+    """Tests every reading is added to the energy statistics."""
+    api_client = ZeverSolarApiClient("TEST_HOST")
+    result_coordinator = ZeversolarApiCoordinator(hass, api_client)
+    result_coordinator.energy_statistics = MagicMock()
+
+    with patch("zever_local.inverter.httpx.AsyncClient.get") as api_mock:
+        api_mock.return_value = _mock_response(BYTE_CONTENT)
+        await result_coordinator._async_update_data()
+
+    add_reading = result_coordinator.energy_statistics.async_add_reading
+    add_reading.assert_called_once()
+    timestamp, energy = add_reading.call_args[0]
+    assert timestamp.tzinfo is not None
+    assert energy == pytest.approx(8.09)
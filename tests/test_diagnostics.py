@@ -0,0 +1,81 @@
+"""Test the diagnostics."""
+from unittest.mock import patch
+
+from homeassistant.components.diagnostics import REDACTED
+from homeassistant.const import CONF_HOST
+import httpx
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.zeversolar_local.const import (
+    CONF_SERIAL_NO,
+    DOMAIN,
+    ENTRY_COORDINATOR,
+)
+from custom_components.zeversolar_local.diagnostics import (
+    async_get_config_entry_diagnostics,
+)
+
+_registry_id = "EAB241277A36"
+_registry_key = "ZYXTBGERTXJLTSVS"
+_hardware_version = "M11"
+_software_version = "18625-797R+17829-719R"
+_time = "16:22"
+_date = "20/02/2022"
+_serial_number = "ZS150045138C0104"
+_content = f"1\n1\n{_registry_id}\n{_registry_key}\n{_hardware_version}\n{_software_version}\n{_time} {_date}\n1\n1\n{_serial_number}\n1234\n8.9\nOK\nError"
+
+_byte_content = _content.encode()
+
+
+async def test_async_get_config_entry_diagnostics(hass, enable_custom_integrations):
+    """Test the diagnostics show the polls without the identity of the inverter."""
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        unique_id="my_unique_test_id",
+        data={CONF_HOST: "TEST_HOST", CONF_SERIAL_NO: _serial_number},
+    )
+    config_entry.add_to_hass(hass)
+
+    with patch("zever_local.inverter.httpx.AsyncClient.get") as api_mock:
+        api_mock.return_value = httpx.Response(
+            200, request=httpx.Request("Get", "https://test.t"), content=_byte_content
+        )
+        assert await hass.config_entries.async_setup(config_entry.entry_id)
+        await hass.async_block_till_done()
+
+        api_mock.side_effect = httpx.ConnectError("boo")
+        coordinator = hass.data[DOMAIN][config_entry.entry_id][ENTRY_COORDINATOR]
+        await coordinator.async_refresh()
+
+    result = await async_get_config_entry_diagnostics(hass, config_entry)
+
+    assert result["entry"]["data"] == {CONF_HOST: REDACTED, CONF_SERIAL_NO: REDACTED}
+    assert result["coordinator"]["update_interval"] == 60
+    assert result["coordinator"]["base_update_interval"] == 30
+    assert result["coordinator"]["idle_polls"] == 1
+    assert not result["coordinator"]["last_update_success"]
+
+    assert result["history"]["readings"] == 1
+    assert result["history"]["bytes"] == 12
+    assert result["burst"] == {"interval": None, "readings": []}
+
+    polls = result["polls"]
+    assert polls["requests"] == 2
+    assert polls["errors"] == 1
+    assert polls["failure_streak"] == 1
+    assert polls["failure_rate"] == 50
+    assert set(polls["latency_ms"]) == {"p50", "p95", "p99"}
+
+    assert len(result["payloads"]) == 1
+    payload = result["payloads"][0]["content"]
+    assert _registry_id not in payload
+    assert _registry_key not in payload
+    assert _serial_number not in payload
+    assert payload.split("\n")[2:4] == [REDACTED, REDACTED]
+    assert payload.split("\n")[9] == REDACTED
+    assert payload.split("\n")[10] == "1234"
+
+    assert result["connection_pool"]["users"] == 1
+    assert not result["connection_pool"]["closed"]
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
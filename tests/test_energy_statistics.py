@@ -0,0 +1,50 @@
+"""Test the hourly energy statistics."""
+from datetime import datetime, timedelta, timezone
+
+from homeassistant.components.recorder.statistics import statistics_during_period
+from pytest_homeassistant_custom_component.components.recorder.common import (
+    async_wait_recording_done,
+)
+
+from custom_components.zeversolar_local.energy_statistics import (
+    ZeverSolarEnergyStatistics,
+)
+
+_hour = datetime(2022, 2, 20, 10, tzinfo=timezone.utc)
+
+
+async def _async_get_statistics(hass, statistic_id):
+    """Return the hourly statistics. Helper method."""
+    await async_wait_recording_done(hass)
+    return statistics_during_period(
+        hass, _hour, None, {statistic_id}, "hour", None, {"state", "sum"}
+    ).get(statistic_id, [])
+
+
+async def test_energy_statistics(recorder_mock, hass):
+    """Test the energy is added to the statistics once the hour is complete."""
+    energy_statistics = ZeverSolarEnergyStatistics(hass, "ZS150045138C0104")
+    await energy_statistics.async_load()
+    statistic_id = "zeversolar_local:energy_zs150045138c0104"
+    assert energy_statistics.statistic_id == statistic_id
+
+    energy_statistics.async_add_reading(_hour + timedelta(minutes=10), 1.0)
+    energy_statistics.async_add_reading(_hour + timedelta(minutes=40), 1.5)
+    assert not await _async_get_statistics(hass, statistic_id)
+
+    energy_statistics.async_add_reading(_hour + timedelta(minutes=70), 2.5)
+    # the inverter starts at zero on the next day
+    energy_statistics.async_add_reading(_hour + timedelta(hours=14), 0.25)
+    energy_statistics.async_add_reading(_hour + timedelta(hours=15), 0.5)
+
+    statistics = await _async_get_statistics(hass, statistic_id)
+    assert [(row["state"], row["sum"]) for row in statistics] == [
+        (1.5, 0.5),
+        (2.5, 1.5),
+        (0.25, 1.75),
+    ]
+    assert statistics[0]["start"] == _hour.timestamp()
+
+    restored = ZeverSolarEnergyStatistics(hass, "ZS150045138C0104")
+    await restored.async_load()
+    assert restored.sum == 1.75
@@ -0,0 +1,142 @@
+"""Test the client and the coordinator against fake inverters on real sockets.
+
+The socket_enabled fixture lifts the socket block of the test harness.
+"""
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from zever_local.inverter import ZeversolarError, ZeversolarTimeout
+
+from custom_components.zeversolar_local.coordinator import ZeversolarApiCoordinator
+from custom_components.zeversolar_local.fleet import ZeversolarFleetScheduler
+from custom_components.zeversolar_local.zever_local import (
+    ZeverSolarApiClient,
+    ZeverSolarConnectionPool,
+)
+
+from .fake_inverter import FakeInverter, FakeInverterFleet
+
+_noon = datetime(2022, 6, 21, 13, 0)
+
+
+def test_FakeInverter_diurnal_curve():
+    """Tests the power peaks at noon and the energy grows over the day."""
+    inverter = FakeInverter(peak_watt=5000)
+
+    assert inverter.pac_watt(_noon) == 5000
+    assert inverter.pac_watt(_noon.replace(hour=3)) == 0
+    assert inverter.energy_today_kwh(_noon.replace(hour=3)) == 0
+    assert inverter.energy_today_kwh(_noon) == pytest.approx(22.28, abs=0.01)
+    assert inverter.energy_today_kwh(_noon.replace(hour=23)) == pytest.approx(
+        44.56, abs=0.01
+    )
+
+
+def test_FakeInverter_offline_over_midnight():
+    """Tests the offline window may span midnight."""
+    inverter = FakeInverter(
+        offline_from=_noon.replace(hour=22).time(),
+        offline_until=_noon.replace(hour=5).time(),
+    )
+
+    assert inverter.is_offline(_noon.replace(hour=23))
+    assert inverter.is_offline(_noon.replace(hour=2))
+    assert not inverter.is_offline(_noon)
+
+
+async def test_fake_inverter_data(hass, socket_enabled):
+    """Tests the client parses the payload of the fake inverter."""
+    fleet = FakeInverterFleet(clock=lambda: _noon.replace(minute=5))
+    (host,) = await fleet.async_start()
+    inverter = fleet.inverters[0]
+
+    try:
+        client = ZeverSolarApiClient(host)
+        data = await client.async_get_data()
+
+        assert data.serial_number == inverter.serial_number
+        assert data.pac_watt == inverter.pac_watt(_noon.replace(minute=5))
+        assert data.energy_today_KWh == inverter.energy_today_kwh(
+            _noon.replace(minute=5)
+        )
+        assert data.datetime == _noon.replace(minute=5)
+
+        assert await client.async_power_off()
+        assert not inverter.powered_on
+        data = await client.async_get_data()
+        assert data.pac_watt == 0
+    finally:
+        await fleet.async_stop()
+
+
+async def test_fake_inverter_timeout(hass, socket_enabled):
+    """Tests a slow inverter raises a ZeversolarTimeout."""
+    fleet = FakeInverterFleet(latency=0.5)
+    (host,) = await fleet.async_start()
+
+    try:
+        client = ZeverSolarApiClient(host, timeout=0.05)
+        with pytest.raises(ZeversolarTimeout):
+            await client.async_get_data()
+        assert client.metrics.timeouts == 1
+    finally:
+        await fleet.async_stop()
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"drop_rate": 1},
+        {
+            "offline_from": _noon.replace(hour=12).time(),
+            "offline_until": _noon.replace(hour=14).time(),
+        },
+    ],
+)
+async def test_fake_inverter_dropped(hass, socket_enabled, kwargs):
+    """Tests a lost answer raises a ZeversolarError."""
+    fleet = FakeInverterFleet(clock=lambda: _noon, **kwargs)
+    (host,) = await fleet.async_start()
+
+    try:
+        client = ZeverSolarApiClient(host)
+        with pytest.raises(ZeversolarError):
+            await client.async_get_data()
+        assert client.metrics.errors == 1
+    finally:
+        await fleet.async_stop()
+
+
+async def test_fake_inverter_fleet_load(hass, socket_enabled):
+    """Tests a fleet of coordinators polls many inverters over the shared pool."""
+    fleet = FakeInverterFleet(count=50, latency=0.01, jitter=0.005)
+    hosts = await fleet.async_start()
+    pool = ZeverSolarConnectionPool()
+    scheduler = ZeversolarFleetScheduler(hass, 8)
+
+    try:
+        coordinators = [
+            ZeversolarApiCoordinator(
+                hass,
+                ZeverSolarApiClient(host, http_client=pool.http_client),
+                update_interval=timedelta(seconds=30),
+                fleet=scheduler,
+            )
+            for host in hosts
+        ]
+        await asyncio.gather(
+            *[coordinator.async_refresh() for coordinator in coordinators]
+        )
+
+        assert all(coordinator.last_update_success for coordinator in coordinators)
+        assert [coordinator.data.serial_number for coordinator in coordinators] == [
+            inverter.serial_number for inverter in fleet.inverters
+        ]
+        assert all(inverter.requests == 1 for inverter in fleet.inverters)
+
+        for coordinator in coordinators:
+            await coordinator.async_shutdown()
+    finally:
+        await pool.async_close()
+        await fleet.async_stop()
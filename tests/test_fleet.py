@@ -0,0 +1,113 @@
+"""Test the fleet scheduler."""
+import asyncio
+from datetime import timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from custom_components.zeversolar_local.__init__ import async_setup
+from custom_components.zeversolar_local.const import DATA_FLEET, DOMAIN
+from custom_components.zeversolar_local.coordinator import ZeversolarApiCoordinator
+from custom_components.zeversolar_local.fleet import ZeversolarFleetScheduler
+from custom_components.zeversolar_local.zever_local import ZeverSolarApiClient
+
+
+def _create_coordinators(hass, fleet, count):
+    """Create coordinators of the fleet. Helper method."""
+    return [
+        ZeversolarApiCoordinator(
+            hass,
+            ZeverSolarApiClient(f"TEST_HOST_{index}"),
+            update_interval=timedelta(seconds=30),
+            fleet=fleet,
+        )
+        for index in range(count)
+    ]
+
+
+async def test_async_setup_with_fleet(hass):
+    """Tests the fleet scheduler is created if configured."""
+    await async_setup(hass, {DOMAIN: {"fleet": {"max_concurrency": 2}}})
+
+    fleet = hass.data[DOMAIN][DATA_FLEET]
+    assert type(fleet) is ZeversolarFleetScheduler
+    assert fleet.max_concurrency == 2
+
+
+async def test_async_setup_without_fleet(hass):
+    """Tests there is no fleet scheduler by default."""
+    await async_setup(hass, {})
+
+    assert DATA_FLEET not in hass.data[DOMAIN]
+
+
+async def test_fleet_staggers_first_refresh(hass):
+    """Tests the coordinators get different phase offsets."""
+    fleet = ZeversolarFleetScheduler(hass, 4)
+    coordinators = _create_coordinators(hass, fleet, 5)
+    assert fleet.members == 5
+
+    now = hass.loop.time()
+    for coordinator in coordinators:
+        coordinator._schedule_refresh()
+
+    delays = [fleet._due[coordinator] - now for coordinator in coordinators]
+    assert all(30 <= delay < 60 for delay in delays)
+    assert len({round(delay) for delay in delays}) == 5
+
+    # further refreshes keep the interval
+    coordinators[1]._schedule_refresh()
+    assert 30 <= fleet._due[coordinators[1]] - now < 31
+
+    for coordinator in coordinators:
+        await coordinator.async_shutdown()
+    assert fleet.members == 0
+    assert fleet._wakeup is None
+
+
+async def test_fleet_refreshes_due_coordinators(hass):
+    """Tests the fleet refreshes the coordinators that are due."""
+    fleet = ZeversolarFleetScheduler(hass, 4)
+    due_coordinator, other_coordinator = _create_coordinators(hass, fleet, 2)
+
+    fleet._due[due_coordinator] = hass.loop.time() - 1
+    fleet._due[other_coordinator] = hass.loop.time() + 100
+
+    with patch.object(
+        due_coordinator, "async_fleet_refresh", AsyncMock()
+    ) as due_mock, patch.object(
+        other_coordinator, "async_fleet_refresh", AsyncMock()
+    ) as other_mock:
+        fleet._async_wake_up()
+        await hass.async_block_till_done()
+
+        due_mock.assert_awaited_once()
+        other_mock.assert_not_called()
+
+    assert list(fleet._due) == [other_coordinator]
+    fleet.async_shutdown()
+    assert fleet._wakeup is None
+
+
+async def test_fleet_limits_concurrency(hass):
+    """Tests no more requests than the limit are on the wire."""
+    fleet = ZeversolarFleetScheduler(hass, 2)
+    coordinators = _create_coordinators(hass, fleet, 6)
+    running = 0
+    max_running = 0
+
+    async def _async_get_data():
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return MagicMock(pac_watt=0, energy_today_KWh=0)
+
+    for coordinator in coordinators:
+        coordinator.client.async_get_data = _async_get_data
+
+    with patch.object(ZeversolarApiCoordinator, "_adapt_update_interval"):
+        await asyncio.gather(
+            *[coordinator._async_update_data() for coordinator in coordinators]
+        )
+
+    assert max_running == 2
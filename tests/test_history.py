@@ -0,0 +1,73 @@
+"""Test the in-memory history of the readings."""
+from array import array
+
+import pytest
+
+from custom_components.zeversolar_local.history import ZeverSolarHistory
+
+
+def test_history_grows_up_to_capacity():
+    """Test the readings are kept in order until the buffer is full."""
+    history = ZeverSolarHistory(3)
+
+    history.append(100.7, 500, 1.5)
+    history.append(110, 600, 1.75)
+
+    assert len(history) == 2
+    assert list(history) == [(100, 500, 1.5), (110, 600, 1.75)]
+    assert history.nbytes == 24
+
+
+def test_history_overwrites_the_oldest_reading():
+    """Test a full buffer drops the oldest reading."""
+    history = ZeverSolarHistory(3)
+    for second in range(5):
+        history.append(100 + second * 10, second, 0.5)
+
+    assert len(history) == 3
+    assert [timestamp for timestamp, _, _ in history] == [120, 130, 140]
+
+    timestamps, pac_watt, energy_today = history.arrays()
+    assert timestamps == array("I", [120, 130, 140])
+    assert pac_watt == array("f", [2, 3, 4])
+    assert energy_today == array("f", [0.5, 0.5, 0.5])
+
+
+@pytest.mark.parametrize(
+    ("since", "expected"),
+    [
+        (0, [130, 140, 150, 160]),
+        (135, [140, 150, 160]),
+        (150, [150, 160]),
+        (155, [160]),
+        (170, []),
+    ],
+)
+def test_history_arrays_since(since, expected):
+    """Test the readings of a window are found across the wrap of the ring."""
+    history = ZeverSolarHistory(4)
+    for second in range(7):
+        history.append(100 + second * 10, second, 0)
+
+    timestamps, pac_watt, _ = history.arrays(since)
+
+    assert list(timestamps) == expected
+    assert len(pac_watt) == len(expected)
+
+
+def test_history_clear():
+    """Test all readings are dropped."""
+    history = ZeverSolarHistory(2)
+    for second in range(3):
+        history.append(second, 1, 1)
+
+    history.clear()
+    history.append(10, 2, 2)
+
+    assert list(history) == [(10, 2, 2)]
+
+
+def test_history_needs_capacity():
+    """Test a buffer without capacity is refused."""
+    with pytest.raises(ValueError):
+        ZeverSolarHistory(0)
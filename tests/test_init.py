@@ -1,14 +1,21 @@
 """Test component setup."""
+from datetime import timedelta
 from unittest.mock import patch
 
-from homeassistant.const import CONF_HOST
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import CONF_HOST, EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import State
 from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+from homeassistant.util import dt as dt_util
 import httpx
 import pytest
 from pytest_homeassistant_custom_component.common import (
     MockConfigEntry,
     MockModule,
+    async_fire_time_changed,
     mock_integration,
+    mock_restore_cache_with_extra_data,
 )
 
 from custom_components.zeversolar_local.__init__ import (
@@ -18,11 +25,21 @@ from custom_components.zeversolar_local.__init__ import (
     async_unload_entry,
 )
 from custom_components.zeversolar_local.const import (  # ENTRY_DEVICE_INFO,
+    ATTR_READING_TIME,
+    ATTR_STALE,
     CONF_SERIAL_NO,
+    DATA_CONNECTION_POOL,
     DOMAIN,
     ENTRY_COORDINATOR,
+    ENTRY_DAILY_SUMMARIES,
+    OPT_DATA_INTERVAL,
+    OPT_ENERGY_STATISTICS,
+    OPT_HOURLY_ENERGY_STATE,
+    OPT_MAX_DATA_INTERVAL,
+    OPT_PEAK_POWER,
 )
 from custom_components.zeversolar_local.coordinator import ZeversolarApiCoordinator
+from custom_components.zeversolar_local.summary import ZeverSolarDailySummaries
 from custom_components.zeversolar_local.zever_local import ZeverSolarApiClient
 
 _registry_id = "EAB241277A36"
@@ -40,14 +57,6 @@ _byte_content = _content.encode()
 async def test_async_setup_entry_config_not_ready(hass):
     """Test the integration setup with no connection to the inverter throwning a ConfigEntryNotReady exception."""
 
-    def side_effect_except():
-        mock_response = httpx.Response(
-            200, request=httpx.Request("Get", "https://test.t"), content=_byte_content
-        )
-
-        yield mock_response
-        yield Exception("boo")
-
     with pytest.raises(ConfigEntryNotReady):
         mock_integration(hass, MockModule(DOMAIN))
 
@@ -60,11 +69,107 @@ async def test_async_setup_entry_config_not_ready(hass):
         config_entry.add_to_hass(hass)
 
         with patch("zever_local.inverter.httpx.AsyncClient.get") as api_mock:
-            api_mock.side_effect = side_effect_except()
+            api_mock.side_effect = Exception("boo")
 
             await async_setup_entry(hass, config_entry)
 
 
+async def test_async_setup_entry_single_round_trip(hass, enable_custom_integrations):
+    """Test the whole entry setup including all platforms needs one request only."""
+
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        unique_id="my_unique_test_id",
+        data={CONF_HOST: "TEST_HOST", CONF_SERIAL_NO: _serial_number},
+    )
+
+    config_entry.add_to_hass(hass)
+
+    with patch("zever_local.inverter.httpx.AsyncClient.get") as api_mock:
+        mock_response = httpx.Response(
+            200, request=httpx.Request("Get", "https://test.t"), content=_byte_content,
+        )
+        api_mock.return_value = mock_response
+
+        assert await hass.config_entries.async_setup(config_entry.entry_id)
+        await hass.async_block_till_done()
+
+        assert api_mock.call_count == 1
+
+    coordinator = hass.data[DOMAIN][config_entry.entry_id][ENTRY_COORDINATOR]
+    assert coordinator.client.serial_number == _serial_number
+    assert hass.states.get("sensor.zeversolar_inverter_zs150045138c0104_current_power")
+
+
+async def test_async_setup_entry_shared_connection_pool(hass):
+    """Test all entries share one connection pool closed with the last entry."""
+
+    mock_integration(hass, MockModule(DOMAIN))
+
+    config_entries = [
+        MockConfigEntry(
+            domain=DOMAIN,
+            unique_id=f"my_unique_test_id_{index}",
+            data={CONF_HOST: f"TEST_HOST_{index}", CONF_SERIAL_NO: "serial_no"},
+        )
+        for index in range(2)
+    ]
+
+    close_listeners = hass.bus.async_listeners()[EVENT_HOMEASSISTANT_CLOSE]
+
+    with patch("zever_local.inverter.httpx.AsyncClient.get") as api_mock:
+        mock_response = httpx.Response(
+            200, request=httpx.Request("Get", "https://test.t"), content=_byte_content,
+        )
+        api_mock.return_value = mock_response
+
+        for config_entry in config_entries:
+            config_entry.add_to_hass(hass)
+            await async_setup_entry(hass, config_entry)
+
+    pool = hass.data[DOMAIN][DATA_CONNECTION_POOL]
+    clients = [
+        hass.data[DOMAIN][config_entry.entry_id][ENTRY_COORDINATOR].client
+        for config_entry in config_entries
+    ]
+    assert all(client._http_client is pool.http_client for client in clients)
+    assert pool.users == 2
+
+    await async_unload_entry(hass, config_entries[0])
+    assert not pool.http_client.is_closed
+
+    await async_unload_entry(hass, config_entries[1])
+    assert pool.http_client.is_closed
+    assert DATA_CONNECTION_POOL not in hass.data[DOMAIN]
+    assert hass.bus.async_listeners()[EVENT_HOMEASSISTANT_CLOSE] == close_listeners
+
+
+async def test_async_setup_entry_failure_releases_everything(hass):
+    """Test a setup failing after the first poll stops polling and frees the pool."""
+
+    mock_integration(hass, MockModule(DOMAIN))
+
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        unique_id="my_unique_test_id",
+        data={CONF_HOST: "TEST_HOST", CONF_SERIAL_NO: _serial_number},
+    )
+    config_entry.add_to_hass(hass)
+
+    with patch("zever_local.inverter.httpx.AsyncClient.get") as api_mock, patch.object(
+        ZeverSolarDailySummaries, "async_load", side_effect=OSError("disk full")
+    ):
+        api_mock.return_value = httpx.Response(
+            200, request=httpx.Request("Get", "https://test.t"), content=_byte_content
+        )
+
+        with pytest.raises(OSError):
+            await async_setup_entry(hass, config_entry)
+
+    assert config_entry.entry_id not in hass.data[DOMAIN]
+    assert DATA_CONNECTION_POOL not in hass.data[DOMAIN]
+
+
 async def test_async_setup_entry_domain_not_loaded(hass):
     """Test the integration setup with no domain data."""
 
@@ -86,6 +191,8 @@ async def test_async_setup_entry_domain_not_loaded(hass):
         test_result = await async_setup_entry(hass, config_entry)
         assert test_result is True
 
+    await async_unload_entry(hass, config_entry)
+
 
 async def test_async_setup_entry_domain_already_loaded(hass):
     """Test the integration setup with domain data."""
@@ -109,6 +216,8 @@ async def test_async_setup_entry_domain_already_loaded(hass):
         test_result = await async_setup_entry(hass, config_entry)
         assert test_result is True
 
+    await async_unload_entry(hass, config_entry)
+
 
 async def test_async_setup_entry_domain_already_loaded_mock_coordinator(hass):
     """Test the integration setup with domain data."""
@@ -133,6 +242,8 @@ async def test_async_setup_entry_domain_already_loaded_mock_coordinator(hass):
 
     assert test_result is True
 
+    await async_unload_entry(hass, config_entry)
+
 
 async def test_async_unload_entry_all_can_be_unloaded(hass):
     """Test to unload the integration."""
@@ -147,7 +258,15 @@ async def test_async_unload_entry_all_can_be_unloaded(hass):
     mock_integration(hass, MockModule(DOMAIN))
     config_entry.add_to_hass(hass)
     hass.data.setdefault(
-        DOMAIN, {config_entry.entry_id: {ENTRY_COORDINATOR: coordinator}}
+        DOMAIN,
+        {
+            config_entry.entry_id: {
+                ENTRY_COORDINATOR: coordinator,
+                ENTRY_DAILY_SUMMARIES: ZeverSolarDailySummaries(
+                    hass, config_entry.entry_id
+                ),
+            }
+        },
     )
 
     test_result = await async_unload_entry(hass, config_entry)
@@ -179,23 +298,47 @@ async def test_async_reload_entry(hass):
         # act
         await async_reload_entry(hass, config_entry)
 
-    result_entry = hass.data[DOMAIN].pop(config_entry.entry_id)[ENTRY_COORDINATOR]
+    entry_data = hass.data[DOMAIN].pop(config_entry.entry_id)
+    result_entry = entry_data[ENTRY_COORDINATOR]
 
     # assert
     assert type(result_entry) is ZeversolarApiCoordinator
+    await result_entry.async_shutdown()
+    entry_data[ENTRY_DAILY_SUMMARIES].async_shutdown()
 
 
 async def test_async_options_update_listener(hass):
-    """Test the options update listener."""
+    """Test the options are applied to the coordinator without a reload."""
 
     mock_integration(hass, MockModule(DOMAIN))
 
     config_entry = MockConfigEntry(
-        domain=DOMAIN, unique_id="my_unique_test_id", data={CONF_HOST: "TEST_HOST"},
+        domain=DOMAIN,
+        unique_id="my_unique_test_id",
+        data={CONF_HOST: "TEST_HOST"},
+        options={
+            OPT_DATA_INTERVAL: 15,
+            OPT_MAX_DATA_INTERVAL: 300,
+            OPT_PEAK_POWER: 5.6,
+        },
     )
 
     config_entry.add_to_hass(hass)
 
+    coordinator = ZeversolarApiCoordinator(hass, client=ZeverSolarApiClient("HOST"))
+    coordinator.idle_polls = 2
+    daily_summaries = ZeverSolarDailySummaries(hass, config_entry.entry_id)
+    hass.data.setdefault(
+        DOMAIN,
+        {
+            config_entry.entry_id: {
+                ENTRY_COORDINATOR: coordinator,
+                ENTRY_DAILY_SUMMARIES: daily_summaries,
+            }
+        },
+    )
+    remove_listener = coordinator.async_add_listener(lambda: None)
+
     with patch(
         "homeassistant.config_entries.ConfigEntries.async_reload"
     ) as method_mock:
@@ -203,4 +346,351 @@ async def test_async_options_update_listener(hass):
         await async_options_update_listener(hass, config_entry)
 
         # assert
-        method_mock.assert_called_once()
+        method_mock.assert_not_called()
+
+    assert coordinator.base_update_interval == timedelta(seconds=15)
+    assert coordinator.max_update_interval == timedelta(seconds=300)
+    assert coordinator.update_interval == timedelta(seconds=60)
+    assert coordinator._unsub_refresh is not None
+    assert daily_summaries.peak_power_kwp == 5.6
+
+    remove_listener()
+
+
+async def test_async_options_update_listener_not_loaded(hass):
+    """Test the options of an entry that is not loaded are ignored."""
+
+    hass.data.setdefault(DOMAIN, {})
+    config_entry = MockConfigEntry(
+        domain=DOMAIN, unique_id="my_unique_test_id", data={CONF_HOST: "TEST_HOST"},
+    )
+
+    await async_options_update_listener(hass, config_entry)
+
+
+async def test_async_setup_entry_stores_device_data(
+    hass, hass_storage, enable_custom_integrations
+):
+    """Test the first setup stores the device data and removing the entry drops it."""
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        unique_id="my_unique_test_id",
+        data={CONF_HOST: "TEST_HOST", CONF_SERIAL_NO: _serial_number},
+    )
+    config_entry.add_to_hass(hass)
+
+    with patch("zever_local.inverter.httpx.AsyncClient.get") as api_mock:
+        api_mock.return_value = httpx.Response(
+            200, request=httpx.Request("Get", "https://test.t"), content=_byte_content
+        )
+        assert await hass.config_entries.async_setup(config_entry.entry_id)
+        await hass.async_block_till_done()
+
+    assert hass_storage[f"{DOMAIN}.{config_entry.entry_id}"]["data"] == {
+        "serial_number": _serial_number,
+        "mac_address": "EA-B2-41-27-7A-36",
+        "hardware_version": _hardware_version,
+        "software_version": _software_version,
+    }
+
+    assert await hass.config_entries.async_remove(config_entry.entry_id)
+    await hass.async_block_till_done()
+    assert f"{DOMAIN}.{config_entry.entry_id}" not in hass_storage
+
+
+async def test_async_setup_entry_from_device_cache(
+    hass, hass_storage, enable_custom_integrations
+):
+    """Test a known inverter is set up while it does not answer."""
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        unique_id="my_unique_test_id",
+        data={CONF_HOST: "TEST_HOST", CONF_SERIAL_NO: _serial_number},
+    )
+    config_entry.add_to_hass(hass)
+    hass_storage[f"{DOMAIN}.{config_entry.entry_id}"] = {
+        "version": 1,
+        "key": f"{DOMAIN}.{config_entry.entry_id}",
+        "data": {
+            "serial_number": _serial_number,
+            "mac_address": "EA-B2-41-27-7A-36",
+            "hardware_version": _hardware_version,
+            "software_version": "old",
+        },
+    }
+    power_entity_id = "sensor.zeversolar_inverter_zs150045138c0104_current_power"
+
+    with patch("zever_local.inverter.httpx.AsyncClient.get") as api_mock:
+        api_mock.side_effect = httpx.ConnectError("switched off")
+        assert await hass.config_entries.async_setup(config_entry.entry_id)
+        await hass.async_block_till_done()
+
+        coordinator = hass.data[DOMAIN][config_entry.entry_id][ENTRY_COORDINATOR]
+        assert coordinator.client.serial_number == _serial_number
+        assert hass.states.get(power_entity_id).state == "unavailable"
+        device = dr.async_get(hass).async_get_device({(DOMAIN, _serial_number)})
+        assert device.sw_version == "old"
+
+        api_mock.side_effect = None
+        api_mock.return_value = httpx.Response(
+            200, request=httpx.Request("Get", "https://test.t"), content=_byte_content
+        )
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+    assert hass.states.get(power_entity_id).state == "1234"
+    device = dr.async_get(hass).async_get_device({(DOMAIN, _serial_number)})
+    assert device.sw_version == _software_version
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
+    assert (
+        hass_storage[f"{DOMAIN}.{config_entry.entry_id}"]["data"]["software_version"]
+        == _software_version
+    )
+
+
+async def test_async_setup_entry_restores_sensor_values(
+    hass, hass_storage, enable_custom_integrations
+):
+    """Test the values of the last run are shown until the inverter answers."""
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        unique_id="my_unique_test_id",
+        data={CONF_HOST: "TEST_HOST", CONF_SERIAL_NO: _serial_number},
+    )
+    config_entry.add_to_hass(hass)
+    hass_storage[f"{DOMAIN}.{config_entry.entry_id}"] = {
+        "version": 1,
+        "key": f"{DOMAIN}.{config_entry.entry_id}",
+        "data": {
+            "serial_number": _serial_number,
+            "mac_address": "EA-B2-41-27-7A-36",
+            "hardware_version": _hardware_version,
+            "software_version": _software_version,
+        },
+    }
+    power_entity_id = "sensor.zeversolar_inverter_zs150045138c0104_current_power"
+    energy_entity_id = "sensor.zeversolar_inverter_zs150045138c0104_total_energy_today"
+    now = dt_util.utcnow()
+    mock_restore_cache_with_extra_data(
+        hass,
+        [
+            (
+                State(power_entity_id, "815", {ATTR_READING_TIME: now.isoformat()}),
+                {"native_value": 815, "native_unit_of_measurement": "W"},
+            ),
+            (
+                State(energy_entity_id, "3.5", {ATTR_READING_TIME: now.isoformat()}),
+                {"native_value": 3.5, "native_unit_of_measurement": "kWh"},
+            ),
+        ],
+    )
+
+    with patch("zever_local.inverter.httpx.AsyncClient.get") as api_mock:
+        api_mock.side_effect = httpx.ConnectError("switched off")
+        assert await hass.config_entries.async_setup(config_entry.entry_id)
+        await hass.async_block_till_done()
+
+        # no poll at startup
+        assert api_mock.call_count == 0
+
+        power_state = hass.states.get(power_entity_id)
+        assert power_state.state == "815"
+        assert power_state.attributes[ATTR_STALE] is True
+        assert power_state.attributes[ATTR_READING_TIME] == now.isoformat()
+        assert hass.states.get(energy_entity_id).state == "3.5"
+
+        # the energy of the day before is dropped at midnight
+        midnight = dt_util.start_of_local_day() + timedelta(days=1)
+        async_fire_time_changed(hass, midnight)
+        await hass.async_block_till_done()
+        assert hass.states.get(energy_entity_id).state == "unavailable"
+        assert hass.states.get(power_entity_id).state == "815"
+
+        coordinator = hass.data[DOMAIN][config_entry.entry_id][ENTRY_COORDINATOR]
+        api_mock.side_effect = None
+        api_mock.return_value = httpx.Response(
+            200, request=httpx.Request("Get", "https://test.t"), content=_byte_content
+        )
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+    power_state = hass.states.get(power_entity_id)
+    assert power_state.state == "1234"
+    assert power_state.attributes[ATTR_STALE] is False
+    assert power_state.attributes[ATTR_READING_TIME] != now.isoformat()
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_async_setup_entry_drops_energy_of_yesterday(
+    hass, hass_storage, enable_custom_integrations
+):
+    """Test a restored energy of an earlier day is not shown."""
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        unique_id="my_unique_test_id",
+        data={CONF_HOST: "TEST_HOST", CONF_SERIAL_NO: _serial_number},
+    )
+    config_entry.add_to_hass(hass)
+    hass_storage[f"{DOMAIN}.{config_entry.entry_id}"] = {
+        "version": 1,
+        "key": f"{DOMAIN}.{config_entry.entry_id}",
+        "data": {
+            "serial_number": _serial_number,
+            "mac_address": "EA-B2-41-27-7A-36",
+            "hardware_version": _hardware_version,
+            "software_version": _software_version,
+        },
+    }
+    energy_entity_id = "sensor.zeversolar_inverter_zs150045138c0104_total_energy_today"
+    yesterday = dt_util.utcnow() - timedelta(days=1)
+    mock_restore_cache_with_extra_data(
+        hass,
+        [
+            (
+                State(
+                    energy_entity_id, "3.5", {ATTR_READING_TIME: yesterday.isoformat()}
+                ),
+                {"native_value": 3.5, "native_unit_of_measurement": "kWh"},
+            ),
+        ],
+    )
+
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert hass.states.get(energy_entity_id).state == "unavailable"
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_async_setup_entry_awaits_platforms(hass, enable_custom_integrations):
+    """Test the entities of all platforms exist when the entry is loaded."""
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        unique_id="my_unique_test_id",
+        data={CONF_HOST: "TEST_HOST", CONF_SERIAL_NO: _serial_number},
+    )
+    config_entry.add_to_hass(hass)
+
+    with patch("zever_local.inverter.httpx.AsyncClient.get") as api_mock:
+        api_mock.return_value = httpx.Response(
+            200, request=httpx.Request("Get", "https://test.t"), content=_byte_content
+        )
+        assert await hass.config_entries.async_setup(config_entry.entry_id)
+
+    assert config_entry.state is ConfigEntryState.LOADED
+    assert hass.states.get("sensor.zeversolar_inverter_zs150045138c0104_current_power")
+    # the buttons are disabled by default, so they have no state
+    assert er.async_get(hass).async_get_entity_id(
+        "button", DOMAIN, f"{DOMAIN}_{_serial_number}_power_off"
+    )
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+    assert config_entry.state is ConfigEntryState.NOT_LOADED
+    assert (
+        hass.states.get("sensor.zeversolar_inverter_zs150045138c0104_current_power").state
+        == "unavailable"
+    )
+
+
+async def test_async_setup_entry_summarizes_the_day(
+    hass, hass_storage, enable_custom_integrations
+):
+    """Test the production of the day is summarized after midnight."""
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        unique_id="my_unique_test_id",
+        data={CONF_HOST: "TEST_HOST", CONF_SERIAL_NO: _serial_number},
+        options={OPT_PEAK_POWER: 4},
+    )
+    config_entry.add_to_hass(hass)
+
+    with patch("zever_local.inverter.httpx.AsyncClient.get") as api_mock:
+        api_mock.return_value = httpx.Response(
+            200, request=httpx.Request("Get", "https://test.t"), content=_byte_content
+        )
+        assert await hass.config_entries.async_setup(config_entry.entry_id)
+        await hass.async_block_till_done()
+
+    entity_id = "sensor.zeversolar_inverter_zs150045138c0104_daily_peak_power"
+    assert hass.states.get(entity_id).state == "unknown"
+
+    coordinator = hass.data[DOMAIN][config_entry.entry_id][ENTRY_COORDINATOR]
+    coordinator.history.append(dt_util.utcnow().timestamp() + 1, 2500, 9.2)
+    midnight = dt_util.start_of_local_day(dt_util.now() + timedelta(days=1))
+    async_fire_time_changed(hass, midnight + timedelta(seconds=30))
+    await hass.async_block_till_done()
+
+    state = hass.states.get(entity_id)
+    assert state.state == "2500.0"
+    assert state.attributes["day"] == dt_util.now().date().isoformat()
+    specific_yield = "sensor.zeversolar_inverter_zs150045138c0104_daily_specific_yield"
+    assert hass.states.get(specific_yield).state == "2.3"
+    assert hass_storage[f"{DOMAIN}.{config_entry.entry_id}.daily_summary"]["data"]
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+
+
+async def test_async_setup_entry_energy_statistics(
+    recorder_mock, hass, enable_custom_integrations
+):
+    """Test the energy statistics are enabled and disabled by the options."""
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        unique_id="my_unique_test_id",
+        data={CONF_HOST: "TEST_HOST", CONF_SERIAL_NO: _serial_number},
+        options={OPT_ENERGY_STATISTICS: True, OPT_HOURLY_ENERGY_STATE: True},
+    )
+    config_entry.add_to_hass(hass)
+
+    with patch("zever_local.inverter.httpx.AsyncClient.get") as api_mock:
+        api_mock.return_value = httpx.Response(
+            200, request=httpx.Request("Get", "https://test.t"), content=_byte_content
+        )
+        assert await hass.config_entries.async_setup(config_entry.entry_id)
+        await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][config_entry.entry_id][ENTRY_COORDINATOR]
+    assert coordinator.energy_statistics is not None
+    assert coordinator.hourly_energy_state
+
+    hass.config_entries.async_update_entry(
+        config_entry, options={OPT_ENERGY_STATISTICS: False}
+    )
+    await hass.async_block_till_done()
+
+    assert coordinator.energy_statistics is None
+    assert not coordinator.hourly_energy_state
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+
+
+async def test_async_setup_entry_energy_statistics_without_recorder(
+    hass, enable_custom_integrations, caplog
+):
+    """Test the energy statistics are not added without the recorder."""
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        unique_id="my_unique_test_id",
+        data={CONF_HOST: "TEST_HOST", CONF_SERIAL_NO: _serial_number},
+        options={OPT_ENERGY_STATISTICS: True},
+    )
+    config_entry.add_to_hass(hass)
+
+    with patch("zever_local.inverter.httpx.AsyncClient.get") as api_mock:
+        api_mock.return_value = httpx.Response(
+            200, request=httpx.Request("Get", "https://test.t"), content=_byte_content
+        )
+        assert await hass.config_entries.async_setup(config_entry.entry_id)
+        await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][config_entry.entry_id][ENTRY_COORDINATOR]
+    assert coordinator.energy_statistics is None
+    assert "need the recorder" in caplog.text
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
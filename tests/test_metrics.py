@@ -0,0 +1,88 @@
+"""Tests the poll statistics."""
+from custom_components.zeversolar_local.metrics import (
+    ZeverSolarMetrics,
+    ZeverSolarRttEstimator,
+)
+
+
+def test_ZeverSolarMetrics_empty():
+    """Tests the statistics without requests."""
+    metrics = ZeverSolarMetrics(3)
+
+    assert metrics.latency_ms is None
+    assert metrics.parse_time_us is None
+    assert metrics.payload_size is None
+    assert metrics.failure_rate is None
+
+
+def test_ZeverSolarMetrics_rolling_window():
+    """Tests only the last requests are kept while the totals count all."""
+    metrics = ZeverSolarMetrics(3)
+
+    metrics.record_success(0.5, 100)
+    metrics.record_parse(0.000002)
+    metrics.record_timeout()
+    metrics.record_error()
+    metrics.record_success(0.1, 120)
+    metrics.record_success(0.2, 110)
+
+    assert metrics.latency_ms == 266.7
+    assert metrics.parse_time_us == 2.0
+    assert metrics.payload_size == 110
+    assert metrics.failure_rate == 33.3
+    assert metrics.requests == 5
+    assert metrics.timeouts == 1
+    assert metrics.errors == 1
+    assert len(metrics.outcomes) == 3
+
+
+def test_ZeverSolarMetrics_latency_percentiles():
+    """Tests the latency percentiles and the failure streak."""
+    metrics = ZeverSolarMetrics(100)
+    assert metrics.latency_percentiles_ms() is None
+
+    for latency in range(1, 101):
+        metrics.record_success(latency / 1000, 100)
+    metrics.record_error()
+    metrics.record_timeout()
+
+    assert metrics.latency_percentiles_ms() == {"p50": 51.0, "p95": 95.0, "p99": 99.0}
+    assert metrics.failure_streak == 2
+
+    metrics.record_success(0.01, 100)
+    assert metrics.failure_streak == 0
+
+
+def test_ZeverSolarRttEstimator():
+    """Tests the timeout follows the round trip times within the bounds."""
+    estimator = ZeverSolarRttEstimator(5, 1, 10)
+    assert estimator.timeout == 5
+
+    estimator.record_rtt(0.1)
+    assert estimator.srtt == 0.1
+    assert estimator.rttvar == 0.05
+    assert estimator.timeout == 1
+
+    for _ in range(20):
+        estimator.record_rtt(2.0)
+    assert 2.0 < estimator.timeout < 4
+
+    estimator.record_rtt(12.0)
+    assert estimator.timeout == 10
+
+    estimator.record_timeout()
+    assert estimator.timeout == 10
+
+
+def test_ZeverSolarRttEstimator_timeout_backoff():
+    """Tests a timeout doubles the timeout until the next answer."""
+    estimator = ZeverSolarRttEstimator(5, 1, 10)
+    estimator.record_rtt(0.1)
+
+    estimator.record_timeout()
+    assert estimator.timeout == 2
+    estimator.record_timeout()
+    assert estimator.timeout == 4
+
+    estimator.record_rtt(0.1)
+    assert estimator.timeout == 1
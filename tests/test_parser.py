@@ -0,0 +1,84 @@
+"""Tests the parser of the inverter data."""
+from datetime import datetime
+
+import pytest
+from zever_local.inverter import InverterData, ZeversolarError
+
+from custom_components.zeversolar_local.parser import ZeverSolarData, parse_home_cgi
+
+_registry_id = "EAB241277A36"
+_registry_key = "ZYXTBGERTXJLTSVS"
+_hardware_version = "M11"
+_software_version = "18625-797R+17829-719R"
+_time = "16:22"
+_date = "20/02/2022"
+_serial_number = "ZS150045138C0104"
+_content = f"1\n1\n{_registry_id}\n{_registry_key}\n{_hardware_version}\n{_software_version}\n{_time} {_date}\n1\n1\n{_serial_number}\n1234\n8.9\nOK\nError"
+
+_byte_content = _content.encode()
+
+
+def test_parse_home_cgi_like_zever_local():
+    """Tests the parsed data matches the data of the zever_local library."""
+    expected = InverterData(_content.split("\n"))
+
+    result = parse_home_cgi(_byte_content)
+
+    assert type(result) is ZeverSolarData
+    for name in (
+        "registry_id",
+        "registry_key",
+        "hardware_version",
+        "software_version",
+        "datetime",
+        "communication_status",
+        "serial_number",
+        "pac_watt",
+        "energy_today_KWh",
+        "status",
+        "mac_address",
+    ):
+        assert getattr(result, name) == getattr(expected, name), name
+
+    assert result.energy_today_KWh == 8.09
+    assert result.datetime == datetime(2022, 2, 20, 16, 22)
+
+
+def test_parse_home_cgi_trailing_newline():
+    """Tests a trailing newline is accepted."""
+    result = parse_home_cgi(_byte_content + b"\n")
+
+    assert result.pac_watt == 1234
+
+
+def test_parse_home_cgi_two_decimals():
+    """Tests energy values with two decimals are taken as they are."""
+    result = parse_home_cgi(_byte_content.replace(b"\n8.9\n", b"\n12.34\n"))
+
+    assert result.energy_today_KWh == 12.34
+
+
+def test_parse_home_cgi_unpadded_datetime():
+    """Tests time and date without leading zeros."""
+    content = _byte_content.replace(b"16:22 20/02/2022", b"6:05 2/3/2022")
+
+    result = parse_home_cgi(content)
+
+    assert result.datetime == datetime(2022, 3, 2, 6, 5)
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        b"",
+        b"1\n2",
+        _byte_content + b"\nextra",
+        _byte_content + b"\n\n",
+        _byte_content.replace(b"\n1234\n", b"\nabc\n"),
+        _byte_content.replace(b"\n8.9\n", b"\n\n"),
+    ],
+)
+def test_parse_home_cgi_invalid(content):
+    """Tests invalid data raises a ZeversolarError."""
+    with pytest.raises(ZeversolarError):
+        parse_home_cgi(content)
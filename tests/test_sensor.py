@@ -1,19 +1,20 @@
 """Sensor tests."""
+from datetime import datetime, timedelta, timezone
 from unittest.mock import patch
 
 from homeassistant.const import CONF_HOST
 from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.helpers.entity import DeviceInfo
-from homeassistant.helpers.update_coordinator import UpdateFailed
 import httpx
 import pytest
 from pytest_homeassistant_custom_component.common import MockConfigEntry
-from zever_local.inverter import InverterData, ZeversolarError, ZeversolarTimeout
+from zever_local.inverter import ZeversolarTimeout
 
 from custom_components.zeversolar_local.const import (
     CONF_SERIAL_NO,
     DOMAIN,
     ENTRY_COORDINATOR,
+    ENTRY_DAILY_SUMMARIES,
     ENTRY_DEVICE_INFO,
 )
 from custom_components.zeversolar_local.coordinator import (
@@ -21,11 +22,18 @@ from custom_components.zeversolar_local.coordinator import (
     ZeversolarApiCoordinator,
 )
 from custom_components.zeversolar_local.sensor import (
+    _METRIC_SENSOR_DESCRIPTIONS,
+    _STATISTICS_SENSOR_DESCRIPTIONS,
+    _SUMMARY_SENSOR_DESCRIPTIONS,
     Inverter,
     Sensor,
+    ZeverSolarMetricSensor,
     ZeverSolarSensor,
+    ZeverSolarStatisticsSensor,
+    ZeverSolarSummarySensor,
     async_setup_entry,
 )
+from custom_components.zeversolar_local.summary import ZeverSolarDailySummaries
 
 _registry_id = "EAB241277A36"
 _registry_key = "ZYXTBGERTXJLTSVS"
@@ -42,7 +50,7 @@ _byte_content = _content.encode()
 def async_add_entities(entities):
     """Add entities to a sensor as simuation for unit test. Helper method."""
     count = entities.__len__()
-    assert count == 4
+    assert count == 31
 
 
 async def test_async_setup_entry(hass):
@@ -67,6 +75,7 @@ async def test_async_setup_entry(hass):
     hass.data[DOMAIN][config_entry.entry_id] = {
         ENTRY_COORDINATOR: coordinator,
         ENTRY_DEVICE_INFO: device_info,
+        ENTRY_DAILY_SUMMARIES: ZeverSolarDailySummaries(hass, config_entry.entry_id),
     }
 
     mock_response = httpx.Response(
@@ -79,8 +88,8 @@ async def test_async_setup_entry(hass):
         await async_setup_entry(hass, config_entry, async_add_entities)
 
 
-async def test_async_setup_entry_coordinator_update_ok(hass):
-    """Tests the sensor platform with updating data."""
+async def test_async_setup_entry_no_request(hass):
+    """Tests the sensor platform uses the data of the entry setup without fetching."""
     host = "TEST_HOST"
     client = ZeverSolarApiClient(host)
     coordinator = ZeversolarApiCoordinator(hass, client=client)
@@ -101,101 +110,14 @@ async def test_async_setup_entry_coordinator_update_ok(hass):
     hass.data[DOMAIN][config_entry.entry_id] = {
         ENTRY_COORDINATOR: coordinator,
         ENTRY_DEVICE_INFO: device_info,
+        ENTRY_DAILY_SUMMARIES: ZeverSolarDailySummaries(hass, config_entry.entry_id),
     }
 
     with patch("zever_local.inverter.httpx.AsyncClient.get") as api_mock:
-        mock_response = httpx.Response(
-            200, request=httpx.Request("Get", "https://test.t"), content=_byte_content
-        )
-        api_mock.return_value = mock_response
-
         await async_setup_entry(hass, config_entry, async_add_entities)
-        my_solardata: InverterData = await coordinator.update_method()
-        assert my_solardata.energy_today_KWh == 8.09
-
-
-async def test_async_setup_entry_coordinator_update_fails_with_timeout(hass):
-    """Tests of the sensor platform with updating data failing."""
-    with pytest.raises(UpdateFailed):
-        host = "TEST_HOST"
-        client = ZeverSolarApiClient(host)
-        coordinator = ZeversolarApiCoordinator(hass, client=client)
-        serial_number = "test"
-
-        config_entry = MockConfigEntry(
-            domain=DOMAIN,
-            unique_id="my_unique_test_id",
-            data={CONF_HOST: "TEST_HOST", CONF_SERIAL_NO: serial_number},
-        )
-
-        if hass.data.get(DOMAIN) is None:
-            hass.data.setdefault(DOMAIN, {})
-
-        config_entry.add_to_hass(hass)
-
-        device_info = DeviceInfo()
-        hass.data[DOMAIN][config_entry.entry_id] = {
-            ENTRY_COORDINATOR: coordinator,
-            ENTRY_DEVICE_INFO: device_info,
-        }
-
-        with patch("zever_local.inverter.httpx.AsyncClient.get") as api_mock:
-            mock_response = httpx.Response(
-                200,
-                request=httpx.Request("Get", "https://test.t"),
-                content=_byte_content,
-            )
-            api_mock.return_value = mock_response
-
-            await async_setup_entry(hass, config_entry, async_add_entities)
-
-        with patch(
-            "zever_local.inverter.httpx.AsyncClient.get"
-        ) as api_mock_solardata_fail:
-            api_mock_solardata_fail.side_effect = ZeversolarTimeout("Timeout happened")
-            await coordinator.update_method()
-
-
-async def test_async_setup_entry_coordinator_update_fails_with_error(hass):
-    """Tests the sensor platform with update failing."""
-    with pytest.raises(UpdateFailed):
-        host = "TEST_HOST"
-        client = ZeverSolarApiClient(host)
-        coordinator = ZeversolarApiCoordinator(hass, client=client)
-        serial_number = "145e-serxsdtr"
-
-        config_entry = MockConfigEntry(
-            domain=DOMAIN,
-            unique_id="my_unique_test_id",
-            data={CONF_HOST: "TEST_HOST", CONF_SERIAL_NO: serial_number},
-        )
-
-        if hass.data.get(DOMAIN) is None:
-            hass.data.setdefault(DOMAIN, {})
-
-        config_entry.add_to_hass(hass)
-
-        device_info = DeviceInfo()
-        hass.data[DOMAIN][config_entry.entry_id] = {
-            ENTRY_COORDINATOR: coordinator,
-            ENTRY_DEVICE_INFO: device_info,
-        }
-
-        with patch("zever_local.inverter.httpx.AsyncClient.get") as api_mock:
-            mock_response = httpx.Response(
-                200,
-                request=httpx.Request("Get", "https://test.t"),
-                content=_byte_content,
-            )
-            api_mock.return_value = mock_response
-
-            await async_setup_entry(hass, config_entry, async_add_entities)
 
-        with patch(
-            "zever_local.inverter.httpx.AsyncClient.get"
-        ) as api_mock_solardata_fail:
-            api_mock_solardata_fail.side_effect = ZeversolarError("Error happened")
-            await coordinator.update_method()
+        api_mock.assert_not_called()
+    assert coordinator.update_method is None
 
 
 async def test_Sensor_class(hass):
@@ -354,3 +276,300 @@ async def test_ZeverSolarSensor_native_value_ZeverTimeout_exception(hass):
             await coordinator.async_config_entry_first_refresh()
 
             zeversolar_sensor.native_value
+
+
+async def test_ZeverSolarSensor_writes_changed_values_only(hass):
+    """The state is written only if the value or the availability changed."""
+    api_client = ZeverSolarApiClient("TEST_HOST")
+    coordinator = ZeversolarApiCoordinator(hass, api_client)
+
+    power_sensor = ZeverSolarSensor(
+        coordinator, DeviceInfo(), "ABC_x34", Sensor("pac_watt")
+    )
+    energy_sensor = ZeverSolarSensor(
+        coordinator, DeviceInfo(), "ABC_x34", Sensor("energy_today_KWh")
+    )
+    idle_content = _byte_content.replace(b"\n1234\n", b"\n0\n")
+
+    with patch.object(
+        power_sensor, "async_write_ha_state"
+    ) as power_write_mock, patch.object(
+        energy_sensor, "async_write_ha_state"
+    ) as energy_write_mock, patch(
+        "zever_local.inverter.httpx.AsyncClient.get"
+    ) as api_mock:
+        coordinator.async_add_listener(power_sensor._handle_coordinator_update)
+        coordinator.async_add_listener(energy_sensor._handle_coordinator_update)
+
+        api_mock.return_value = httpx.Response(
+            200, request=httpx.Request("Get", "https://test.t"), content=_byte_content
+        )
+        await coordinator.async_refresh()
+        assert power_write_mock.call_count == 1
+        assert energy_write_mock.call_count == 1
+
+        # same values
+        await coordinator.async_refresh()
+        assert power_write_mock.call_count == 1
+        assert energy_write_mock.call_count == 1
+
+        # power changed
+        api_mock.return_value = httpx.Response(
+            200, request=httpx.Request("Get", "https://test.t"), content=idle_content
+        )
+        await coordinator.async_refresh()
+        assert power_write_mock.call_count == 2
+        assert energy_write_mock.call_count == 1
+
+        # unavailable
+        api_mock.side_effect = ZeversolarTimeout("uups")
+        await coordinator.async_refresh()
+        await coordinator.async_refresh()
+        assert power_write_mock.call_count == 3
+        assert energy_write_mock.call_count == 2
+
+    await coordinator.async_shutdown()
+
+
+async def test_ZeverSolarSensor_writes_energy_hourly(hass):
+    """The energy of the day is written once an hour if configured."""
+    api_client = ZeverSolarApiClient("TEST_HOST", min_gap=0)
+    coordinator = ZeversolarApiCoordinator(hass, api_client)
+    coordinator.hourly_energy_state = True
+
+    energy_sensor = ZeverSolarSensor(
+        coordinator, DeviceInfo(), "ABC_x34", Sensor("energy_today_KWh")
+    )
+    contents = [
+        _byte_content.replace(b"\n8.9\n", f"\n{kwh}\n".encode())
+        for kwh in (9, 9.1, 9.2)
+    ]
+    hour = datetime(2022, 2, 20, 10, tzinfo=timezone.utc)
+
+    with patch.object(
+        energy_sensor, "async_write_ha_state"
+    ) as energy_write_mock, patch(
+        "zever_local.inverter.httpx.AsyncClient.get"
+    ) as api_mock, patch(
+        "custom_components.zeversolar_local.sensor.dt_util.utcnow"
+    ) as utcnow_mock:
+        coordinator.async_add_listener(energy_sensor._handle_coordinator_update)
+
+        for content, minutes in zip(contents, (10, 40, 70)):
+            api_mock.return_value = httpx.Response(
+                200, request=httpx.Request("Get", "https://test.t"), content=content
+            )
+            utcnow_mock.return_value = hour + timedelta(minutes=minutes)
+            await coordinator.async_refresh()
+
+        # the first value and the value of the next hour
+        assert energy_write_mock.call_count == 2
+
+    await coordinator.async_shutdown()
+
+async def test_ZeverSolarSensor_writes_held_back_energy_next_hour(hass):
+    """The energy held back within an hour is written when the next hour starts."""
+    api_client = ZeverSolarApiClient("TEST_HOST", min_gap=0)
+    coordinator = ZeversolarApiCoordinator(hass, api_client)
+    coordinator.hourly_energy_state = True
+
+    energy_sensor = ZeverSolarSensor(
+        coordinator, DeviceInfo(), "ABC_x34", Sensor("energy_today_KWh")
+    )
+    contents = [
+        _byte_content.replace(b"\n8.9\n", f"\n{kwh}\n".encode())
+        for kwh in (9, 9.1, 9.1)
+    ]
+    hour = datetime(2022, 2, 20, 18, tzinfo=timezone.utc)
+
+    with patch.object(
+        energy_sensor, "async_write_ha_state"
+    ) as energy_write_mock, patch(
+        "zever_local.inverter.httpx.AsyncClient.get"
+    ) as api_mock, patch(
+        "custom_components.zeversolar_local.sensor.dt_util.utcnow"
+    ) as utcnow_mock:
+        coordinator.async_add_listener(energy_sensor._handle_coordinator_update)
+
+        for content, minutes in zip(contents, (5, 40, 50)):
+            api_mock.return_value = httpx.Response(
+                200, request=httpx.Request("Get", "https://test.t"), content=content
+            )
+            utcnow_mock.return_value = hour + timedelta(minutes=minutes)
+            await coordinator.async_refresh()
+
+        # the last value of the day is held back
+        assert energy_write_mock.call_count == 1
+        held_back = energy_sensor.native_value
+
+        energy_sensor._async_hour_started(hour + timedelta(hours=1))
+        assert energy_write_mock.call_count == 2
+        assert energy_sensor.native_value == held_back
+
+        # nothing is held back any more
+        energy_sensor._async_hour_started(hour + timedelta(hours=2))
+        assert energy_write_mock.call_count == 2
+
+    await coordinator.async_shutdown()
+
+async def test_ZeverSolarMetricSensor_native_value(hass):
+    """The poll statistics sensors show the metrics of the client."""
+    api_client = ZeverSolarApiClient("TEST_HOST")
+    coordinator = ZeversolarApiCoordinator(hass, api_client)
+    sensors = {
+        description.key: ZeverSolarMetricSensor(
+            coordinator, DeviceInfo(), "ABC_x34", description
+        )
+        for description in _METRIC_SENSOR_DESCRIPTIONS
+    }
+
+    assert sensors["poll_latency"].native_value is None
+    assert not sensors["poll_latency"].entity_registry_enabled_default
+
+    with patch("zever_local.inverter.httpx.AsyncClient.get") as api_mock:
+        api_mock.return_value = httpx.Response(
+            200, request=httpx.Request("Get", "https://test.t"), content=_byte_content
+        )
+        await coordinator.async_refresh()
+        await coordinator.async_refresh()
+
+        api_mock.side_effect = httpx.ConnectTimeout("timeout")
+        await coordinator.async_refresh()
+        assert sensors["poll_timeouts"].native_value == 1
+        assert sensors["poll_errors"].native_value == 0
+
+        api_mock.side_effect = httpx.ConnectError("refused")
+        await coordinator.async_refresh()
+
+    assert sensors["poll_latency"].native_value >= 0
+    assert sensors["parse_time"].native_value > 0
+    assert sensors["payload_size"].native_value == len(_byte_content)
+    assert sensors["poll_failure_rate"].native_value == 50.0
+    assert sensors["poll_timeouts"].native_value == 1
+    assert sensors["poll_errors"].native_value == 1
+    assert sensors["unchanged_polls"].native_value == 1
+    assert sensors["poll_errors"].available
+    assert sensors["poll_errors"].unique_id == f"{DOMAIN}_ABC_x34_poll_errors"
+
+
+async def test_ZeverSolarMetricSensor_updates_on_unchanged_payload(hass):
+    """The poll statistics change while the values of the inverter do not."""
+    api_client = ZeverSolarApiClient("TEST_HOST")
+    coordinator = ZeversolarApiCoordinator(hass, api_client)
+    description = next(
+        description
+        for description in _METRIC_SENSOR_DESCRIPTIONS
+        if description.key == "unchanged_polls"
+    )
+    unchanged_sensor = ZeverSolarMetricSensor(
+        coordinator, DeviceInfo(), "ABC_x34", description
+    )
+    unchanged_sensor.hass = hass
+    unchanged_sensor.entity_id = "sensor.zeversolar_unchanged_polls"
+    power_sensor = ZeverSolarSensor(
+        coordinator, DeviceInfo(), "ABC_x34", Sensor("pac_watt")
+    )
+    coordinator.async_add_listener(unchanged_sensor._handle_coordinator_update)
+    coordinator.async_add_listener(power_sensor._handle_coordinator_update)
+
+    with patch.object(
+        power_sensor, "async_write_ha_state"
+    ) as power_write_mock, patch(
+        "zever_local.inverter.httpx.AsyncClient.get"
+    ) as api_mock:
+        api_mock.return_value = httpx.Response(
+            200, request=httpx.Request("Get", "https://test.t"), content=_byte_content
+        )
+        await coordinator.async_refresh()
+        assert hass.states.get(unchanged_sensor.entity_id).state == "0"
+
+        await coordinator.async_refresh()
+        assert hass.states.get(unchanged_sensor.entity_id).state == "1"
+        assert power_write_mock.call_count == 1
+
+    await coordinator.async_shutdown()
+
+
+async def test_ZeverSolarStatisticsSensor_native_value(hass):
+    """The rolling statistics sensors show the AC power within their window."""
+    api_client = ZeverSolarApiClient("TEST_HOST", min_gap=0)
+    coordinator = ZeversolarApiCoordinator(hass, api_client)
+    sensors = {
+        description.key: ZeverSolarStatisticsSensor(
+            coordinator, DeviceInfo(), "ABC_x34", description
+        )
+        for description in _STATISTICS_SENSOR_DESCRIPTIONS
+    }
+
+    assert sensors["pac_mean_5min"].native_value is None
+    assert not sensors["pac_mean_5min"].entity_registry_enabled_default
+
+    with patch("zever_local.inverter.httpx.AsyncClient.get") as api_mock:
+        api_mock.return_value = httpx.Response(
+            200, request=httpx.Request("Get", "https://test.t"), content=_byte_content
+        )
+        await coordinator.async_refresh()
+        api_mock.return_value = httpx.Response(
+            200,
+            request=httpx.Request("Get", "https://test.t"),
+            content=_byte_content.replace(b"\n1234\n", b"\n234\n"),
+        )
+        await coordinator.async_refresh()
+
+    assert sensors["pac_mean_5min"].native_value == 734
+    assert sensors["pac_min_1h"].native_value == 234
+    assert sensors["pac_max_24h"].native_value == 1234
+    assert sensors["pac_stdev_5min"].native_value == 500
+    assert sensors["pac_max_24h"].unique_id == f"{DOMAIN}_ABC_x34_pac_max_24h"
+    await coordinator.async_shutdown()
+
+
+async def test_ZeverSolarSummarySensor_native_value(hass):
+    """The daily summary sensors show the last summarized day."""
+    api_client = ZeverSolarApiClient("TEST_HOST")
+    coordinator = ZeversolarApiCoordinator(hass, api_client)
+    daily_summaries = ZeverSolarDailySummaries(hass, "entry_id")
+    sensors = {
+        description.key: ZeverSolarSummarySensor(
+            coordinator, daily_summaries, DeviceInfo(), "ABC_x34", description
+        )
+        for description in _SUMMARY_SENSOR_DESCRIPTIONS
+    }
+
+    assert sensors["daily_peak_power"].native_value is None
+    assert sensors["daily_peak_power"].extra_state_attributes == {"day": None}
+    assert sensors["daily_peak_power"].available
+
+    daily_summaries.days.append(
+        {
+            "day": "2022-02-20",
+            "peak_power": 2400.0,
+            "peak_time": 1645358400,
+            "hours_above_threshold": 6.5,
+            "energy": 11.2,
+            "specific_yield": None,
+        }
+    )
+
+    assert sensors["daily_peak_power"].native_value == 2400
+    assert sensors["daily_peak_time"].native_value == datetime(
+        2022, 2, 20, 12, tzinfo=timezone.utc
+    )
+    assert sensors["daily_production_hours"].native_value == 6.5
+    assert sensors["daily_energy_yield"].native_value == 11.2
+    assert sensors["daily_specific_yield"].native_value is None
+    assert sensors["daily_energy_yield"].extra_state_attributes == {
+        "day": "2022-02-20"
+    }
+
+
+async def test_ZeverSolarSensor_native_value_before_first_answer(hass):
+    """A sensor set up from the device cache has no value until the first answer."""
+    api_client = ZeverSolarApiClient("TEST_HOST")
+    coordinator = ZeversolarApiCoordinator(hass, api_client)
+
+    zeversolar_sensor = ZeverSolarSensor(
+        coordinator, DeviceInfo(), "ABC_x34", Sensor("pac_watt")
+    )
+
+    assert zeversolar_sensor.native_value is None
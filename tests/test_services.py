@@ -0,0 +1,83 @@
+"""Test the services of the integration."""
+from datetime import timedelta
+from functools import partial
+from unittest.mock import patch
+
+from homeassistant.const import ATTR_DEVICE_ID, CONF_HOST
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import device_registry as dr
+from homeassistant.util import dt as dt_util
+import httpx
+import pytest
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+import voluptuous as vol
+
+from custom_components.zeversolar_local.const import (
+    ATTR_DURATION,
+    ATTR_INTERVAL,
+    CONF_SERIAL_NO,
+    DOMAIN,
+    ENTRY_COORDINATOR,
+    SERVICE_BURST_POLL,
+)
+from custom_components.zeversolar_local.zever_local import ZeverSolarApiClient
+
+_serial_number = "ZS150045138C0104"
+_content = f"1\n1\nEAB241277A36\nZYXTBGERTXJLTSVS\nM11\n18625-797R+17829-719R\n16:22 20/02/2022\n1\n1\n{_serial_number}\n1234\n8.9\nOK\nError"
+
+_byte_content = _content.encode()
+
+
+async def test_burst_poll(hass, enable_custom_integrations):
+    """Test the burst_poll service polls the inverter of a device at a high rate."""
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        unique_id="my_unique_test_id",
+        data={CONF_HOST: "TEST_HOST", CONF_SERIAL_NO: _serial_number},
+    )
+    config_entry.add_to_hass(hass)
+
+    with patch("zever_local.inverter.httpx.AsyncClient.get") as api_mock, patch(
+        "custom_components.zeversolar_local.ZeverSolarApiClient",
+        partial(ZeverSolarApiClient, min_gap=0),
+    ):
+        api_mock.return_value = httpx.Response(
+            200, request=httpx.Request("Get", "https://test.t"), content=_byte_content
+        )
+        assert await hass.config_entries.async_setup(config_entry.entry_id)
+        await hass.async_block_till_done()
+
+        coordinator = hass.data[DOMAIN][config_entry.entry_id][ENTRY_COORDINATOR]
+        device = dr.async_get(hass).async_get_device({(DOMAIN, _serial_number)})
+
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_BURST_POLL,
+            {ATTR_DEVICE_ID: device.id, ATTR_INTERVAL: 1, ATTR_DURATION: 60},
+            blocking=True,
+        )
+        assert coordinator.update_interval == timedelta(seconds=1)
+
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=1))
+        await hass.async_block_till_done()
+
+    assert api_mock.call_count == 2
+    assert [pac for _, pac in coordinator.burst_readings] == [1234]
+
+    with pytest.raises(HomeAssistantError):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_BURST_POLL,
+            {ATTR_DEVICE_ID: "unknown"},
+            blocking=True,
+        )
+
+    with pytest.raises(vol.Invalid):
+        await hass.services.async_call(
+            DOMAIN, SERVICE_BURST_POLL, {ATTR_INTERVAL: 0.1}, blocking=True
+        )
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
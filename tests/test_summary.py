@@ -0,0 +1,122 @@
+"""Test the daily production summaries."""
+from array import array
+from datetime import date, timedelta
+
+from homeassistant.util import dt as dt_util
+
+from custom_components.zeversolar_local.const import DOMAIN
+from custom_components.zeversolar_local.history import ZeverSolarHistory
+from custom_components.zeversolar_local.summary import (
+    ZeverSolarDailySummaries,
+    summarize_day,
+)
+
+_day = date(2022, 2, 20)
+
+
+def test_summarize_day():
+    """Test the summary of the readings of a day."""
+    timestamps = array("I", [1000, 1600, 2200, 2800, 3400, 4000])
+    pac_watt = array("f", [50, 400, 2400, 1800, 80, 0])
+    energy_today = array("f", [0.1, 0.2, 0.6, 0.9, 1.0, 1.0])
+
+    summary = summarize_day(_day, timestamps, pac_watt, energy_today, 4, 600)
+
+    assert summary == {
+        "day": "2022-02-20",
+        "peak_power": 2400,
+        "peak_time": 2200,
+        "hours_above_threshold": 0.5,
+        "energy": 1.0,
+        "specific_yield": 0.25,
+    }
+
+
+def test_summarize_day_with_gap():
+    """Test a gap without readings is no production time."""
+    timestamps = array("I", [1000, 1600, 2200, 9400, 10000])
+    pac_watt = array("f", [400, 2400, 1800, 1200, 0])
+    energy_today = array("f", [0.1, 0.6, 0.9, 1.9, 2.0])
+
+    summary = summarize_day(_day, timestamps, pac_watt, energy_today, 4, 600)
+
+    assert summary["hours_above_threshold"] == 0.67
+
+
+def test_summarize_day_without_readings():
+    """Test a day without readings is not summarized."""
+    assert summarize_day(_day, array("I"), array("f"), array("f"), 4, 600) is None
+
+
+def test_summarize_day_without_peak_power():
+    """Test the specific yield is unknown without the peak power of the panels."""
+    summary = summarize_day(
+        _day, array("I", [1000]), array("f", [500]), array("f", [2]), 0, 600
+    )
+
+    assert summary["specific_yield"] is None
+    assert summary["hours_above_threshold"] == 0
+
+
+async def test_daily_summaries(hass, hass_storage):
+    """Test a day is summarized from the history and stored."""
+    start = dt_util.start_of_local_day(_day).timestamp()
+    history = ZeverSolarHistory(10)
+    history.append(start - 600, 3000, 5)
+    history.append(start + 36000, 1000, 2)
+    history.append(start + 39600, 500, 3)
+    history.append(start + 86400, 2000, 0.1)
+
+    daily_summaries = ZeverSolarDailySummaries(hass, "entry_id")
+    daily_summaries.peak_power_kwp = 5
+    await daily_summaries.async_load()
+    assert daily_summaries.latest is None
+
+    summary = await daily_summaries.async_summarize(
+        _day, history, timedelta(hours=1)
+    )
+
+    assert summary["peak_power"] == 1000
+    assert summary["peak_time"] == start + 36000
+    assert summary["hours_above_threshold"] == 1
+    assert summary["energy"] == 3
+    assert summary["specific_yield"] == 0.6
+    assert daily_summaries.latest == summary
+    assert hass_storage[f"{DOMAIN}.entry_id.daily_summary"]["data"] == [summary]
+
+    # a day is summarized once
+    assert (
+        await daily_summaries.async_summarize(_day, history, timedelta(hours=1))
+        is None
+    )
+    # a day without readings is not summarized
+    next_day = _day + timedelta(days=2)
+    assert (
+        await daily_summaries.async_summarize(next_day, history, timedelta(hours=1))
+        is None
+    )
+
+    restored = ZeverSolarDailySummaries(hass, "entry_id")
+    await restored.async_load()
+    assert list(restored.days) == [summary]
+
+    await restored.async_remove()
+    assert f"{DOMAIN}.entry_id.daily_summary" not in hass_storage
+
+
+async def test_daily_summaries_keep_a_year(hass, hass_storage):
+    """Test the summaries of more than a year ago are dropped."""
+    hass_storage[f"{DOMAIN}.entry_id.daily_summary"] = {
+        "version": 1,
+        "key": f"{DOMAIN}.entry_id.daily_summary",
+        "data": [
+            {"day": (_day - timedelta(days=days)).isoformat()}
+            for days in range(400, 0, -1)
+        ],
+    }
+
+    daily_summaries = ZeverSolarDailySummaries(hass, "entry_id")
+    await daily_summaries.async_load()
+
+    assert len(daily_summaries.days) == 365
+    assert daily_summaries.latest["day"] == "2022-02-19"
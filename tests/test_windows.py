@@ -0,0 +1,51 @@
+"""Test the rolling statistics of the readings."""
+import statistics
+
+import pytest
+
+from custom_components.zeversolar_local.windows import ZeverSolarRollingWindow
+
+
+def test_rolling_window_empty():
+    """Test a window without readings has no statistics."""
+    window = ZeverSolarRollingWindow(60)
+
+    assert len(window) == 0
+    assert window.mean is None
+    assert window.minimum is None
+    assert window.maximum is None
+    assert window.stdev is None
+
+
+def test_rolling_window_statistics():
+    """Test the statistics match a full computation over the window."""
+    window = ZeverSolarRollingWindow(60)
+    values = [500, 800, 300, 300, 900, 100, 700, 400, 650, 200]
+    for second, value in enumerate(values):
+        window.add(second * 10, value)
+
+        within = values[max(second - 6, 0) : second + 1]
+        assert len(window) == len(within)
+        assert window.mean == pytest.approx(statistics.fmean(within))
+        assert window.minimum == min(within)
+        assert window.maximum == max(within)
+        assert window.stdev == pytest.approx(statistics.pstdev(within))
+
+
+def test_rolling_window_expire():
+    """Test all readings leave the window after the span."""
+    window = ZeverSolarRollingWindow(60)
+    window.add(0, 1000)
+    window.add(10, 0.1)
+
+    window.expire(65)
+    assert window.mean == pytest.approx(0.1)
+    assert window.minimum == window.maximum == pytest.approx(0.1)
+    assert window.stdev == pytest.approx(0, abs=1e-3)
+
+    window.expire(100)
+    assert len(window) == 0
+    assert window.maximum is None
+
+    window.add(100, 3)
+    assert window.mean == 3
@@ -1,9 +1,16 @@
 """Tests the ZeverSolar API wrapper."""
+import asyncio
 from unittest.mock import patch
 
 import httpx
+import pytest
+from zever_local.inverter import ZeversolarError, ZeversolarTimeout
 
-from custom_components.zeversolar_local.zever_local import ZeverSolarApiClient
+from custom_components.zeversolar_local.zever_local import (
+    ZeverSolarApiClient,
+    ZeverSolarConnectionPool,
+    ZeversolarCircuitOpen,
+)
 
 _registry_id = "EAB241277A36"
 _registry_key = "ZYXTBGERTXJLTSVS"
@@ -60,3 +67,286 @@ async def test_ZeverSolarApiClient_async_get_data_ok(hass):
 
     energy_today_KWh = inverter_data.energy_today_KWh
     assert energy_today_KWh == 8.09
+
+
+async def test_ZeverSolarApiClient_shared_http_client(hass):
+    """Test the client sends its requests through the shared pool."""
+    host = "TEST_HOST"
+    pool = ZeverSolarConnectionPool()
+
+    result_api = ZeverSolarApiClient(host, http_client=pool.http_client)
+
+    mock_response = httpx.Response(
+        200, request=httpx.Request("Get", f"https://{host}"), content=_byte_content
+    )
+
+    with patch.object(
+        pool.http_client, "get", return_value=mock_response
+    ) as mock_get, patch(
+        "custom_components.zeversolar_local.zever_local.httpx.AsyncClient"
+    ) as mock_client_class:
+        await result_api.async_get_data()
+        await result_api.async_get_data()
+
+        assert mock_get.call_count == 2
+        mock_client_class.assert_not_called()
+
+    assert result_api.serial_number == _serial_number
+
+    pool.attach("entry_1")
+    assert await pool.async_release("entry_1")
+    assert pool.http_client.is_closed
+
+
+async def test_ZeverSolarApiClient_async_get_data_timeout(hass):
+    """Test a timeout is reported as ZeversolarTimeout."""
+    result_api = ZeverSolarApiClient("TEST_HOST")
+
+    with patch("zever_local.inverter.httpx.AsyncClient.get") as mock_device_info:
+        mock_device_info.side_effect = httpx.ConnectTimeout("timeout")
+
+        with pytest.raises(ZeversolarTimeout):
+            await result_api.async_get_data()
+
+
+async def test_ZeverSolarApiClient_async_get_data_invalid(hass):
+    """Test an unexpected payload is reported as ZeversolarError."""
+    host = "TEST_HOST"
+    result_api = ZeverSolarApiClient(host)
+
+    mock_response = httpx.Response(
+        200, request=httpx.Request("Get", f"https://{host}"), content=b"1\n2"
+    )
+
+    with patch("zever_local.inverter.httpx.AsyncClient.get") as mock_device_info:
+        mock_device_info.return_value = mock_response
+
+        with pytest.raises(ZeversolarError):
+            await result_api.async_get_data()
+
+
+async def test_ZeverSolarApiClient_async_power_off(hass):
+    """Test the power command posts the serial number and mode."""
+    host = "TEST_HOST"
+    result_api = ZeverSolarApiClient(host)
+
+    mock_response = httpx.Response(
+        200, request=httpx.Request("Get", f"https://{host}"), content=_byte_content
+    )
+
+    with patch("zever_local.inverter.httpx.AsyncClient.get") as mock_device_info:
+        mock_device_info.return_value = mock_response
+        await result_api.async_get_data()
+
+    with patch("zever_local.inverter.httpx.AsyncClient.post") as mock_power:
+        mock_power.return_value = httpx.Response(
+            200, request=httpx.Request("Post", f"https://{host}")
+        )
+        assert await result_api.async_power_off()
+
+        mock_power.assert_called_once()
+        assert mock_power.call_args.kwargs["data"] == {
+            "sn": _serial_number,
+            "mode": 1,
+        }
+
+
+async def test_ZeverSolarApiClient_async_get_data_single_flight(hass):
+    """Test concurrent callers share one request and its result."""
+    host = "TEST_HOST"
+    result_api = ZeverSolarApiClient(host)
+    request_sent = asyncio.Event()
+    release_response = asyncio.Event()
+
+    async def _async_get(*args, **kwargs):
+        request_sent.set()
+        await release_response.wait()
+        return httpx.Response(
+            200, request=httpx.Request("Get", f"https://{host}"), content=_byte_content
+        )
+
+    with patch("zever_local.inverter.httpx.AsyncClient.get") as mock_device_info:
+        mock_device_info.side_effect = _async_get
+
+        callers = [
+            asyncio.ensure_future(result_api.async_get_data()) for _ in range(4)
+        ]
+        await request_sent.wait()
+        release_response.set()
+        results = await asyncio.gather(*callers)
+
+        assert mock_device_info.call_count == 1
+        assert all(result is results[0] for result in results)
+
+        # the next call sends a new request
+        await result_api.async_get_data()
+        assert mock_device_info.call_count == 2
+
+
+async def test_ZeverSolarApiClient_async_get_data_single_flight_error(hass):
+    """Test all concurrent callers get the error of the shared request."""
+    result_api = ZeverSolarApiClient("TEST_HOST")
+
+    with patch("zever_local.inverter.httpx.AsyncClient.get") as mock_device_info:
+        mock_device_info.side_effect = httpx.ConnectTimeout("timeout")
+
+        results = await asyncio.gather(
+            result_api.async_get_data(),
+            result_api.async_get_data(),
+            return_exceptions=True,
+        )
+
+        assert mock_device_info.call_count == 1
+        assert all(isinstance(result, ZeversolarTimeout) for result in results)
+
+
+async def test_ZeverSolarApiClient_async_get_data_cancelled_caller(hass):
+    """Test a cancelled caller does not cancel the request of the others."""
+    host = "TEST_HOST"
+    result_api = ZeverSolarApiClient(host)
+    request_sent = asyncio.Event()
+    release_response = asyncio.Event()
+
+    async def _async_get(*args, **kwargs):
+        request_sent.set()
+        await release_response.wait()
+        return httpx.Response(
+            200, request=httpx.Request("Get", f"https://{host}"), content=_byte_content
+        )
+
+    with patch("zever_local.inverter.httpx.AsyncClient.get") as mock_device_info:
+        mock_device_info.side_effect = _async_get
+
+        cancelled_caller = asyncio.ensure_future(result_api.async_get_data())
+        other_caller = asyncio.ensure_future(result_api.async_get_data())
+        await request_sent.wait()
+        cancelled_caller.cancel()
+        release_response.set()
+
+        inverter_data = await other_caller
+
+    assert cancelled_caller.cancelled()
+    assert inverter_data.serial_number == _serial_number
+
+
+async def test_ZeverSolarApiClient_async_get_data_unchanged_payload(hass):
+    """Test an unchanged payload is not parsed again."""
+    host = "TEST_HOST"
+    result_api = ZeverSolarApiClient(host)
+
+    mock_response = httpx.Response(
+        200, request=httpx.Request("Get", f"https://{host}"), content=_byte_content
+    )
+
+    with patch("zever_local.inverter.httpx.AsyncClient.get") as mock_device_info:
+        mock_device_info.return_value = mock_response
+        first_data = await result_api.async_get_data()
+
+        with patch(
+            "custom_components.zeversolar_local.zever_local.parse_home_cgi"
+        ) as parse_mock:
+            second_data = await result_api.async_get_data()
+
+            parse_mock.assert_not_called()
+
+        mock_device_info.return_value = httpx.Response(
+            200,
+            request=httpx.Request("Get", f"https://{host}"),
+            content=_byte_content.replace(b"\n1234\n", b"\n1235\n"),
+        )
+        third_data = await result_api.async_get_data()
+
+    assert second_data is first_data
+    assert third_data.pac_watt == 1235
+    assert result_api.unchanged_polls == 1
+
+
+async def test_ZeverSolarApiClient_circuit_breaker(hass):
+    """Test no request is sent while the circuit breaker is open."""
+    host = "TEST_HOST"
+    result_api = ZeverSolarApiClient(host)
+
+    with patch("zever_local.inverter.httpx.AsyncClient.get") as mock_device_info:
+        mock_device_info.side_effect = httpx.ConnectError("unreachable")
+        for _ in range(3):
+            with pytest.raises(ZeversolarError):
+                await result_api.async_get_data()
+
+        assert result_api.circuit_breaker.state == "open"
+        with pytest.raises(ZeversolarCircuitOpen):
+            await result_api.async_get_data()
+        assert mock_device_info.call_count == 3
+        assert result_api.metrics.errors == 3
+
+        # the retry delay passed
+        result_api.circuit_breaker._retry_at = 0
+        mock_device_info.side_effect = None
+        mock_device_info.return_value = httpx.Response(
+            200, request=httpx.Request("Get", f"https://{host}"), content=_byte_content
+        )
+        await result_api.async_get_data()
+
+    assert result_api.circuit_breaker.state == "closed"
+
+
+async def test_ZeverSolarApiClient_adaptive_timeout(hass):
+    """Test the request timeout is learned from the round trip times."""
+    host = "TEST_HOST"
+    result_api = ZeverSolarApiClient(host)
+
+    with patch("zever_local.inverter.httpx.AsyncClient.get") as mock_device_info:
+        mock_device_info.return_value = httpx.Response(
+            200, request=httpx.Request("Get", f"https://{host}"), content=_byte_content
+        )
+        await result_api.async_get_data()
+        assert mock_device_info.call_args.kwargs["timeout"] == 5
+
+        await result_api.async_get_data()
+        # a fast answer brings the timeout down to the floor
+        assert mock_device_info.call_args.kwargs["timeout"] == 1
+
+        mock_device_info.side_effect = httpx.ReadTimeout("slow")
+        with pytest.raises(ZeversolarTimeout):
+            await result_api.async_get_data()
+        with pytest.raises(ZeversolarTimeout):
+            await result_api.async_get_data()
+        assert mock_device_info.call_args.kwargs["timeout"] == 2
+
+    assert result_api.rtt_estimator.timeout == 4
+
+
+async def test_ZeverSolarApiClient_command_before_poll(hass):
+    """Test a power command waiting with a poll is sent first."""
+    host = "TEST_HOST"
+    result_api = ZeverSolarApiClient(host)
+    result_api.restore_identity(_serial_number, "EA-B2-41-27-7A-36")
+    sent = []
+    release = asyncio.Event()
+
+    async def _async_get(*args, **kwargs):
+        sent.append("get")
+        if len(sent) == 1:
+            await release.wait()
+        return httpx.Response(
+            200, request=httpx.Request("Get", f"https://{host}"), content=_byte_content
+        )
+
+    async def _async_post(*args, **kwargs):
+        sent.append("post")
+        return httpx.Response(200, request=httpx.Request("Post", f"https://{host}"))
+
+    with patch(
+        "zever_local.inverter.httpx.AsyncClient.get", side_effect=_async_get
+    ), patch("zever_local.inverter.httpx.AsyncClient.post", side_effect=_async_post):
+        first_poll = asyncio.create_task(result_api.async_get_data())
+        await asyncio.sleep(0.01)
+        second_poll = asyncio.create_task(result_api._async_fetch_data())
+        command = asyncio.create_task(result_api.async_power_off())
+        await asyncio.sleep(0.01)
+        assert result_api.arbiter.queue_depth == 2
+
+        release.set()
+        await asyncio.gather(first_poll, second_poll, command)
+
+    assert sent == ["get", "post", "get"]
+    assert result_api.metrics.wait_ms > 0